@@ -1,4 +1,5 @@
 # -*- mode: python ; coding: utf-8 -*-
+import json
 import os
 import sys
 import shutil
@@ -34,6 +35,20 @@ additional_datas = [
     ('Arc-Dark', 'share/themes/Arc-Dark'),
 ]
 
+# Modules are imported by name (see skytemple.core.modules), so PyInstaller can't find them on its own.
+module_manifest = os.path.join(site_packages, 'skytemple', 'data', 'module_manifest.json')
+additional_datas.append((module_manifest, 'data'))
+with open(module_manifest) as f:
+    module_imports = [target.split(':')[0] for target in json.load(f)['skytemple.module'].values()]
+
+# Modules imported with skytemple.core.lazy_import.lazy_import, PyInstaller can't see those.
+lazy_imports = [
+    'cairosvg', 'explorerscript.source_map', 'skytemple.core.ssb_debugger.context',
+    'skytemple.module.monster.level_up_graph', 'skytemple_ssb_debugger.controller.main',
+    'skytemple_ssb_debugger.emulator_thread', 'skytemple_ssb_debugger.main',
+    'skytemple_tilequant.aikku.image_converter', 'skytemple_tilequant.image_converter'
+]
+
 additional_binaries = [
     (os.path.join(site_packages, "desmume", "libdesmume.so"), "."),
     (os.path.join(os.sep, "usr", "local", "lib", "libSDL-1.2.0.dylib"), "."), # Must be installed with Homebrew
@@ -59,7 +74,7 @@ a = Analysis(['../skytemple/main.py'],
              binaries=additional_binaries,
              datas=additional_datas,
              hiddenimports=['pkg_resources.py2_warn', 'packaging.version', 'packaging.specifiers',
-                            'packaging.requirements', 'packaging.markers', '_sysconfigdata__win32_', 'win32api'],
+                            'packaging.requirements', 'packaging.markers', '_sysconfigdata__win32_', 'win32api'] + module_imports + lazy_imports,
              hookspath=[],
              runtime_hooks=[],
              excludes=[],
@@ -1,4 +1,5 @@
 # -*- mode: python ; coding: utf-8 -*-
+import json
 import os
 import sys
 from pathlib import PurePosixPath, Path
@@ -49,6 +50,20 @@ for (path, directories, filenames) in os.walk(os.path.join(pkg_path, 'module')):
             additional_datas.append((os.path.abspath(os.path.join('..', path, filename)),
                                      f'skytemple/{str(PurePosixPath(Path(path.replace(pkg_path + "/", ""))))}'))
 
+# Modules are imported by name (see skytemple.core.modules), so PyInstaller can't find them on its own.
+module_manifest = os.path.join(site_packages, 'skytemple', 'data', 'module_manifest.json')
+additional_datas.append((module_manifest, 'data'))
+with open(module_manifest) as f:
+    module_imports = [target.split(':')[0] for target in json.load(f)['skytemple.module'].values()]
+
+# Modules imported with skytemple.core.lazy_import.lazy_import, PyInstaller can't see those.
+lazy_imports = [
+    'cairosvg', 'explorerscript.source_map', 'skytemple.core.ssb_debugger.context',
+    'skytemple.module.monster.level_up_graph', 'skytemple_ssb_debugger.controller.main',
+    'skytemple_ssb_debugger.emulator_thread', 'skytemple_ssb_debugger.main',
+    'skytemple_tilequant.aikku.image_converter', 'skytemple_tilequant.image_converter'
+]
+
 additional_binaries = [
     (os.path.join(site_packages, "desmume", "libdesmume.dll"), "."),
     (os.path.join(site_packages, "desmume", "SDL.dll"), "."),
@@ -70,7 +85,7 @@ a = Analysis(['../skytemple/main.py'],
              binaries=additional_binaries,
              datas=additional_datas,
              hiddenimports=['pkg_resources.py2_warn', 'packaging.version', 'packaging.specifiers',
-                            'packaging.requirements', 'packaging.markers', '_sysconfigdata__win32_', 'win32api'],
+                            'packaging.requirements', 'packaging.markers', '_sysconfigdata__win32_', 'win32api'] + module_imports + lazy_imports,
              hookspath=[os.path.abspath(os.path.join('.', 'hooks'))],
              runtime_hooks=[],
              excludes=[],
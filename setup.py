@@ -1,7 +1,10 @@
 __version__ = '1.1.2.post0'
+import ast
+import json
 import os
 
 from setuptools import setup, find_packages
+from setuptools.command.build_py import build_py
 
 # README read-in
 from os import path
@@ -21,6 +24,36 @@ def recursive_pkg_files(file_ext):
     return paths
 
 
+def builtin_modules():
+    """
+    The entry points of the modules of SkyTemple. They are read from BUILTIN_MODULES in skytemple/core/modules.py,
+    which can't be imported here.
+    """
+    with open(path.join(this_directory, 'skytemple', 'core', 'modules.py'), encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(t, 'id', None) == 'BUILTIN_MODULES' for t in node.targets):
+            return ast.literal_eval(node.value)
+    raise ValueError("BUILTIN_MODULES not found in skytemple/core/modules.py.")
+
+
+MODULE_ENTRY_POINTS = builtin_modules()
+
+
+class BuildPyWithModuleManifest(build_py):
+    """
+    Also writes the module entry points into the data directory. They are used if the entry points can't be read
+    from the package metadata at runtime (eg. in PyInstaller builds), see skytemple.core.modules.
+    """
+    def run(self):
+        super().run()
+        if not self.dry_run:
+            target_dir = os.path.join(self.build_lib, 'skytemple', 'data')
+            self.mkpath(target_dir)
+            with open(os.path.join(target_dir, 'module_manifest.json'), 'w') as f:
+                json.dump({'skytemple.module': MODULE_ENTRY_POINTS}, f, indent=2)
+
+
 setup(
     name='skytemple',
     version=__version__,
@@ -40,7 +73,8 @@ setup(
         'tilequant >= 0.4.0',
         'skytemple-ssb-debugger >= 1.1.2',
         'pygal >= 2.4.0',
-        'CairoSVG >= 2.4.2'
+        'CairoSVG >= 2.4.2',
+        'importlib_metadata >= 1.0.0; python_version < "3.8"'
     ],
     extras_require={
         'discord':  ["pypresence >= 4.2.0"],
@@ -56,24 +90,9 @@ setup(
         'Programming Language :: Python :: 3.9'
     ],
     package_data={'skytemple': ['*.css', 'data/*/*/*/*/*', 'data/*', 'data/fixed_floor/*', 'data/back_illust/*'] + recursive_pkg_files('.glade')},
-    entry_points='''
-        [skytemple.module]
-        rom=          skytemple.module.rom.module:RomModule
-        bgp=          skytemple.module.bgp.module:BgpModule
-        tiled_img=    skytemple.module.tiled_img.module:TiledImgModule
-        map_bg=       skytemple.module.map_bg.module:MapBgModule
-        script=       skytemple.module.script.module:ScriptModule
-        gfxcrunch=    skytemple.module.gfxcrunch.module:GfxcrunchModule
-        sprite=       skytemple.module.sprite.module:SpriteModule
-        monster=      skytemple.module.monster.module:MonsterModule
-        portrait=     skytemple.module.portrait.module:PortraitModule
-        patch=        skytemple.module.patch.module:PatchModule
-        lists=        skytemple.module.lists.module:ListsModule
-        misc_graphics=skytemple.module.misc_graphics.module:MiscGraphicsModule
-        dungeon=      skytemple.module.dungeon.module:DungeonModule
-        dungeon_graphics=skytemple.module.dungeon_graphics.module:DungeonGraphicsModule
-        strings      =skytemple.module.strings.module:StringsModule
-        [console_scripts]
-        skytemple=skytemple.main:main
-    ''',
+    entry_points={
+        'skytemple.module': [f'{name}={target}' for name, target in MODULE_ENTRY_POINTS.items()],
+        'console_scripts': ['skytemple=skytemple.main:main', 'skytemple-cli=skytemple.cli:main'],
+    },
+    cmdclass={'build_py': BuildPyWithModuleManifest},
 )
@@ -0,0 +1,128 @@
+"""Headless command line interface, for running batch jobs on a ROM without the UI."""
+#  Copyright 2020-2021 Parakoopa and the SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+#
+#  This module must not import Gtk (directly or indirectly), so that it runs without a display.
+import argparse
+import logging
+import os
+import runpy
+import shutil
+import sys
+from typing import List, Tuple, Optional
+
+from skytemple.core.rom_project import RomProject
+from skytemple.core.task_scheduler import TaskScheduler
+
+logger = logging.getLogger(__name__)
+STEP_PATCH = 'patch'
+STEP_EXPORT = 'export'
+STEP_IMPORT = 'import'
+STEP_RUN = 'run'
+
+
+class _Step(argparse.Action):
+    """Collects the steps in the order they were given on the command line."""
+    def __call__(self, parser, namespace, values, option_string=None):
+        steps = getattr(namespace, 'steps', None) or []
+        steps.append((self.const, values if isinstance(values, list) else [values]))
+        namespace.steps = steps
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='skytemple-cli',
+        description="Run a sequence of operations on a ROM without the UI and save it. "
+                    "The steps are run in the order they are given."
+    )
+    parser.add_argument('rom', help="The ROM to open.")
+    parser.add_argument('-o', '--output', help="Save the ROM to this file instead of overwriting the opened ROM.")
+    parser.add_argument('--no-save', action='store_true', help="Don't save the ROM after running all steps.")
+    parser.add_argument('--recover-autosave', action='store_true',
+                        help="Restore the files from the autosave journal of the project first.")
+    parser.add_argument('-v', '--verbose', action='store_true', help="Log debug messages.")
+    parser.add_argument('--patch', action=_Step, const=STEP_PATCH, metavar='NAME', dest='steps',
+                        help="Apply an ASM patch. Pending changes are saved first.")
+    parser.add_argument('--export', action=_Step, const=STEP_EXPORT, nargs=2, metavar=('PATH_IN_ROM', 'FILE'),
+                        dest='steps', help="Write a file of the ROM to disk.")
+    parser.add_argument('--import', action=_Step, const=STEP_IMPORT, nargs=2, metavar=('PATH_IN_ROM', 'FILE'),
+                        dest='steps', help="Replace a file of the ROM with a file from disk.")
+    parser.add_argument('--run', action=_Step, const=STEP_RUN, metavar='SCRIPT', dest='steps',
+                        help="Run a Python script. The opened RomProject is available to it as 'project'.")
+    return parser
+
+
+def run_steps(project: RomProject, steps: List[Tuple[str, List[str]]]):
+    for kind, args in steps:
+        logger.info(f"Running {kind} {' '.join(args)}")
+        if kind == STEP_PATCH:
+            _apply_patch(project, args[0])
+        elif kind == STEP_EXPORT:
+            with open(args[1], 'wb') as f:
+                f.write(project.open_file_manually(args[0]))
+        elif kind == STEP_IMPORT:
+            if not project.file_exists(args[0]):
+                raise ValueError(f"The file {args[0]} does not exist in the ROM.")
+            with open(args[1], 'rb') as f:
+                project.save_file_manually(args[0], f.read())
+        elif kind == STEP_RUN:
+            runpy.run_path(args[0], init_globals={'project': project}, run_name='__skytemple_job__')
+        else:
+            raise ValueError(f"Unknown step {kind}.")
+
+
+def _apply_patch(project: RomProject, name: str):
+    # Patches are applied to the ROM directly, like in the UI the ROM must be saved before.
+    if project.has_modifications():
+        project.save_sync()
+    patcher = project.create_patcher()
+    try:
+        if patcher.is_applied(name):
+            logger.warning(f"The patch {name} is already applied, applying it again.")
+    except NotImplementedError:
+        raise ValueError(f"The ROM is not supported by the patch {name}.")
+    patcher.apply(name)
+    project.force_mark_as_modified()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = create_parser().parse_args(argv)
+    logging.basicConfig(
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        level=logging.DEBUG if args.verbose else logging.INFO
+    )
+    filename = args.rom
+    if args.output and not args.no_save:
+        # The ROM is copied and edited in place, so that the opened ROM stays untouched.
+        shutil.copyfile(filename, args.output)
+        filename = args.output
+    try:
+        project = RomProject.open_headless(os.path.abspath(filename), args.recover_autosave)
+        run_steps(project, args.steps or [])
+        if not args.no_save and project.has_modifications():
+            project.save_sync()
+            logger.info(f"Saved {filename}.")
+    except Exception as ex:
+        logger.error(f"Failed: {ex}", exc_info=args.verbose)
+        return 1
+    finally:
+        TaskScheduler.end()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
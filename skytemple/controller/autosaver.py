@@ -0,0 +1,117 @@
+"""Periodic autosaving of modified models into the autosave journal of the project."""
+#  Copyright 2020-2021 Parakoopa and the SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+import logging
+from typing import List, Tuple, Optional, TYPE_CHECKING
+
+from gi.repository import GLib
+
+from skytemple.core.model_serialization import serialize_in_worker_process
+from skytemple.core.task_scheduler import TaskScheduler, TaskPriority
+
+if TYPE_CHECKING:
+    from skytemple.core.rom_project import RomProject
+
+logger = logging.getLogger(__name__)
+# Seconds between checkpoints.
+AUTOSAVE_INTERVAL = 60
+
+
+class Autosaver:
+    """
+    Periodically writes the models of the project, that were modified since the last checkpoint, to its journal.
+    Models are copied on the main thread and the copies are serialized in worker processes.
+    """
+    def __init__(self, project: 'RomProject'):
+        self._project = project
+        self._running = False
+        self._source_id: Optional[int] = GLib.timeout_add_seconds_full(
+            GLib.PRIORITY_LOW, AUTOSAVE_INTERVAL, self._on_timeout
+        )
+
+    def stop(self):
+        if self._source_id is not None:
+            GLib.source_remove(self._source_id)
+            self._source_id = None
+
+    def checkpoint(self):
+        """Start a checkpoint. Must be called from the main thread."""
+        if self._running:
+            return
+        journal = self._project.get_autosave_journal()
+        candidates = [
+            (name, generation) for name, generation in self._project.get_modified_generations().items()
+            if journal.journaled.get(name) != generation
+        ]
+        # Models are not threadsafe, so they are copied here, while nobody edits them. Only the copies are
+        # serialized in the background.
+        records = []
+        snapshots = []
+        for name, generation in candidates:
+            data = self._project.get_serialized(name, generation)
+            if data is not None:
+                records.append((name, generation, data))
+                continue
+            try:
+                payload = self._project.snapshot_for_autosave(name)
+            except Exception as ex:
+                logger.warning(f"Autosaving {name} failed.", exc_info=ex)
+                continue
+            if payload is not None:
+                snapshots.append((name, generation, payload))
+        if len(records) < 1 and len(snapshots) < 1:
+            return
+        self._running = True
+        TaskScheduler.instance().run(
+            TaskPriority.BACKGROUND, self._serialize, records, snapshots, category='autosave.serialize'
+        )
+
+    def _on_timeout(self):
+        self.checkpoint()
+        return True
+
+    def _serialize(self, records: List[Tuple[str, int, bytes]], snapshots: List[Tuple[str, int, bytes]]):
+        futures = [(name, generation, serialize_in_worker_process(payload, name))
+                   for name, generation, payload in snapshots]
+        for name, generation, future in futures:
+            try:
+                data, _ = future.result()
+            except Exception as ex:
+                logger.warning(f"Autosaving {name} failed.", exc_info=ex)
+                continue
+            records.append((name, generation, data))
+        GLib.idle_add(self._commit, records)
+
+    def _commit(self, records: List[Tuple[str, int, bytes]]):
+        # This runs on the main thread, so no model is being modified right now. Data of models that were modified
+        # after they were copied is thrown away.
+        records = [r for r in records if self._project.store_serialized(*r)]
+        TaskScheduler.instance().run(TaskPriority.BACKGROUND, self._append, records, category='autosave.append')
+        return False
+
+    def _append(self, records: List[Tuple[str, int, bytes]]):
+        try:
+            generations = self._project.get_modified_generations()
+            # Files may have been saved in the meantime.
+            records = [r for r in records if generations.get(r[0]) == r[1]]
+            if len(records) > 0:
+                self._project.get_autosave_journal().append(records)
+                logger.debug(f"Autosaved {len(records)} files.")
+        except Exception as ex:
+            logger.warning("Writing the autosave journal failed.", exc_info=ex)
+        finally:
+            self._running = False
@@ -0,0 +1,295 @@
+#  Copyright 2020-2021 Parakoopa and the SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+import logging
+import sys
+from typing import Optional, Tuple, Callable
+
+from gi.repository import Gtk, GLib
+
+from skytemple.core.error_handler import display_error
+from skytemple.core.events.manager import EventManager
+from skytemple.core.lazy_import import ImportTimer, IMPORT_TIME_ENV
+from skytemple.core.main_loop_watchdog import MainLoopWatchdog
+from skytemple.core.profiler import PhaseProfiler
+from skytemple.core.task_scheduler import TaskScheduler
+
+logger = logging.getLogger(__name__)
+# Interval in which the task and main loop statistics are refreshed, while the dialog is open, in ms.
+TASKS_REFRESH_INTERVAL = 1000
+
+
+class DiagnosticsController:
+    """A dialog showing performance diagnostics, such as the profile of the last ROM opening."""
+    def __init__(self, parent_window: Gtk.Window):
+        self.parent_window = parent_window
+        self._task_stores: Optional[Tuple[Gtk.Label, Gtk.ListStore, Gtk.ListStore, Gtk.ListStore]] = None
+        self._stall_stores: Optional[Tuple[Gtk.ListStore, Gtk.ListStore]] = None
+        self._event_store: Optional[Gtk.ListStore] = None
+
+    def run(self):
+        dialog = Gtk.Dialog(title="Diagnostics", transient_for=self.parent_window, modal=True)
+        dialog.add_button("_Close", Gtk.ResponseType.CLOSE)
+        dialog.set_default_size(700, 500)
+        notebook = Gtk.Notebook()
+        notebook.append_page(self._build_open_profile_page(), Gtk.Label(label="ROM opening"))
+        notebook.append_page(self._build_import_times_page(), Gtk.Label(label="Imports"))
+        notebook.append_page(self._build_tasks_page(dialog), Gtk.Label(label="Tasks"))
+        notebook.append_page(self._build_main_loop_page(dialog), Gtk.Label(label="Main loop"))
+        notebook.append_page(self._build_events_page(), Gtk.Label(label="Events"))
+        content: Gtk.Box = dialog.get_content_area()
+        content.pack_start(notebook, True, True, 0)
+        dialog.show_all()
+        self._refresh()
+        refresh_source = GLib.timeout_add(TASKS_REFRESH_INTERVAL, self._refresh)
+        dialog.run()
+        GLib.source_remove(refresh_source)
+        self._task_stores = None
+        self._stall_stores = None
+        self._event_store = None
+        dialog.destroy()
+
+    def _build_open_profile_page(self) -> Gtk.Widget:
+        profiler: Optional[PhaseProfiler] = PhaseProfiler.last()
+        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=5)
+        box.set_border_width(5)
+        if profiler is None:
+            box.pack_start(Gtk.Label(label="No ROM was opened yet."), False, False, 0)
+            return box
+        summary = f"{profiler.label}: {profiler.total_wall:.3f}s"
+        if not profiler.trace_memory:
+            summary += " (memory is not traced, enable 'profile_memory' in the settings file)"
+        label = Gtk.Label(label=summary, xalign=0)
+        label.set_line_wrap(True)
+        box.pack_start(label, False, False, 0)
+
+        # Phase, thread, start, wall, CPU, memory
+        store = Gtk.ListStore(str, str, str, str, str, str)
+        for r in profiler.records():
+            store.append([
+                r.name, r.thread, f'{r.start * 1000:.0f}', f'{r.wall * 1000:.1f}', f'{r.cpu * 1000:.1f}',
+                f'{r.memory / 1024:.0f}' if r.memory is not None else '-'
+            ])
+        tree = Gtk.TreeView(model=store)
+        for i, title in enumerate(("Phase", "Thread", "Start (ms)", "Wall (ms)", "CPU (ms)", "Memory (KiB)")):
+            column = Gtk.TreeViewColumn(title, Gtk.CellRendererText(), text=i)
+            column.set_resizable(True)
+            tree.append_column(column)
+        scrolled = Gtk.ScrolledWindow()
+        scrolled.add(tree)
+        box.pack_start(scrolled, True, True, 0)
+        return box
+
+    def _build_import_times_page(self) -> Gtk.Widget:
+        timer: Optional[ImportTimer] = ImportTimer.instance()
+        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=5)
+        box.set_border_width(5)
+        if timer is None:
+            box.pack_start(Gtk.Label(
+                label=f"Import times are not recorded. Start SkyTemple with the environment variable "
+                      f"{IMPORT_TIME_ENV}=1 to record them."
+            ), False, False, 0)
+            return box
+        box.pack_start(Gtk.Label(label=f"Imports took {timer.total_time():.3f}s in total.", xalign=0),
+                       False, False, 0)
+
+        # Module, cumulative, self
+        store = Gtk.ListStore(str, str, str)
+        for r in sorted(timer.records(), key=lambda r: r.cumulative_time, reverse=True):
+            store.append([
+                '  ' * r.depth + r.module, f'{r.cumulative_time * 1000:.1f}', f'{r.self_time * 1000:.1f}'
+            ])
+        tree = Gtk.TreeView(model=store)
+        for i, title in enumerate(("Module", "Cumulative (ms)", "Self (ms)")):
+            column = Gtk.TreeViewColumn(title, Gtk.CellRendererText(), text=i)
+            column.set_resizable(True)
+            tree.append_column(column)
+        scrolled = Gtk.ScrolledWindow()
+        scrolled.add(tree)
+        box.pack_start(scrolled, True, True, 0)
+        return box
+
+    def _build_tasks_page(self, dialog: Gtk.Dialog) -> Gtk.Widget:
+        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=5)
+        box.set_border_width(5)
+        header = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=5)
+        summary = Gtk.Label(xalign=0)
+        header.pack_start(summary, True, True, 0)
+        save_button = Gtk.Button(label="Save as JSON...")
+        save_button.connect('clicked', lambda *args: self._save_report(
+            dialog, 'task_stats.json', TaskScheduler.instance().stats.write_report
+        ))
+        header.pack_start(save_button, False, False, 0)
+        box.pack_start(header, False, False, 0)
+
+        # Category, queued, running, finished, failed, wait p50, wait p95, run p50, run p95, run max
+        categories = Gtk.ListStore(str, int, int, int, int, str, str, str, str, str)
+        box.pack_start(self._task_tree(categories, (
+            "Category", "Queued", "Running", "Done", "Failed",
+            "Wait p50 (ms)", "Wait p95 (ms)", "Run p50 (ms)", "Run p95 (ms)", "Run max (ms)"
+        )), True, True, 0)
+        box.pack_start(Gtk.Label(label="Running tasks:", xalign=0), False, False, 0)
+        # Category, item, thread, waited, running for
+        running = Gtk.ListStore(str, str, str, str, str)
+        box.pack_start(self._task_tree(running, (
+            "Category", "Item", "Thread", "Waited (ms)", "Running for (ms)"
+        )), True, True, 0)
+        box.pack_start(Gtk.Label(label="Recently finished tasks:", xalign=0), False, False, 0)
+        # Category, item, thread, wait, run
+        recent = Gtk.ListStore(str, str, str, str, str)
+        box.pack_start(self._task_tree(recent, (
+            "Category", "Item", "Thread", "Wait (ms)", "Run (ms)"
+        )), True, True, 0)
+        self._task_stores = (summary, categories, running, recent)
+        return box
+
+    @staticmethod
+    def _task_tree(store: Gtk.ListStore, titles) -> Gtk.Widget:
+        tree = Gtk.TreeView(model=store)
+        for i, title in enumerate(titles):
+            column = Gtk.TreeViewColumn(title, Gtk.CellRendererText(), text=i)
+            column.set_resizable(True)
+            column.set_sort_column_id(i)
+            tree.append_column(column)
+        scrolled = Gtk.ScrolledWindow()
+        scrolled.add(tree)
+        return scrolled
+
+    def _build_main_loop_page(self, dialog: Gtk.Dialog) -> Gtk.Widget:
+        watchdog: Optional[MainLoopWatchdog] = MainLoopWatchdog.instance()
+        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=5)
+        box.set_border_width(5)
+        if watchdog is None:
+            box.pack_start(Gtk.Label(
+                label="The main loop is not watched. Set 'main_loop_stall_threshold_ms' in the settings file."
+            ), False, False, 0)
+            return box
+        header = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=5)
+        header.pack_start(Gtk.Label(
+            label=f"Handlers that blocked the main loop for more than {watchdog.threshold * 1000:.0f}ms:", xalign=0
+        ), True, True, 0)
+        save_button = Gtk.Button(label="Save as JSON...")
+        save_button.connect('clicked', lambda *args: self._save_report(
+            dialog, 'main_loop_stalls.json', watchdog.write_report
+        ))
+        header.pack_start(save_button, False, False, 0)
+        box.pack_start(header, False, False, 0)
+        # Handler, count, total, max
+        handlers = Gtk.ListStore(str, int, str, str)
+        box.pack_start(self._task_tree(handlers, ("Handler", "Stalls", "Total (ms)", "Max (ms)")), True, True, 0)
+        box.pack_start(Gtk.Label(label="Recent stalls (select one to see the stack):", xalign=0), False, False, 0)
+        # Duration, handler, stack
+        stalls = Gtk.ListStore(str, str, str)
+        stalls_tree = self._task_tree(stalls, ("Duration (ms)", "Handler"))
+        box.pack_start(stalls_tree, True, True, 0)
+        stack_buffer = Gtk.TextBuffer()
+        stack_view = Gtk.TextView(buffer=stack_buffer, editable=False, monospace=True)
+        stack_scrolled = Gtk.ScrolledWindow()
+        stack_scrolled.add(stack_view)
+        box.pack_start(stack_scrolled, True, True, 0)
+
+        def on_stall_selected(selection: Gtk.TreeSelection):
+            model, treeiter = selection.get_selected()
+            stack_buffer.set_text(model[treeiter][2] if treeiter is not None else '')
+        stalls_tree.get_child().get_selection().connect('changed', on_stall_selected)
+        self._stall_stores = (handlers, stalls)
+        return box
+
+    def _build_events_page(self) -> Gtk.Widget:
+        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=5)
+        box.set_border_width(5)
+        box.pack_start(Gtk.Label(label="Time spent by the event listeners, per event:", xalign=0), False, False, 0)
+        # Listener, event, thread, count, coalesced, total, max
+        self._event_store = Gtk.ListStore(str, str, str, int, int, str, str)
+        box.pack_start(self._task_tree(self._event_store, (
+            "Listener", "Event", "Thread", "Handled", "Coalesced", "Total (ms)", "Max (ms)"
+        )), True, True, 0)
+        return box
+
+    def _refresh(self):
+        if self._task_stores is None:
+            return False
+        self._refresh_tasks()
+        self._refresh_stalls()
+        self._refresh_events()
+        return True
+
+    def _refresh_stalls(self):
+        watchdog = MainLoopWatchdog.instance()
+        if self._stall_stores is None or watchdog is None:
+            return
+        handlers, stalls = self._stall_stores
+        handlers.clear()
+        for h in watchdog.by_handler():
+            handlers.append([h.handler, h.count, _ms(h.total), _ms(h.max)])
+        recent = watchdog.recent()
+        if len(recent) != len(stalls):
+            # Stalls are only added, don't reset the selection, if nothing changed.
+            stalls.clear()
+            for stall in recent:
+                stalls.append([_ms(stall.duration), stall.handler, '\n'.join(stall.stack)])
+
+    def _refresh_events(self):
+        if self._event_store is None:
+            return
+        self._event_store.clear()
+        for st in EventManager.instance().listener_stats():
+            self._event_store.append([
+                st.listener, st.event_name, 'worker' if st.background else 'caller',
+                st.count, st.coalesced, _ms(st.total), _ms(st.max)
+            ])
+
+    def _refresh_tasks(self):
+        summary, categories, running, recent = self._task_stores
+        scheduler = TaskScheduler.instance()
+        stats = scheduler.stats
+        summary.set_label(f"{scheduler.thread_workers} worker threads, statistics of the last {stats.now():.0f}s.")
+        categories.clear()
+        for name, c in sorted(stats.categories().items()):
+            categories.append([
+                name, c.queued, c.running, c.finished, c.failed,
+                _ms(c.wait.percentile(50)), _ms(c.wait.percentile(95)),
+                _ms(c.run.percentile(50)), _ms(c.run.percentile(95)), _ms(c.run.max)
+            ])
+        running.clear()
+        for r in stats.running():
+            running.append([r.category, r.item or '', r.thread, _ms(r.wait), _ms(r.run)])
+        recent.clear()
+        for r in stats.recent():
+            recent.append([r.category + (' (failed)' if r.failed else ''), r.item or '', r.thread,
+                           _ms(r.wait), _ms(r.run)])
+
+    @staticmethod
+    def _save_report(dialog: Gtk.Dialog, default_name: str, write_report: Callable[[str], None]):
+        chooser = Gtk.FileChooserNative.new(
+            "Save report...",
+            dialog,
+            Gtk.FileChooserAction.SAVE,
+            None, None
+        )
+        chooser.set_current_name(default_name)
+        response = chooser.run()
+        fn = chooser.get_filename()
+        chooser.destroy()
+        if response == Gtk.ResponseType.ACCEPT:
+            try:
+                write_report(fn)
+            except OSError as ex:
+                display_error(sys.exc_info(), str(ex), "Error saving the report")
+
+
+def _ms(seconds: float) -> str:
+    return f'{seconds * 1000:.1f}'
@@ -23,7 +23,7 @@ import urllib
 import webbrowser
 from gettext import gettext
 from threading import current_thread
-from typing import Optional
+from typing import Optional, List
 from urllib.request import urlopen
 
 import gi
@@ -31,22 +31,31 @@ import logging
 
 from gi.repository.GdkPixbuf import Pixbuf
 
+from skytemple.controller.autosaver import Autosaver
+from skytemple.controller.diagnostics import DiagnosticsController
 from skytemple.controller.settings import SettingsController
 from skytemple.controller.tilequant import TilequantController
 from skytemple.core.abstract_module import AbstractModule
-from skytemple.core.controller_loader import load_controller
+from skytemple.core.autosave import AutosaveJournal
+from skytemple.core.controller_loader import load_controller, CONTROLLER_SERIAL
 from skytemple.core.error_handler import display_error
 from skytemple.core.events.events import EVT_VIEW_SWITCH, EVT_PROJECT_OPEN
 from skytemple.core.events.manager import EventManager
+from skytemple.core.item_search_index import ItemSearchIndex
 from skytemple.core.message_dialog import SkyTempleMessageDialog
 from skytemple.core.module_controller import AbstractController
+from skytemple.core.profiler import PhaseProfiler
 from skytemple.core.rom_project import RomProject
 from skytemple.core.settings import SkyTempleSettingsStore
+from skytemple.core.task_scheduler import TaskScheduler, TaskPriority
 from skytemple.core.ssb_debugger.manager import DebuggerManager
+from skytemple.core.view_pool import ViewPool, ViewKey
+from skytemple.core.view_load_token import ViewLoadToken
+from skytemple.core.view_prefetcher import ViewPrefetcher, PrefetchItem
 from skytemple_files.common.project_file_manager import ProjectFileManager
 from skytemple_files.common.task_runner import AsyncTaskRunner
 from skytemple.core.ui_utils import add_dialog_file_filters, recursive_down_item_store_mark_as_modified, data_dir, \
-    version, open_dir
+    version, open_dir, is_deferred_tree_stub
 
 gi.require_version('Gtk', '3.0')
 
@@ -57,7 +66,13 @@ main_thread = current_thread()
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 COL_VISIBLE = 7
+# Delay of the search after the last change of the search text (on top of the delay of Gtk.SearchEntry), in ms.
+SEARCH_DEBOUNCE_MS = 100
+# Number of items after and before the opened item in the tree, that are prefetched.
+PREFETCH_NEXT = 2
+PREFETCH_PREVIOUS = 1
 DISCORD_INVITE_LINK = 'https://discord.gg/skytemple'
+OPEN_PROFILE_REPORT_FILE_NAME = 'profile_rom_open.json'
 
 
 class MainController:
@@ -93,23 +108,39 @@ class MainController:
         self._loading_dialog: Dialog = None
         self._main_item_list: TreeView = None
         self._main_item_filter: TreeModel = None
+        # Set while the item store is detached from the main item list (see _detach_item_store).
+        self._item_store_detached = False
         self._last_selected_view_model = None
         self._last_selected_view_iter = None
 
         self._recent_files_store: ListStore = self.builder.get_object('recent_files_store')
         self._item_store: TreeStore = builder.get_object('item_store')
+        self._search_index = ItemSearchIndex(self._item_store, 1, COL_VISIBLE)
+        self._item_store.connect('row-inserted', self.on_item_store_row_inserted)
+        self._item_store.connect('row-deleted', self.on_item_store_row_deleted)
         self._editor_stack: Stack = builder.get_object('editor_stack')
 
         builder.connect_signals(self)
         window.connect("destroy", self.on_destroy)
 
         self._search_text = None
+        self._search_timeout_id: Optional[int] = None
         self._current_view_module = None
         self._current_view_controller_class = None
         self._current_view_item_id = None
+        # Token of the last requested view load. Cancelled, when another view is requested.
+        self._view_load_token: Optional[ViewLoadToken] = None
+        # The view shown in the editor stack and its key in the view pool (None if it must not be pooled).
+        self._loaded_view: Optional[Widget] = None
+        self._loaded_view_controller: Optional[AbstractController] = None
+        self._loaded_view_key: Optional[ViewKey] = None
+        # Recently shown views, that are hidden in the editor stack.
+        self._view_pool = ViewPool(self.settings.get_view_pool_size(), lambda cached: self._destroy_view(cached.view))
+        self._prefetcher = ViewPrefetcher()
         self._resize_timeout_id = None
         self._loaded_map_bg_module = None
         self._current_breadcrumbs = []
+        self._autosaver: Optional[Autosaver] = None
 
         if not sys.platform.startswith('darwin'):
             # Don't load the window position on macOS to prevent
@@ -126,10 +157,14 @@ class MainController:
 
         self.tilequant_controller = TilequantController(self.window, self.builder)
         self.settings_controller = SettingsController(self.window, self.builder, self.settings)
+        self.diagnostics_controller = DiagnosticsController(self.window)
 
     def on_destroy(self, *args):
-        logger.debug('Window destroyed. Ending task runner.')
+        logger.debug('Window destroyed. Ending task runner and scheduler.')
+        if self._autosaver is not None:
+            self._autosaver.stop()
         AsyncTaskRunner.end()
+        TaskScheduler.end()
         Gtk.main_quit()
         self._debugger_manager.destroy()
 
@@ -141,6 +176,7 @@ class MainController:
         if rom is not None and rom.has_modifications():
             response = self._show_are_you_sure(rom)
             if response == 0:
+                rom.discard_autosave()
                 return False
             elif response == 1:
                 # Save (True on success, False on failure. Don't close the file if we can't save it...)
@@ -279,18 +315,27 @@ class MainController:
         # Init the sprite provider
         RomProject.get_current().get_sprite_provider().init_loader(self.window.get_screen())
 
+        # Views of the previous ROM must not be shown again.
+        self._view_pool.clear()
+        self._prefetcher.clear()
+        self._loaded_view_key = None
+        # The tree is built while detached from the view, the view only has to process the finished tree.
+        self._detach_item_store()
         self._init_window_after_rom_load(os.path.basename(RomProject.get_current().filename))
         try:
             # Load root node, ROM
             project = RomProject.get_current()
             rom_module = project.get_rom_module()
-            rom_module.load_rom_data()
+            with PhaseProfiler.phase('rom_module.load_rom_data'):
+                rom_module.load_rom_data()
             
             # Initialize patch-specific properties for this rom project
-            project.init_patch_properties()
+            with PhaseProfiler.phase('init_patch_properties'):
+                project.init_patch_properties()
             
             logger.info(f'Loaded ROM {project.filename} ({rom_module.get_static_data().game_edition})')
-            rom_module.load_tree_items(self._item_store, None)
+            with PhaseProfiler.phase('load_tree_items.RomModule'):
+                rom_module.load_tree_items(self._item_store, None)
             root_node = rom_module.get_root_node()
 
             
@@ -299,19 +344,32 @@ class MainController:
 
             # Load item tree items
             for module in sorted(project.get_modules(False), key=lambda m: m.sort_order()):
-                module.load_tree_items(self._item_store, root_node)
+                with PhaseProfiler.phase(f'load_tree_items.{module.__class__.__name__}'):
+                    module.load_tree_items(self._item_store, root_node)
                 if module.__class__.__name__ == 'MapBgModule':
                     self._loaded_map_bg_module = module
+            if not self.settings.get_deferred_module_loading():
+                with PhaseProfiler.phase('materialize_tree_items'):
+                    self._materialize_all_tree_items()
+            with PhaseProfiler.phase('attach_item_store'):
+                self._attach_item_store()
             # TODO: Load settings from ROM for history, bookmarks, etc? - separate module?
 
             # Trigger event
             EventManager.instance().trigger(EVT_PROJECT_OPEN, project=project)
 
+            self._autosaver = Autosaver(project)
+            if project.has_modifications():
+                # Changes were restored from the autosave.
+                self._set_title(os.path.basename(project.filename), True)
+
             # Select & load main ROM item by default
             selection: TreeSelection = self._main_item_list.get_selection()
             selection.select_path(self._item_store.get_path(root_node))
             self.load_view(self._item_store, root_node, self._main_item_list)
+            self._finish_open_profile(project)
         except BaseException as ex:
+            self._attach_item_store()
             self.on_file_opened_error(sys.exc_info(), ex)
             return
 
@@ -327,6 +385,9 @@ class MainController:
         """Handle errors during file openings."""
         assert current_thread() == main_thread
         logger.error('Error on file open.', exc_info=exception)
+        profiler = PhaseProfiler.current()
+        if profiler is not None:
+            profiler.finish()
         if self._loading_dialog is not None:
             self._loading_dialog.hide()
             self._loading_dialog = None
@@ -372,20 +433,54 @@ class MainController:
     def load_view(self, model: Gtk.TreeModel, treeiter: Gtk.TreeIter, tree: Gtk.TreeView, scroll_into_view=True):
         logger.debug('View selected. Locking and showing Loader.')
         path = model.get_path(treeiter)
+        if is_deferred_tree_stub(model[treeiter]):
+            # The placeholder of a subtree that is not loaded yet was selected, show its parent instead.
+            path.up()
+        # Make sure the subtree of the module is loaded. This may add rows, so the iterator is re-created.
+        model[path][2].materialize_tree_items()
+        treeiter = model.get_iter(path)
         self._lock_trees()
         selected_node = model[treeiter]
         self._init_window_before_view_load(model[treeiter])
-        # Show loading stack page in editor stack
-        self._editor_stack.set_visible_child(self.builder.get_object('es_loading'))
         # Set current view values for later check (if race conditions between fast switching)
         self._current_view_module = selected_node[2]
         self._current_view_controller_class = selected_node[3]
         self._current_view_item_id = selected_node[4]
-        # Fully load the view and the controller
-        AsyncTaskRunner.instance().run_task(load_controller(
-            self._current_view_module, self._current_view_controller_class, self._current_view_item_id,
-            self
-        ))
+        # Loads of previously selected views that are still running are not needed anymore.
+        self._view_load_token = self._new_view_load_token()
+        project = RomProject.get_current()
+        # Everything read on the main thread from now on is used by the views of the module.
+        project.set_accessing_module(type(self._current_view_module))
+        key = ViewPool.key(self._current_view_module, self._current_view_controller_class, self._current_view_item_id)
+        pooled = None
+        if key is not None:
+            pooled = self._view_pool.take(key, project.get_dependency_generation(type(self._current_view_module)))
+        prefetched = None
+        if pooled is None:
+            prefetched = self._prefetcher.take(
+                (self._current_view_module, self._current_view_controller_class, self._current_view_item_id),
+                project.get_project_modification_generation()
+            )
+        if pooled is not None:
+            logger.debug('Showing pooled view.')
+            pooled.controller.on_view_shown()
+            self._present_view(self._current_view_module, pooled.controller, pooled.view, key)
+        elif prefetched is not None:
+            logger.debug('Showing prefetched view.')
+            self.on_view_loaded(self._current_view_module, prefetched, self._current_view_item_id,
+                                self._view_load_token)
+        else:
+            # Show loading stack page in editor stack
+            self._editor_stack.set_visible_child(self.builder.get_object('es_loading'))
+            # Fully load the view and the controller
+            TaskScheduler.instance().run(
+                TaskPriority.INTERACTIVE, load_controller,
+                self._current_view_module, self._current_view_controller_class, self._current_view_item_id,
+                self, self._view_load_token,
+                category='view_load',
+                item=f'{self._current_view_controller_class.__name__} {self._current_view_item_id}',
+                serial=CONTROLLER_SERIAL
+            )
         # Expand the node
         tree.expand_to_path(path)
         # Select node
@@ -395,60 +490,150 @@ class MainController:
             tree.scroll_to_cell(path, None, True, 0.5, 0.5)
         self._last_selected_view_model = model
         self._last_selected_view_iter = treeiter
+        self._prefetcher.prefetch(project, self._items_to_prefetch(model, treeiter))
+
+    def _items_to_prefetch(self, model: Gtk.TreeModel, treeiter: Gtk.TreeIter) -> List[PrefetchItem]:
+        """The items next to the given one, that are likely opened next and are not in the view pool."""
+        candidates = []
+        it = treeiter
+        for _ in range(PREFETCH_NEXT):
+            it = model.iter_next(it)
+            if it is None:
+                break
+            candidates.append(it)
+        it = treeiter
+        for _ in range(PREFETCH_PREVIOUS):
+            it = model.iter_previous(it)
+            if it is None:
+                break
+            candidates.append(it)
+        items = []
+        for it in candidates:
+            row = model[it]
+            key = ViewPool.key(row[2], row[3], row[4])
+            if key is None or key not in self._view_pool:
+                items.append((row[2], row[3], row[4]))
+        return items
+
+    def _new_view_load_token(self) -> ViewLoadToken:
+        previous = self._view_load_token
+        if previous is not None:
+            previous.cancel()
+        return ViewLoadToken(previous.generation + 1 if previous is not None else 0)
 
     def on_view_loaded(
-            self, module: AbstractModule, controller: AbstractController, item_id: int
+            self, module: AbstractModule, controller: AbstractController, item_id: int, token: ViewLoadToken
     ):
         """A new module view was loaded! Present it!"""
         assert current_thread() == main_thread
+        if token.cancelled:
+            # Another view was requested in the meantime, don't even create this view.
+            logger.debug(f'Loaded view {token} was superseded.')
+            return
         # Check if current view still matches expected
         logger.debug('View loaded.')
         try:
             view = controller.get_view()
         except Exception as err:
             logger.debug("Error retreiving the loaded view")
-            self.on_view_loaded_error(err)
+            self.on_view_loaded_error(err, token)
             return
         if self._current_view_module != module or self._current_view_controller_class != controller.__class__ or self._current_view_item_id != item_id:
             logger.warning('Loaded view not matching selection.')
             view.destroy()
             return
-        # Insert the view at page 3 [0,1,2,3] of the stack. If there is already a page, remove it.
-        old_view = self._editor_stack.get_child_by_name('es__loaded_view')
-        if old_view:
-            logger.debug('Destroying old view...')
-            self._editor_stack.remove(old_view)
-            old_view.destroy()
-        logger.debug('Adding and showing new view...')
-        self._editor_stack.add_named(view, 'es__loaded_view')
+        logger.debug('Adding new view...')
+        self._editor_stack.add(view)
         view.show_all()
+        self._present_view(module, controller, view, ViewPool.key(module, controller.__class__, item_id))
+
+    def _present_view(self, module: AbstractModule, controller: AbstractController, view: Widget,
+                      key: Optional[ViewKey]):
+        """Show a view, that is a page of the editor stack. The previous view is put into the view pool."""
+        view.show()
         self._editor_stack.set_visible_child(view)
+        if self._loaded_view is not None and self._loaded_view is not view:
+            # If the same item is opened again, the old view is replaced.
+            if self._loaded_view_key is not None and self._loaded_view_key != key and self._view_pool.size > 0:
+                logger.debug('Pooling old view...')
+                self._loaded_view.hide()
+                self._loaded_view_controller.on_view_hidden()
+                old_module = self._loaded_view_key[0]
+                self._view_pool.put(self._loaded_view_key, self._loaded_view_controller, self._loaded_view,
+                                    RomProject.get_current().get_dependency_generation(type(old_module)))
+            else:
+                self._destroy_view(self._loaded_view)
+        self._loaded_view = view
+        self._loaded_view_controller = controller
+        self._loaded_view_key = key
         logger.debug('Unlocking view trees.')
         self._unlock_trees()
         EventManager.instance().trigger(EVT_VIEW_SWITCH, module=module, controller=controller,
                                         breadcrumbs=self._current_breadcrumbs)
 
-    def on_view_loaded_error(self, ex: BaseException):
+    def _destroy_view(self, view: Widget):
+        logger.debug('Destroying old view...')
+        self._editor_stack.remove(view)
+        view.destroy()
+
+    def on_view_loaded_error(self, ex: BaseException, token: ViewLoadToken):
         """An error during module view load happened :("""
         assert current_thread() == main_thread
+        if token.cancelled:
+            logger.debug(f'Error loading the superseded view {token}.', exc_info=ex)
+            return
         logger.debug('View load error. Unlocking.')
         tb: TextBuffer = self.builder.get_object('es_error_text_buffer')
         tb.set_text(''.join(traceback.format_exception(etype=type(ex), value=ex, tb=ex.__traceback__)))
         self._editor_stack.set_visible_child(self.builder.get_object('es_error'))
         self._unlock_trees()
 
+    def on_item_store_row_inserted(self, model, path, iter):
+        self._search_index.on_row_inserted(iter)
+
+    def on_item_store_row_deleted(self, model, path):
+        self._search_index.invalidate()
+
     def on_item_store_row_changed(self, model, path, iter):
         """Update the window title for the current selected tree model row if it changed"""
         if model is not None and iter is not None:
+            self._search_index.on_row_changed(iter)
             selection_model, selection_iter = self._main_item_list.get_selection().get_selected()
             if selection_model is not None and selection_iter is not None:
                 if selection_model[selection_iter].path == path:
                     self._init_window_before_view_load(model[iter])
 
+    def on_main_item_list_test_expand_row(self, tree: TreeView, treeiter: TreeIter, path: TreePath):
+        """Load deferred subtrees when they are first expanded."""
+        model = tree.get_model()
+        child = model.iter_children(treeiter)
+        if child is not None and is_deferred_tree_stub(model[child]):
+            model[treeiter][2].materialize_tree_items()
+            # The model changed below the row, the iterators GTK holds for the expansion are invalid now:
+            # Cancel this expansion and expand again once the new rows are in.
+            path = path.copy()
+
+            def expand_again():
+                tree.expand_row(path, False)
+                return False
+            GLib.idle_add(expand_again)
+            return True
+        return False
+
     def on_main_item_list_search_search_changed(self, search: Gtk.SearchEntry):
-        """Filter the main item view using the search field"""
+        """Filter the main item view using the search field, once the user stopped typing."""
         self._search_text = search.get_text().strip()
+        if self._search_timeout_id is not None:
+            GLib.source_remove(self._search_timeout_id)
+        self._search_timeout_id = GLib.timeout_add(SEARCH_DEBOUNCE_MS, self._on_search_timeout)
+
+    def _on_search_timeout(self):
+        self._search_timeout_id = None
+        if self._search_text != "":
+            # Search results must include the subtrees that are not loaded yet.
+            self._materialize_all_tree_items()
         self._filter__refresh_results()
+        return False
 
     def on_settings_show_assistant_clicked(self, *args):
         assistant: Gtk.Assistant = self.builder.get_object('intro_dialog')
@@ -472,6 +657,9 @@ class MainController:
             return
         self._loaded_map_bg_module.add_created_with_logo()
 
+    def on_settings_diagnostics_clicked(self, *args):
+        self.diagnostics_controller.run()
+
     def on_settings_dir_clicked(self, *args):
         open_dir(ProjectFileManager.shared_config_dir())
 
@@ -569,12 +757,47 @@ class MainController:
                 f'Loading ROM "{os.path.basename(filename)}"...'
             )
             logger.debug(f'Opening {filename}.')
-            RomProject.open(filename, self)
+            if self._autosaver is not None:
+                self._autosaver.stop()
+                self._autosaver = None
+            RomProject.open(filename, self, self._ask_recover_autosave(filename))
             # Add to the list of recent files and save
             self._update_recent_files(filename)
             # Show loading spinner
             self._loading_dialog.run()
 
+    def _ask_recover_autosave(self, filename: str) -> bool:
+        """If there are autosaved changes for the ROM, ask the user whether to restore them."""
+        journal = AutosaveJournal(filename)
+        if not journal.has_records():
+            journal.clear()
+            return False
+        md = SkyTempleMessageDialog(
+            self.window,
+            Gtk.DialogFlags.MODAL, Gtk.MessageType.QUESTION,
+            Gtk.ButtonsType.YES_NO,
+            f"SkyTemple was not closed properly the last time this ROM was edited, but there are autosaved "
+            f"changes.\nDo you want to restore them? If not, they will be discarded.",
+            title="Restore autosaved changes?"
+        )
+        response = md.run()
+        md.destroy()
+        if response == Gtk.ResponseType.YES:
+            return True
+        journal.clear()
+        return False
+
+    def _finish_open_profile(self, project: RomProject):
+        profiler = PhaseProfiler.current()
+        if profiler is None:
+            return
+        profiler.finish()
+        profiler.log_summary()
+        try:
+            profiler.write_report(project.get_project_file_manager().dir(), OPEN_PROFILE_REPORT_FILE_NAME)
+        except OSError as ex:
+            logger.warning("Writing the ROM open profile failed.", exc_info=ex)
+
     def _check_open_file(self):
         """Check for open files, and ask the user what to do. Returns false if they cancel."""
         rom = RomProject.get_current()
@@ -586,6 +809,7 @@ class MainController:
 
             if response == 0:
                 # Don't save
+                rom.discard_autosave()
                 return True
             elif response == 1:
                 # Save (True on success, False on failure. Don't close the file if we can't save it...)
@@ -617,59 +841,53 @@ class MainController:
 
         main_item_list.set_model(self._main_item_filter)
         self._main_item_filter.set_visible_column(COL_VISIBLE)
+        main_item_list.connect('test-expand-row', self.on_main_item_list_test_expand_row)
 
         # TODO: Recent and Favorites
 
-    # TODO: CODE DUPLICATION BETWEEN SKYTEMPLE AND SSB DEBUGGER -- If we ever make a common package, this must go into it!
+    def _detach_item_store(self):
+        """
+        Detach the item store from the main item list, so that the tree can be (re)built without updating the
+        view and the filter for every row. Must be followed by _attach_item_store.
+        """
+        if self._item_store_detached:
+            return
+        self._item_store_detached = True
+        self._main_item_list.set_model(None)
+        self._main_item_filter = None
+        self._item_store.handler_block_by_func(self.on_item_store_row_changed)
+        self._item_store.handler_block_by_func(self.on_item_store_row_inserted)
+        self._item_store.handler_block_by_func(self.on_item_store_row_deleted)
+        self._search_index.invalidate()
+
+    def _attach_item_store(self):
+        """Show the item store in the main item list again, in one step."""
+        if not self._item_store_detached:
+            return
+        self._item_store_detached = False
+        self._item_store.handler_unblock_by_func(self.on_item_store_row_changed)
+        self._item_store.handler_unblock_by_func(self.on_item_store_row_inserted)
+        self._item_store.handler_unblock_by_func(self.on_item_store_row_deleted)
+        self._main_item_filter = self._item_store.filter_new()
+        self._main_item_filter.set_visible_column(COL_VISIBLE)
+        self._main_item_list.set_model(self._main_item_filter)
+
+    def _materialize_all_tree_items(self):
+        """Load the subtrees of all modules, that were deferred on ROM load."""
+        project = RomProject.get_current()
+        if project is not None:
+            for module in project.get_modules(False):
+                module.materialize_tree_items()
+
     def _filter__refresh_results(self):
         """Filter the main item view"""
-        if self._search_text == "":
-            self._item_store.foreach(self._filter__reset_row, True)
-        else:
+        matches = self._search_index.search(self._search_text)
+        if self._search_text != "":
             self._main_item_list.collapse_all()
-            self._item_store.foreach(self._filter__reset_row, False)
-            self._item_store.foreach(self._filter__show_matches)
-            self._main_item_filter.foreach(self._filter__expand_all_visible)
-
-    def _filter__reset_row(self, model, path, iter, make_visible):
-        """Change the visibility of the given row"""
-        self._item_store[iter][COL_VISIBLE] = make_visible
-
-    def _filter__make_path_visible(self, model, iter):
-        """Make a row and its ancestors visible"""
-        while iter:
-            self._item_store[iter][COL_VISIBLE] = True
-            iter = model.iter_parent(iter)
-
-    def _filter__make_subtree_visible(self, model, iter):
-        """Make descendants of a row visible"""
-        for i in range(model.iter_n_children(iter)):
-            subtree = model.iter_nth_child(iter, i)
-            if model[subtree][COL_VISIBLE]:
-                # Subtree already visible
-                continue
-            self._item_store[subtree][COL_VISIBLE] = True
-            self._filter__make_subtree_visible(model, subtree)
-
-    def _filter__expand_all_visible(self, model: Gtk.TreeStore, path, iter):
-        """
-        This is super annoying. Because of the two different "views" on the model,
-        we can't do this in show_matches, because we have to use the filter model here!
-        """
-        search_query = self._search_text.lower()
-        text = model[iter][1].lower()
-        if search_query in text:
-            self._main_item_list.expand_to_path(path)
-
-    def _filter__show_matches(self, model: Gtk.TreeStore, path, iter):
-        search_query = self._search_text.lower()
-        text = model[iter][1].lower()
-        if search_query in text:
-            # Propagate visibility change up
-            self._filter__make_path_visible(model, iter)
-            # Propagate visibility change down
-            self._filter__make_subtree_visible(model, iter)
-    # END CODE DUPLICATION
+            for store_iter in matches:
+                found, filter_iter = self._main_item_filter.convert_child_iter_to_iter(store_iter)
+                if found:
+                    self._main_item_list.expand_to_path(self._main_item_filter.get_path(filter_iter))
 
     def _configure_error_view(self):
         sw: ScrolledWindow = self.builder.get_object('es_error_text_sw')
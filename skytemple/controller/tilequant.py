@@ -21,10 +21,9 @@ from enum import Enum
 from functools import partial
 
 from skytemple.core.error_handler import display_error
+from skytemple.core.lazy_import import lazy_import
 from skytemple.core.message_dialog import SkyTempleMessageDialog
 from skytemple.core.ui_utils import add_dialog_png_filter
-from skytemple_tilequant.aikku.image_converter import AikkuImageConverter, DitheringMode
-from skytemple_tilequant.image_converter import ImageConverter
 
 try:
     from PIL import Image
@@ -32,6 +31,9 @@ except ImportError:
     from pil import Image
 from gi.repository import Gtk
 logger = logging.getLogger(__name__)
+# Tilequant is only loaded, once an image is actually converted.
+aikku_image_converter = lazy_import('skytemple_tilequant.aikku.image_converter')
+image_converter = lazy_import('skytemple_tilequant.image_converter')
 
 
 class ImageConversionMode(Enum):
@@ -251,15 +253,15 @@ class TilequantController:
 
     def _convert(self, image, transparent_color, mode, num_pals, dither_level):
         if mode == ImageConversionMode.JUST_REORGANIZE:
-            converter = ImageConverter(image, transparent_color=transparent_color)
+            converter = image_converter.ImageConverter(image, transparent_color=transparent_color)
             return converter.convert(num_pals, colors_per_palette=16, color_steps=-1, max_colors=256,
                                      low_to_high=False, mosaic_limiting=False)
-        converter = AikkuImageConverter(image, transparent_color)
-        dither_mode = DitheringMode.NONE
+        converter = aikku_image_converter.AikkuImageConverter(image, transparent_color)
+        dither_mode = aikku_image_converter.DitheringMode.NONE
         if mode == ImageConversionMode.DITHERING_ORDERED:
-            dither_mode = DitheringMode.ORDERED
+            dither_mode = aikku_image_converter.DitheringMode.ORDERED
         elif mode == ImageConversionMode.DITHERING_FLOYDSTEINBERG:
-            dither_mode = DitheringMode.FLOYDSTEINBERG
+            dither_mode = aikku_image_converter.DitheringMode.FLOYDSTEINBERG
         return converter.convert(
             num_pals,
             dithering_mode=dither_mode,
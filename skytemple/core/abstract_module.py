@@ -16,14 +16,14 @@
 #  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
 
 from abc import ABC, abstractmethod
-from typing import Optional, List
-
-import pkg_resources
-from gi.repository import Gtk
-from gi.repository.Gtk import TreeStore, TreeIter
+from typing import Optional, List, TYPE_CHECKING
 
 from skytemple.core.open_request import OpenRequest
 
+if TYPE_CHECKING:
+    from gi.repository import Gtk
+    from gi.repository.Gtk import TreeStore, TreeIter
+
 
 class AbstractModule(ABC):
     """
@@ -51,11 +51,20 @@ class AbstractModule(ABC):
         """
 
     @abstractmethod
-    def load_tree_items(self, item_store: TreeStore, root_node: Optional[TreeIter]):
+    def load_tree_items(self, item_store: 'TreeStore', root_node: Optional['TreeIter']):
         """Add the module nodes to the item tree"""
         pass
 
-    def handle_request(self, request: OpenRequest) -> Optional[Gtk.TreeIter]:
+    def materialize_tree_items(self):
+        """
+        Modules that only add a stub for (parts of) their subtree in load_tree_items (see
+        skytemple.core.ui_utils.add_deferred_tree_stub) must fill in the real subtree here.
+        This is called when a stub is first expanded, when a view of this module is opened or before
+        a request is handled by this module. Must be safe to call multiple times.
+        If not implemented, does nothing.
+        """
+
+    def handle_request(self, request: OpenRequest) -> Optional['Gtk.TreeIter']:
         """
         Handle an OpenRequest. Must return the iterator for the view in the main view list, as generated
         in load_tree_items.
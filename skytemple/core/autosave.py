@@ -0,0 +1,117 @@
+"""The autosave journal, that stores modified models in the project directory."""
+#  Copyright 2020-2021 Parakoopa and the SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+import logging
+import os
+import struct
+import threading
+import zlib
+from typing import Dict, List, Tuple, Optional
+
+from skytemple_files.common.project_file_manager import ProjectFileManager
+
+logger = logging.getLogger(__name__)
+JOURNAL_FILE_NAME = 'autosave.journal'
+JOURNAL_MAGIC = b'STJ1'
+# Size and modification time (ns) of the ROM file the journal is based on.
+JOURNAL_HEADER = struct.Struct('<4sQQ')
+# Length of the file name and data.
+RECORD_HEADER = struct.Struct('<II')
+RECORD_CHECKSUM = struct.Struct('<I')
+
+
+class AutosaveJournal:
+    """
+    An append-only journal of the serialized data of modified files. It belongs to one state of the ROM file on disk
+    and is cleared, once the ROM is saved. Replaying it into the ROM restores all journaled files.
+    """
+    def __init__(self, rom_filename: str):
+        self.rom_filename = rom_filename
+        self.filename = os.path.join(ProjectFileManager(rom_filename).dir(), JOURNAL_FILE_NAME)
+        # The generation of the data journaled for each file (see RomProject.get_modification_generation).
+        self.journaled: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def has_records(self) -> bool:
+        """Whether the journal contains data for the current ROM file."""
+        return len(self.read()) > 0
+
+    def read(self) -> Dict[str, bytes]:
+        """
+        Returns the latest journaled data for each file. If the journal doesn't belong to the ROM file on disk,
+        nothing is returned. A truncated or corrupted record (eg. from a crash while writing) ends the journal.
+        """
+        with self._lock:
+            if not os.path.exists(self.filename):
+                return {}
+            with open(self.filename, 'rb') as f:
+                data = f.read()
+        if len(data) < JOURNAL_HEADER.size or data[:JOURNAL_HEADER.size] != self._header():
+            return {}
+        files = {}
+        pos = JOURNAL_HEADER.size
+        while pos + RECORD_HEADER.size <= len(data):
+            name_len, data_len = RECORD_HEADER.unpack_from(data, pos)
+            start = pos + RECORD_HEADER.size
+            end = start + name_len + data_len
+            if end + RECORD_CHECKSUM.size > len(data):
+                break
+            checksum, = RECORD_CHECKSUM.unpack_from(data, end)
+            if zlib.crc32(data[start:end]) != checksum:
+                logger.warning(f"The autosave journal {self.filename} is corrupted at {pos}.")
+                break
+            files[data[start:start + name_len].decode('utf-8')] = data[start + name_len:end]
+            pos = end + RECORD_CHECKSUM.size
+        return files
+
+    def append(self, records: List[Tuple[str, int, bytes]]):
+        """Append the data of files. The records are (file name, generation, data)."""
+        with self._lock:
+            mode = 'ab'
+            if not self._is_current():
+                mode = 'wb'
+                self.journaled = {}
+            with open(self.filename, mode) as f:
+                if mode == 'wb':
+                    f.write(self._header())
+                for name, generation, data in records:
+                    encoded_name = name.encode('utf-8')
+                    f.write(RECORD_HEADER.pack(len(encoded_name), len(data)))
+                    f.write(encoded_name)
+                    f.write(data)
+                    f.write(RECORD_CHECKSUM.pack(zlib.crc32(encoded_name + data)))
+                f.flush()
+                os.fsync(f.fileno())
+            for name, generation, _ in records:
+                self.journaled[name] = generation
+
+    def clear(self):
+        with self._lock:
+            self.journaled = {}
+            if os.path.exists(self.filename):
+                os.remove(self.filename)
+
+    def _is_current(self) -> bool:
+        if not os.path.exists(self.filename):
+            return False
+        with open(self.filename, 'rb') as f:
+            return f.read(JOURNAL_HEADER.size) == self._header()
+
+    def _header(self) -> bytes:
+        stat = os.stat(self.rom_filename)
+        return JOURNAL_HEADER.pack(JOURNAL_MAGIC, stat.st_size, stat.st_mtime_ns)
+
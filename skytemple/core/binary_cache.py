@@ -0,0 +1,163 @@
+"""A cache of the decoded binaries of a ROM and of the tables read from them."""
+#  Copyright 2020-2021 Parakoopa and the SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+import threading
+from copy import deepcopy
+from typing import Dict, Callable, Tuple, TypeVar, Any, List
+
+from ndspy.rom import NintendoDSRom
+
+from skytemple_files.common.ppmdu_config.data import Pmd2Binary, Pmd2Data
+from skytemple_files.common.util import get_binary_from_rom_ppmdu, set_binary_in_rom_ppmdu
+
+T = TypeVar('T')
+
+
+class BinaryCache:
+    """
+    The binaries (arm9 and overlays) of a ROM, so that they are not read (and decompressed) from the ROM on every
+    access. The binaries are immutable bytes, which are shared by all users.
+
+    Tables read from a binary (eg. by the skytemple_files Hardcoded* classes) can be cached as well, they are tied to
+    the version of the binary they were read from. Callers get copies of them, so the cached tables are never
+    changed. Every modification of a binary increases its version.
+
+    Modifications can be batched in a transaction (see begin): All modifications of a binary then share one
+    mutable buffer, which is only written back to the ROM on commit. Reads during a transaction see the
+    modifications made so far. A transaction belongs to the thread that opened it, other threads wait until it
+    is closed.
+    """
+    def __init__(self, rom: NintendoDSRom):
+        self._rom = rom
+        self._lock = threading.RLock()
+        self._binaries: Dict[str, bytes] = {}
+        self._versions: Dict[str, int] = {}
+        # (binary, decode function) -> (binary version, decoded value)
+        self._tables: Dict[Tuple[str, Callable], Tuple[int, Any]] = {}
+        # Nesting depth of transactions and the buffers of the binaries modified in the current transaction.
+        self._transaction_depth = 0
+        self._pending: Dict[str, Tuple[Pmd2Binary, bytearray]] = {}
+
+    def get(self, binary: Pmd2Binary) -> bytes:
+        with self._lock:
+            if binary.filepath not in self._binaries:
+                if binary.filepath in self._pending:
+                    self._binaries[binary.filepath] = bytes(self._pending[binary.filepath][1])
+                else:
+                    self._binaries[binary.filepath] = bytes(get_binary_from_rom_ppmdu(self._rom, binary))
+            return self._binaries[binary.filepath]
+
+    def version(self, binary: Pmd2Binary) -> int:
+        with self._lock:
+            return self._versions.get(binary.filepath, 0)
+
+    def table(self, binary: Pmd2Binary, static_data: Pmd2Data, decode: Callable[[bytes, Pmd2Data], T]) -> T:
+        """
+        Returns decode(binary, static_data). The result is cached until the binary is modified. decode is part of
+        the cache key, so it must be a function or method, not a new lambda on each call.
+        Each call returns a copy of the cached table, changes to it must be written back with modify.
+        """
+        key = (binary.filepath, decode)
+        with self._lock:
+            version = self.version(binary)
+            cached = self._tables.get(key)
+            if cached is None or cached[0] != version:
+                cached = (version, decode(self.get(binary), static_data))
+                self._tables[key] = cached
+            return deepcopy(cached[1])
+
+    def modify(self, binary: Pmd2Binary, modify_cb: Callable[[bytearray], None]):
+        """Modify a binary and write it back to the ROM (or to the transaction buffer, if a transaction is open)."""
+        with self._lock:
+            if self._transaction_depth > 0:
+                if binary.filepath not in self._pending:
+                    self._pending[binary.filepath] = (binary, bytearray(self.get(binary)))
+                modify_cb(self._pending[binary.filepath][1])
+                # Copied from the buffer again, once it's read.
+                self._binaries.pop(binary.filepath, None)
+            else:
+                data = bytearray(self.get(binary))
+                modify_cb(data)
+                set_binary_in_rom_ppmdu(self._rom, binary, data)
+                self._binaries[binary.filepath] = bytes(data)
+            self._bump(binary.filepath)
+
+    def begin(self):
+        """
+        Open a transaction. Transactions can be nested, the modifications are written to the ROM when the
+        outermost transaction is committed. Until then, the binaries are locked for all other threads.
+        """
+        self._lock.acquire()
+        self._transaction_depth += 1
+
+    def in_transaction(self) -> bool:
+        """Whether the calling thread has opened a transaction."""
+        # Only the owner of the transaction can acquire the lock without waiting, while it's open.
+        if not self._lock.acquire(blocking=False):
+            return False
+        try:
+            return self._transaction_depth > 0
+        finally:
+            self._lock.release()
+
+    def commit(self) -> List[str]:
+        """
+        Close a transaction. Returns the paths of the binaries, that were written to the ROM
+        (none for nested transactions).
+        """
+        try:
+            self._transaction_depth -= 1
+            if self._transaction_depth > 0:
+                return []
+            pending, self._pending = self._pending, {}
+            for binary, data in pending.values():
+                set_binary_in_rom_ppmdu(self._rom, binary, data)
+            return list(pending.keys())
+        finally:
+            self._lock.release()
+
+    def rollback(self):
+        """
+        Close a transaction. If it is the outermost transaction, all modifications made in it (and in nested
+        transactions) are thrown away.
+        """
+        try:
+            self._transaction_depth -= 1
+            if self._transaction_depth > 0:
+                return
+            pending, self._pending = self._pending, {}
+            for filepath in pending:
+                self._binaries.pop(filepath, None)
+                self._bump(filepath)
+        finally:
+            self._lock.release()
+
+    def invalidate(self):
+        """
+        Forget everything, eg. after the binaries were modified in the ROM directly (by a patch).
+        Modifications in an open transaction are kept.
+        """
+        with self._lock:
+            for filepath in self._binaries:
+                self._bump(filepath)
+            self._binaries.clear()
+            self._tables.clear()
+
+    def _bump(self, filepath: str):
+        self._versions[filepath] = self._versions.get(filepath, 0) + 1
+        # Tables of older versions are never returned again.
+        self._tables = {k: v for k, v in self._tables.items() if k[0] != filepath}
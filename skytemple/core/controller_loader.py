@@ -16,20 +16,40 @@
 #  You should have received a copy of the GNU General Public License
 #  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
 
+import logging
 from typing import TYPE_CHECKING
 
 from gi.repository import GLib
 
 from skytemple.core.module_controller import AbstractController
+from skytemple.core.rom_project import RomProject
+from skytemple.core.view_load_token import ViewLoadToken, ViewLoadCancelled, set_current_view_load_token
 
 if TYPE_CHECKING:
     from skytemple.core.abstract_module import AbstractModule
     from skytemple.controller.main import MainController
 
+logger = logging.getLogger(__name__)
+# Creating a controller reads models that are not threadsafe. Tasks doing so (view loads and prefetches) use this
+# serial key, so that the TaskScheduler runs them one after the other.
+CONTROLLER_SERIAL = 'controller'
 
-async def load_controller(module: 'AbstractModule', controller_class, item_id: int, main_controller: 'MainController'):
+
+def load_controller(module: 'AbstractModule', controller_class, item_id: int, main_controller: 'MainController',
+                          token: ViewLoadToken):
+    if token.cancelled:
+        # Another view was selected, before this one could even start loading.
+        logger.debug(f'Skipped loading the superseded view {token}.')
+        return
+    set_current_view_load_token(token)
     try:
-        controller: AbstractController = controller_class(module, item_id)
-        GLib.idle_add(lambda: main_controller.on_view_loaded(module, controller, item_id))
+        with RomProject.get_current().track_access(type(module)):
+            controller: AbstractController = controller_class(module, item_id)
+        if token.cancelled:
+            logger.debug(f'Discarded the superseded view {token}.')
+            return
+        GLib.idle_add(lambda: main_controller.on_view_loaded(module, controller, item_id, token))
+    except ViewLoadCancelled:
+        logger.debug(f'Cancelled loading the superseded view {token}.')
     except Exception as ex:
-        GLib.idle_add(lambda ex=ex: main_controller.on_view_loaded_error(ex))
+        GLib.idle_add(lambda ex=ex: main_controller.on_view_loaded_error(ex, token))
@@ -15,7 +15,7 @@
 #  You should have received a copy of the GNU General Public License
 #  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
 from abc import ABC
-from typing import List
+from typing import List, FrozenSet
 
 from skytemple.core.abstract_module import AbstractModule
 from skytemple.core.module_controller import AbstractController
@@ -28,7 +28,20 @@ class AbstractListener(ABC):
     Implementing any method is optional. You can also implement 'on' for a generic
     event listener. This method will receive all events first and can also handle custom
     events.
+
+    Only the listeners implementing the method for an event (or 'on') are called.
+    Listeners that are slow (eg. because they do network I/O) should set background to True.
+    They are then called on a worker thread of the TaskScheduler, one event after the other. Modules, views and
+    controllers passed with events may be changed or destroyed on the main thread in the meantime, so listeners
+    that need them should instead handle the events on the main thread and trigger a custom event with the
+    collected data for a background listener (see the Discord presence).
     """
+    # Whether the listener is called on a worker thread, instead of the thread triggering the event.
+    background = False
+    # For background listeners: Events of which only the latest one matters. Pending events with
+    # the same name are dropped, when a new one is triggered.
+    coalesced_events: FrozenSet[str] = frozenset()
+
     def on_main_window_focus(self):
         """Triggered when the main window (re)-gains focus."""
 
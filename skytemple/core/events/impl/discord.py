@@ -27,6 +27,7 @@ from gi.repository import GLib
 
 from skytemple.core.abstract_module import AbstractModule
 from skytemple.core.events.abstract_listener import AbstractListener
+from skytemple.core.events.manager import EventManager
 from skytemple.core.module_controller import AbstractController
 from skytemple.core.rom_project import RomProject
 from pypresence import Presence
@@ -40,9 +41,17 @@ CLIENT_ID = "736538698719690814"
 IDLE_TIMEOUT = 5 * 60
 logger = logging.getLogger(__name__)
 SHOW_ROM_NAME = False
+# Triggered by DiscordPresence with the new presence (a dict of strings), handled by DiscordRpcListener.
+EVT_DISCORD_PRESENCE_CHANGED = 'discord_presence_changed'
 
 
-class DiscordPresence(AbstractListener):
+class DiscordRpcListener(AbstractListener):
+    """Sends the presence collected by DiscordPresence to Discord."""
+    # Updating the presence blocks until Discord answered.
+    background = True
+    # Only the latest presence is relevant.
+    coalesced_events = frozenset({EVT_DISCORD_PRESENCE_CHANGED})
+
     def __init__(self):
         """
         Tries to initialize the connection with Discord.
@@ -50,6 +59,29 @@ class DiscordPresence(AbstractListener):
         """
         self.rpc: Presence = Presence(CLIENT_ID)
         self.rpc.connect()
+
+    def on_discord_presence_changed(self, presence: dict):
+        self._update_presence(**presence)
+
+    def _update_presence(
+            self, state, details, start,
+            large_text, large_image='skytemple',
+            small_image=None, small_text=None
+    ):
+        result = self.rpc.update(state=state, details=details, start=start, large_image=large_image,
+                                 large_text=large_text, small_image=small_image, small_text=small_text,
+                                 buttons=[{"label": "Get SkyTemple", "url": "https://skytemple.org"}])
+        logger.debug(f"Presence update result: {result}")
+
+
+class DiscordPresence(AbstractListener):
+    """
+    Collects the presence. The events are handled on the main thread, while the views and modules they
+    reference are still valid. The presence is sent by DiscordRpcListener in the background.
+    """
+
+    def __init__(self):
+        # Only used on the main thread.
         self._idle_timeout_id = None
 
         self.start = None
@@ -80,13 +112,17 @@ class DiscordPresence(AbstractListener):
         self._update_current_presence()
 
     def on_idle(self):
-        self._idle_timeout_id = None
         self.current_presence = 'idle'
         self._update_current_presence()
 
     def on_focus_lost(self):
         if self._idle_timeout_id is None:
-            self._idle_timeout_id = GLib.timeout_add_seconds(IDLE_TIMEOUT, self.on_idle)
+            self._idle_timeout_id = GLib.timeout_add_seconds(IDLE_TIMEOUT, self._on_idle_timeout)
+
+    def _on_idle_timeout(self):
+        self._idle_timeout_id = None
+        self.on_idle()
+        return False
 
     def on_project_open(self, project: RomProject):
         self.project = project
@@ -250,41 +286,29 @@ class DiscordPresence(AbstractListener):
         self._update_current_presence()
 
     def _update_current_presence(self):
-        try:
-            if self.current_presence == 'main':
-                self._update_presence(
-                    state=self.module_state,
-                    details=self.module_info,
-                    start=self.start,
-                    large_text=self.rom_name
-                )
-            elif self.current_presence == 'debugger':
-                self._update_presence(
-                    state=self.debugger_script_name,
-                    details="In the debugger" if self.debugger_script_name is None else "Editing script",
-                    start=self.start,
-                    large_text=self.rom_name,
-                    small_image="bug"
-                )
-            else:  # idle
-                self._update_presence(
-                    state=None,
-                    details="Idle",
-                    start=None,
-                    large_text=self.rom_name
-                )
-        except BaseException as ex:
-            logger.error("Updating the presence failed: ", exc_info=ex)
-
-    def _update_presence(
-            self, state, details, start,
-            large_text, large_image='skytemple',
-            small_image=None, small_text=None
-    ):
-        result = self.rpc.update(state=state, details=details, start=start, large_image=large_image,
-                                 large_text=large_text, small_image=small_image, small_text=small_text,
-                                 buttons=[{"label": "Get SkyTemple", "url": "https://skytemple.org"}])
-        logger.debug(f"Presence update result: {result}")
+        if self.current_presence == 'main':
+            presence = dict(
+                state=self.module_state,
+                details=self.module_info,
+                start=self.start,
+                large_text=self.rom_name
+            )
+        elif self.current_presence == 'debugger':
+            presence = dict(
+                state=self.debugger_script_name,
+                details="In the debugger" if self.debugger_script_name is None else "Editing script",
+                start=self.start,
+                large_text=self.rom_name,
+                small_image="bug"
+            )
+        else:  # idle
+            presence = dict(
+                state=None,
+                details="Idle",
+                start=None,
+                large_text=self.rom_name
+            )
+        EventManager.instance().trigger(EVT_DISCORD_PRESENCE_CHANGED, presence)
 
     def _reset_playtime(self):
         self.start = int(time.time())
@@ -15,22 +15,58 @@
 #  You should have received a copy of the GNU General Public License
 #  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
 import logging
-from typing import List
+import threading
+import time
+from collections import deque
+from typing import List, Dict, Tuple, NamedTuple, Optional
 
 from gi.repository import GLib
 
 from skytemple.core.events.abstract_listener import AbstractListener
 from skytemple.core.events.events import EVT_FOCUS_LOST, EVT_MAIN_WINDOW_FOCUS, EVT_DEBUGGER_WINDOW_FOCUS
+from skytemple.core.task_scheduler import TaskScheduler, TaskPriority
 
 logger = logging.getLogger(__name__)
+# Listeners on the main thread that take longer than this (in seconds) to handle an event are logged.
+SLOW_LISTENER_THRESHOLD = 0.05
+
+
+class ListenerStats(NamedTuple):
+    listener: str
+    event_name: str
+    background: bool
+    count: int
+    total: float
+    max: float
+    # Events that were dropped, because a newer event of the same name replaced them (see coalesced_events).
+    coalesced: int
+
+
+class _BackgroundQueue:
+    """The pending events of a background listener. They are handled one after the other, in order."""
+    def __init__(self):
+        self.events: 'deque[Tuple[str, tuple, dict]]' = deque()
+        self.scheduled = False
 
 
 class EventManager:
-    """Class for handling UI events."""
+    """
+    Class for handling UI events.
+
+    Listeners are indexed by the events they handle (see AbstractListener), so that triggering an event only
+    calls the listeners interested in it. Listeners marked as background are called on the TaskScheduler
+    instead of the thread that triggered the event. How long the listeners take is recorded per event.
+    """
     _instance = None
 
     def __init__(self):
         self._listeners: List[AbstractListener] = []
+        # Event name -> listeners handling it. Built on demand, reset when listeners change.
+        self._index: Dict[str, List[AbstractListener]] = {}
+        self._lock = threading.Lock()
+        self._background_queues: Dict[int, _BackgroundQueue] = {}
+        # (listener class, event name) -> stats
+        self._stats: Dict[Tuple[str, str], ListenerStats] = {}
 
         self._a_window_had_focus = False
         self._main_window_focus = None
@@ -45,24 +81,91 @@ class EventManager:
 
     def trigger(self, event_name: str, *args, **kwargs):
         """Triggers the specified UI event with the provided arguments."""
-        logger.debug(f'Event {event_name} triggered.')
-        for listener in self._listeners:
-            try:
-                listener.on(event_name, *args, **kwargs)
-            except BaseException as ex:
-                logger.error(
-                    f'Error while handling event {event_name} with handler {listener}: {str(ex)}', exc_info=ex
-                )
+        logger.debug('Event %s triggered.', event_name)
+        for listener in self._listeners_for(event_name):
+            if listener.background:
+                self._queue_background(listener, event_name, args, kwargs)
+            else:
+                self._dispatch(listener, event_name, args, kwargs)
 
     def register_listener(self, listener_instance: AbstractListener):
         """Registers a listener to trigger events on."""
         if listener_instance not in self._listeners:
             self._listeners.append(listener_instance)
+            self._index = {}
 
     def unregister_listener(self, listener_instance: AbstractListener):
         """Removes a previously registered listener"""
         if listener_instance in self._listeners:
             self._listeners.remove(listener_instance)
+            self._index = {}
+            with self._lock:
+                self._background_queues.pop(id(listener_instance), None)
+
+    def listener_stats(self) -> List[ListenerStats]:
+        """How long the listeners took to handle events, the slowest in total first."""
+        with self._lock:
+            return sorted(self._stats.values(), key=lambda st: st.total, reverse=True)
+
+    def _listeners_for(self, event_name: str) -> List[AbstractListener]:
+        if event_name not in self._index:
+            self._index[event_name] = [
+                listener for listener in self._listeners if _handles(listener, event_name)
+            ]
+        return self._index[event_name]
+
+    def _dispatch(self, listener: AbstractListener, event_name: str, args: tuple, kwargs: dict):
+        start = time.perf_counter()
+        try:
+            listener.on(event_name, *args, **kwargs)
+        except BaseException as ex:
+            logger.error(
+                f'Error while handling event {event_name} with handler {listener}: {str(ex)}', exc_info=ex
+            )
+        duration = time.perf_counter() - start
+        if not listener.background and duration > SLOW_LISTENER_THRESHOLD:
+            logger.warning(f'Handling event {event_name} with handler {listener} took {duration:.3f}s.')
+        self._record(listener, event_name, duration)
+
+    def _queue_background(self, listener: AbstractListener, event_name: str, args: tuple, kwargs: dict):
+        coalesced = 0
+        with self._lock:
+            queue = self._background_queues.setdefault(id(listener), _BackgroundQueue())
+            if event_name in listener.coalesced_events:
+                # Only the latest event of this kind matters.
+                pending = len(queue.events)
+                queue.events = deque(e for e in queue.events if e[0] != event_name)
+                coalesced = pending - len(queue.events)
+            queue.events.append((event_name, args, kwargs))
+            already_scheduled = queue.scheduled
+            queue.scheduled = True
+        if coalesced > 0:
+            self._record(listener, event_name, coalesced=coalesced)
+        if already_scheduled:
+            return
+        TaskScheduler.instance().run(
+            TaskPriority.BACKGROUND, self._handle_background, listener, queue,
+            category='event_listener', item=listener.__class__.__name__
+        )
+
+    def _handle_background(self, listener: AbstractListener, queue: _BackgroundQueue):
+        while True:
+            with self._lock:
+                if len(queue.events) < 1:
+                    queue.scheduled = False
+                    return
+                event_name, args, kwargs = queue.events.popleft()
+            self._dispatch(listener, event_name, args, kwargs)
+
+    def _record(self, listener: AbstractListener, event_name: str,
+                duration: Optional[float] = None, coalesced: int = 0):
+        """Records a handled event (if duration is set) and the number of dropped events."""
+        key = (listener.__class__.__name__, event_name)
+        with self._lock:
+            st = self._stats.get(key, ListenerStats(key[0], event_name, listener.background, 0, 0.0, 0.0, 0))
+            if duration is not None:
+                st = st._replace(count=st.count + 1, total=st.total + duration, max=max(st.max, duration))
+            self._stats[key] = st._replace(coalesced=st.coalesced + coalesced)
 
     def main_window_has_focus(self):
         if not self._main_window_focus:
@@ -97,3 +200,12 @@ class EventManager:
         if self._a_window_had_focus and not self._debugger_window_focus and not self._main_window_focus:
             self._a_window_had_focus = False
             self.trigger(EVT_FOCUS_LOST)
+
+
+def _handles(listener: AbstractListener, event_name: str) -> bool:
+    """Whether the listener has to be called for the event."""
+    if type(listener).on is not AbstractListener.on:
+        # Generic listeners receive all events.
+        return True
+    handler = getattr(type(listener), f'on_{event_name}', None)
+    return handler is not None and handler is not getattr(AbstractListener, f'on_{event_name}', None)
@@ -0,0 +1,150 @@
+"""Saves a ROM by only rewriting the files that changed, if they still fit into their old place."""
+#  Copyright 2020-2021 Parakoopa and the SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+import logging
+import mmap
+import os
+import struct
+from bisect import bisect_right
+from typing import Optional, List
+
+from ndspy import fnt as fntLib
+from ndspy.rom import NintendoDSRom
+
+logger = logging.getLogger(__name__)
+
+# Header fields that ndspy writes into the header when saving. If any of them changed, the header has to be rebuilt.
+HEADER_ATTRIBUTES = (
+    'name', 'idCode', 'developerCode', 'unitCode', 'encryptionSeedSelect', 'deviceCapacity',
+    'pad015', 'pad016', 'pad017', 'pad018', 'pad019', 'pad01A', 'pad01B', 'pad01C',
+    'region', 'version', 'autostart', 'arm9EntryAddress', 'arm9RamAddress', 'arm7EntryAddress', 'arm7RamAddress',
+    'normalCardControlRegisterSettings', 'secureCardControlRegisterSettings', 'secureAreaChecksum',
+    'secureTransferDelay', 'arm9CodeSettingsPointerAddress', 'arm7CodeSettingsPointerAddress', 'secureAreaDisable',
+    'pad088', 'nintendoLogo', 'debugRomAddress', 'pad16C', 'pad200'
+)
+# Non-FAT regions of the ROM image, which are compared by value.
+BLOB_ATTRIBUTES = (
+    'arm9', 'arm9PostData', 'arm7', 'arm9OverlayTable', 'arm7OverlayTable', 'iconBanner', 'debugRom', 'rsaSignature'
+)
+# Offsets of header fields, that point to regions in the ROM image.
+HEADER_REGION_OFFSETS = (0x20, 0x30, 0x40, 0x48, 0x50, 0x58, 0x68, 0x80, 0x160)
+HEADER_FAT_OFFSET = 0x48
+PADDING_BYTE = b'\xFF'
+
+
+class RomSaveSnapshot:
+    """
+    The state of a ROM as it was last read from or written to disk.
+    Only references to the file contents are kept, so this is cheap.
+    """
+    def __init__(self, rom: NintendoDSRom, filename: str):
+        self.filename = os.path.abspath(filename)
+        self.files = list(rom.files)
+        self.fnt = fntLib.save(rom.filenames)
+        self.header = tuple(_copy(getattr(rom, attr)) for attr in HEADER_ATTRIBUTES)
+        self.blobs = tuple(_copy(getattr(rom, attr)) for attr in BLOB_ATTRIBUTES)
+        stat = os.stat(self.filename)
+        self.disk_size = stat.st_size
+        self.disk_mtime = stat.st_mtime_ns
+
+    def changed_files(self, rom: NintendoDSRom) -> Optional[List[int]]:
+        """
+        Returns the IDs of all files that were replaced since the snapshot was taken.
+        If anything other than the content of existing files changed, None is returned.
+        """
+        if len(rom.files) != len(self.files):
+            return None
+        if tuple(getattr(rom, attr) for attr in HEADER_ATTRIBUTES) != self.header:
+            return None
+        if tuple(getattr(rom, attr) for attr in BLOB_ATTRIBUTES) != self.blobs:
+            return None
+        if fntLib.save(rom.filenames) != self.fnt:
+            return None
+        return [i for i, (new, old) in enumerate(zip(rom.files, self.files)) if new is not old]
+
+    def matches_disk(self, filename: str) -> bool:
+        """Whether the file on disk is still the one this snapshot was taken of."""
+        filename = os.path.abspath(filename)
+        if filename != self.filename or not os.path.exists(filename):
+            return False
+        stat = os.stat(filename)
+        return stat.st_size == self.disk_size and stat.st_mtime_ns == self.disk_mtime
+
+
+def save_incrementally(rom: NintendoDSRom, filename: str, snapshot: Optional[RomSaveSnapshot]) -> Optional[List[int]]:
+    """
+    Tries to save the ROM by patching the changed files into the ROM image on disk in place and updating
+    their FAT entries. This is only possible if nothing but the file contents changed since the snapshot and
+    every changed file still fits into the space it had in the image. The header is not touched, so its
+    checksum stays valid.
+    Returns the IDs of the written files, or None if a full rebuild is required (nothing was written then).
+    """
+    if snapshot is None or not snapshot.matches_disk(filename):
+        return None
+    changed = snapshot.changed_files(rom)
+    if changed is None:
+        return None
+    if len(changed) < 1:
+        return changed
+
+    with open(filename, 'r+b') as f:
+        with mmap.mmap(f.fileno(), 0) as image:
+            fat_offset, fat_len = struct.unpack_from('<II', image, HEADER_FAT_OFFSET)
+            if fat_len != len(rom.files) * 8:
+                return None
+            fat = [struct.unpack_from('<II', image, fat_offset + 8 * i) for i in range(len(rom.files))]
+            boundaries = sorted(
+                {start for start, end in fat} |
+                {struct.unpack_from('<I', image, off)[0] for off in HEADER_REGION_OFFSETS} |
+                {len(image)}
+            )
+
+            # Check everything first: If a single file doesn't fit, nothing may be written.
+            for file_id in changed:
+                size = len(rom.files[file_id])
+                slot_size = _slot_size(fat, boundaries, file_id)
+                if size > slot_size:
+                    logger.debug(f"File {file_id} does not fit into its slot ({size} > {slot_size} bytes).")
+                    return None
+
+            for file_id in changed:
+                start, end = fat[file_id]
+                data = rom.files[file_id]
+                new_end = start + len(data)
+                image[start:new_end] = data
+                if new_end < end:
+                    image[new_end:end] = PADDING_BYTE * (end - new_end)
+                struct.pack_into('<II', image, fat_offset + 8 * file_id, start, new_end)
+            image.flush()
+    return changed
+
+
+def _slot_size(fat, boundaries, file_id):
+    """The space the file may use without overlapping anything else in the ROM image."""
+    start, end = fat[file_id]
+    for other_id, (other_start, other_end) in enumerate(fat):
+        if other_id != file_id and other_start == start and other_end > other_start:
+            # Another (non-empty) file starts at the same location. This file can't grow.
+            return end - start
+    next_boundary = boundaries[bisect_right(boundaries, start)] if start < boundaries[-1] else start
+    return max(next_boundary, end) - start
+
+
+def _copy(value):
+    if isinstance(value, bytearray):
+        return bytes(value)
+    return value
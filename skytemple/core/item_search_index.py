@@ -0,0 +1,157 @@
+"""A search index over the labels of the main item tree."""
+#  Copyright 2020-2021 Parakoopa and the SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+from typing import Dict, List, Optional, Set
+
+from gi.repository import Gtk
+
+
+class _Entry:
+    __slots__ = ('iter', 'parent', 'children', 'label')
+
+    def __init__(self, it: Gtk.TreeIter, parent: Optional[int], label: str):
+        self.iter = it
+        self.parent = parent
+        self.children: List[int] = []
+        self.label = label
+
+
+class ItemSearchIndex:
+    """
+    The lowercased labels of all rows of a TreeStore, with their parents and children, for filtering the tree
+    by a search query. Rows are identified by their (persistent) tree store iterators.
+
+    The index has to be informed about inserted and changed rows (on_row_inserted / on_row_changed). If rows
+    are removed or the store is modified without informing the index, it must be invalidated and is rebuilt
+    on the next search.
+    """
+    def __init__(self, store: Gtk.TreeStore, label_column: int, visible_column: int):
+        self._store = store
+        self._label_column = label_column
+        self._visible_column = visible_column
+        self._entries: Dict[int, _Entry] = {}
+        self._valid = False
+        # Rows, which are currently visible.
+        self._visible: Set[int] = set()
+        # The last query and its matches. A query, which contains the last query, can only match a subset.
+        self._last_query = ''
+        self._last_matches: Set[int] = set()
+
+    def invalidate(self):
+        self._valid = False
+        self._entries = {}
+        self._visible = set()
+        self._last_query = ''
+
+    def on_row_inserted(self, it: Gtk.TreeIter):
+        if not self._valid:
+            return
+        parent_it = self._store.iter_parent(it)
+        parent = _key(parent_it) if parent_it is not None else None
+        if parent is not None and parent not in self._entries:
+            self.invalidate()
+            return
+        self._add(it, parent, self._store[it][self._visible_column])
+        self._last_query = ''
+
+    def on_row_changed(self, it: Gtk.TreeIter):
+        if not self._valid:
+            return
+        entry = self._entries.get(_key(it))
+        if entry is None:
+            self.invalidate()
+            return
+        label = self._label(it)
+        if entry.label != label:
+            entry.label = label
+            self._last_query = ''
+
+    def search(self, query: str) -> List[Gtk.TreeIter]:
+        """
+        Show only the rows matching the query (case-insensitive), their ancestors and descendants. An empty query
+        shows all rows. Only the rows whose visibility changes are updated.
+        Returns the iterators of the matching rows.
+        """
+        if not self._valid:
+            self._build()
+        query = query.lower()
+        if query == '':
+            matches = set()
+            wanted = set(self._entries.keys())
+        else:
+            if self._last_query != '' and self._last_query in query:
+                candidates = self._last_matches
+            else:
+                candidates = self._entries.keys()
+            matches = {k for k in candidates if query in self._entries[k].label}
+            wanted = self._with_relatives(matches)
+        self._last_query = query
+        self._last_matches = matches
+
+        for key in wanted - self._visible:
+            self._store[self._entries[key].iter][self._visible_column] = True
+        for key in self._visible - wanted:
+            self._store[self._entries[key].iter][self._visible_column] = False
+        self._visible = wanted
+        return [e.iter for k, e in self._entries.items() if k in matches]
+
+    def _with_relatives(self, matches: Set[int]) -> Set[int]:
+        result = set(matches)
+        for key in matches:
+            parent = self._entries[key].parent
+            while parent is not None and parent not in result:
+                result.add(parent)
+                parent = self._entries[parent].parent
+        stack = list(matches)
+        while stack:
+            for child in self._entries[stack.pop()].children:
+                if child not in result:
+                    result.add(child)
+                    stack.append(child)
+        return result
+
+    def _build(self):
+        self._entries = {}
+        self._visible = set()
+        stack = [(self._store.get_iter_first(), None)]
+        while stack:
+            it, parent = stack.pop()
+            while it is not None:
+                key = self._add(it, parent, self._store[it][self._visible_column])
+                child = self._store.iter_children(it)
+                if child is not None:
+                    stack.append((child, key))
+                it = self._store.iter_next(it)
+        self._valid = True
+        self._last_query = ''
+
+    def _add(self, it: Gtk.TreeIter, parent: Optional[int], visible: bool) -> int:
+        key = _key(it)
+        self._entries[key] = _Entry(it.copy(), parent, self._label(it))
+        if parent is not None:
+            self._entries[parent].children.append(key)
+        if visible:
+            self._visible.add(key)
+        return key
+
+    def _label(self, it: Gtk.TreeIter) -> str:
+        return (self._store[it][self._label_column] or '').lower()
+
+
+def _key(it: Gtk.TreeIter) -> int:
+    # Tree store iterators are persistent and identify their row (node) by user_data.
+    return it.user_data
@@ -0,0 +1,166 @@
+"""Deferred imports of heavy dependencies and measuring the time spent importing modules."""
+#  Copyright 2020-2021 Parakoopa and the SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+#
+#  This module must only import the standard library, it is imported before everything else.
+import importlib.abc
+import importlib.util
+import sys
+import threading
+import time
+from types import ModuleType
+from typing import List, NamedTuple, Optional
+
+# If this environment variable is set, the ImportTimer is installed on startup (see skytemple.main).
+IMPORT_TIME_ENV = 'SKYTEMPLE_IMPORT_TIME'
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Returns the module with the given name, without executing it yet. The module is executed, when one of its
+    attributes is first accessed. Use this for heavy dependencies, that are only needed by some features.
+
+    If the module was already imported, it is returned as-is. If it can not be found, ImportError is raised
+    immediately, so that missing dependencies are still noticed on startup.
+
+    The module must only be used from the main thread: Before Python 3.12 loading the module on first
+    access is not thread-safe. Import modules used by worker threads locally in functions instead.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"No module named '{name}'", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+class ImportRecord(NamedTuple):
+    module: str
+    # Time spent executing the module, in seconds. Cumulative includes the modules imported by it.
+    self_time: float
+    cumulative_time: float
+    # Depth of the import, 0 for modules imported by already loaded modules.
+    depth: int
+
+
+class _TimedLoader:
+    """Wraps a loader and records, how long executing its modules takes."""
+    def __init__(self, timer: 'ImportTimer', loader):
+        self._timer = timer
+        self._loader = loader
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._timer._exec(self._loader, module)
+
+    def __getattr__(self, item):
+        return getattr(self._loader, item)
+
+
+class ImportTimer(importlib.abc.MetaPathFinder):
+    """
+    Records how long importing each module takes, similar to ``python -X importtime``.
+    Install it as early as possible, imports that happened before are not recorded.
+    """
+    _instance: Optional['ImportTimer'] = None
+
+    @classmethod
+    def install(cls) -> 'ImportTimer':
+        if cls._instance is None:
+            cls._instance = cls()
+            sys.meta_path.insert(0, cls._instance)
+        return cls._instance
+
+    @classmethod
+    def instance(cls) -> Optional['ImportTimer']:
+        """The installed timer or None, if import times are not recorded."""
+        return cls._instance
+
+    def __init__(self):
+        self._records: List[ImportRecord] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def find_spec(self, fullname, path=None, target=None):
+        if getattr(self._local, 'finding', False):
+            return None
+        # Let the other finders find the module, and then wrap the loader they returned.
+        self._local.finding = True
+        try:
+            spec = self._find_in(fullname, path, target)
+        except (ImportError, ValueError):
+            return None
+        finally:
+            self._local.finding = False
+        if spec is None or spec.loader is None or not hasattr(spec.loader, 'exec_module'):
+            return spec
+        spec.loader = _TimedLoader(self, spec.loader)
+        return spec
+
+    @staticmethod
+    def _find_in(fullname, path, target):
+        for finder in sys.meta_path:
+            if not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                return spec
+        return None
+
+    def _exec(self, loader, module):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        # Time spent in nested imports, subtracted from the self time.
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            loader.exec_module(module)
+        finally:
+            cumulative = time.perf_counter() - start
+            nested = stack.pop()
+            if stack:
+                stack[-1] += cumulative
+            with self._lock:
+                self._records.append(ImportRecord(module.__name__, cumulative - nested, cumulative, len(stack)))
+
+    def records(self) -> List[ImportRecord]:
+        """All recorded imports, in the order they finished."""
+        with self._lock:
+            return list(self._records)
+
+    def slowest(self, count: int = 20) -> List[ImportRecord]:
+        """The imports with the highest cumulative time, that were not imported by another recorded import."""
+        top_level = [r for r in self.records() if r.depth == 0]
+        return sorted(top_level, key=lambda r: r.cumulative_time, reverse=True)[:count]
+
+    def total_time(self) -> float:
+        return sum(r.cumulative_time for r in self.records() if r.depth == 0)
+
+    def report(self, count: int = 20) -> str:
+        lines = [f"Imports took {self.total_time():.3f}s in total. Slowest imports:",
+                 f"{'cumulative':>12} {'self':>10}  module"]
+        for r in self.slowest(count):
+            lines.append(f"{r.cumulative_time * 1000:10.1f}ms {r.self_time * 1000:8.1f}ms  {r.module}")
+        return '\n'.join(lines)
@@ -0,0 +1,153 @@
+"""Detects stalls of the Gtk main loop and records what the main thread was doing."""
+#  Copyright 2020-2021 Parakoopa and the SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from typing import Optional, Dict, List, NamedTuple
+
+from gi.repository import GLib
+
+logger = logging.getLogger(__name__)
+# Interval of the heartbeat on the main loop, in seconds.
+HEARTBEAT_INTERVAL = 0.1
+# Number of stalls, that are kept with their stacks.
+RECENT_STALLS = 50
+_PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_MAIN_FILE = os.path.join(_PACKAGE_DIR, 'main.py')
+
+
+class Stall(NamedTuple):
+    # Seconds the main loop was blocked.
+    duration: float
+    # The outermost function of SkyTemple on the stack, usually the signal handler or callback, that blocked.
+    handler: str
+    # The stack of the main thread, when the stall was detected, outermost frame first.
+    stack: List[str]
+
+
+class HandlerStalls(NamedTuple):
+    handler: str
+    count: int
+    total: float
+    max: float
+
+
+class MainLoopWatchdog:
+    """
+    Measures the latency of the main loop with a heartbeat. If the heartbeat is late by more than the threshold,
+    the stack of the main thread is captured by a watcher thread. Once the main loop runs again, the stall is
+    logged and counted for the handler that caused it.
+    """
+    _instance: Optional['MainLoopWatchdog'] = None
+
+    @classmethod
+    def instance(cls) -> Optional['MainLoopWatchdog']:
+        """The running watchdog or None, if it is not enabled."""
+        return cls._instance
+
+    @classmethod
+    def start(cls, threshold: float) -> 'MainLoopWatchdog':
+        """Start watching the main loop. Must be called from the main thread."""
+        if cls._instance is None:
+            cls._instance = cls(threshold)
+        return cls._instance
+
+    def __init__(self, threshold: float):
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._main_thread_id = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        # Stack captured for the current stall, if the main loop is stalled right now.
+        self._stall_stack: Optional[List[str]] = None
+        self._recent: List[Stall] = []
+        self._by_handler: Dict[str, HandlerStalls] = {}
+        GLib.timeout_add(int(HEARTBEAT_INTERVAL * 1000), self._beat)
+        self._thread = threading.Thread(target=self._watch, name='MainLoopWatchdog', daemon=True)
+        self._thread.start()
+
+    def recent(self) -> List[Stall]:
+        """The last stalls, most recent first."""
+        with self._lock:
+            return list(reversed(self._recent))
+
+    def by_handler(self) -> List[HandlerStalls]:
+        """The stalls per handler, the handler that blocked the longest in total first."""
+        with self._lock:
+            return sorted(self._by_handler.values(), key=lambda h: h.total, reverse=True)
+
+    def to_dict(self) -> dict:
+        return {
+            'threshold': self.threshold,
+            'handlers': [h._asdict() for h in self.by_handler()],
+            'recent': [s._asdict() for s in self.recent()]
+        }
+
+    def write_report(self, path: str):
+        """Write the stalls as JSON."""
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def _beat(self):
+        now = time.perf_counter()
+        with self._lock:
+            delay = now - self._last_beat - HEARTBEAT_INTERVAL
+            self._last_beat = now
+            stack, self._stall_stack = self._stall_stack, None
+        if stack is not None:
+            self._record(Stall(delay, _handler(stack), stack))
+        return True
+
+    def _watch(self):
+        while True:
+            time.sleep(HEARTBEAT_INTERVAL / 2)
+            with self._lock:
+                late = time.perf_counter() - self._last_beat - HEARTBEAT_INTERVAL
+                if late < self.threshold or self._stall_stack is not None:
+                    continue
+                frame = sys._current_frames().get(self._main_thread_id)
+                if frame is None:
+                    continue
+                self._stall_stack = [
+                    f'{f.filename}:{f.lineno} in {f.name}' for f in traceback.extract_stack(frame)
+                ]
+
+    def _record(self, stall: Stall):
+        logger.warning(
+            f"The main loop was blocked for {stall.duration:.3f}s by {stall.handler}. Stack:\n  "
+            + '\n  '.join(stall.stack)
+        )
+        with self._lock:
+            self._recent.append(stall)
+            del self._recent[:-RECENT_STALLS]
+            previous = self._by_handler.get(stall.handler, HandlerStalls(stall.handler, 0, 0.0, 0.0))
+            self._by_handler[stall.handler] = HandlerStalls(
+                stall.handler, previous.count + 1, previous.total + stall.duration, max(previous.max, stall.duration)
+            )
+
+
+def _handler(stack: List[str]) -> str:
+    """The outermost frame of SkyTemple on the stack (except for the entry point, that runs the main loop)."""
+    for entry in stack:
+        filename = entry.rsplit(':', 1)[0]
+        if filename.startswith(_PACKAGE_DIR) and filename != _MAIN_FILE:
+            return os.path.relpath(entry, os.path.dirname(_PACKAGE_DIR))
+    return stack[-1] if len(stack) > 0 else 'unknown'
@@ -0,0 +1,41 @@
+"""Access to the metadata of installed distributions, without importing pkg_resources."""
+#  Copyright 2020-2021 Parakoopa and the SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+from typing import Dict, Optional
+
+try:
+    from importlib import metadata as _metadata
+except ImportError:  # < Python 3.8
+    import importlib_metadata as _metadata
+
+
+def entry_points(group: str) -> Dict[str, str]:
+    """Returns all entry points of the group, as name -> 'module:attribute'."""
+    eps = _metadata.entry_points()
+    if hasattr(eps, 'select'):
+        selected = eps.select(group=group)
+    else:  # < Python 3.10
+        selected = eps.get(group, [])
+    return {ep.name: ep.value for ep in selected}
+
+
+def distribution_version(name: str) -> Optional[str]:
+    """Returns the version of an installed distribution or None if it isn't installed."""
+    try:
+        return _metadata.version(name)
+    except _metadata.PackageNotFoundError:
+        return None
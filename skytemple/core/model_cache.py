@@ -0,0 +1,187 @@
+"""Memory-bounded storage of the models opened by the RomProject."""
+#  Copyright 2020-2021 Parakoopa and the SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+import logging
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Optional, Dict, Set, NamedTuple, Tuple
+
+logger = logging.getLogger(__name__)
+DEFAULT_BUDGET = 256 * 1024 * 1024
+
+
+class ModelCacheStats(NamedTuple):
+    budget: int
+    resident_size: int
+    resident_count: int
+    hits: int
+    misses: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total > 0 else 0.0
+
+
+class ModelCache:
+    """
+    The models of opened files, by their path in the ROM. The memory used by the models is approximated by the size
+    of the files they were read from.
+
+    If the resident size exceeds the budget, the least recently used models are evicted. Evicted models are only
+    referenced weakly: As long as someone else still uses an evicted model, it is returned again, so there is
+    always only one model per file. Once it is collected, the file has to be deserialized again.
+    Pinned models (modified models and models shared via a ModelContext) are never evicted. Models that
+    don't support weak references are not evicted either.
+    """
+    def __init__(self, budget: int = DEFAULT_BUDGET):
+        self._lock = threading.RLock()
+        self._budget = budget
+        # Path -> (model, size), in LRU order (least recently used first).
+        self._resident: 'OrderedDict[str, Tuple[object, int]]' = OrderedDict()
+        self._evicted: Dict[str, Tuple[weakref.ref, int]] = {}
+        self._pinned: Set[str] = set()
+        # id(model) -> path, for all resident and evicted models that are still alive.
+        self._paths_by_id: Dict[int, str] = {}
+        self._resident_size = 0
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def budget(self) -> int:
+        return self._budget
+
+    @budget.setter
+    def budget(self, value: int):
+        with self._lock:
+            self._budget = value
+            self._shrink()
+
+    def stats(self) -> ModelCacheStats:
+        with self._lock:
+            return ModelCacheStats(self._budget, self._resident_size, len(self._resident), self._hits, self._misses)
+
+    def __contains__(self, path: str) -> bool:
+        with self._lock:
+            return path in self._resident or self._alive_evicted(path) is not None
+
+    def get(self, path: str) -> Optional[object]:
+        """Returns the model of the file or None if it isn't cached (anymore). Counts as a use of the model."""
+        with self._lock:
+            model = self._promote(path)
+            if model is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+            return model
+
+    def peek(self, path: str) -> Optional[object]:
+        """Returns the model of the file or None, without counting this as a use."""
+        with self._lock:
+            if path in self._resident:
+                return self._resident[path][0]
+            return self._alive_evicted(path)
+
+    def put(self, path: str, model, size: int):
+        """Add the model of a file. If the file was already cached, the old model is replaced."""
+        with self._lock:
+            self.remove(path)
+            self._resident[path] = (model, size)
+            self._resident_size += size
+            self._paths_by_id[id(model)] = path
+            self._shrink()
+
+    def remove(self, path: str):
+        with self._lock:
+            self._pinned.discard(path)
+            if path in self._resident:
+                model, size = self._resident.pop(path)
+                self._resident_size -= size
+                self._paths_by_id.pop(id(model), None)
+            if path in self._evicted:
+                ref, size = self._evicted.pop(path)
+                model = ref()
+                if model is not None:
+                    self._paths_by_id.pop(id(model), None)
+
+    def path_of(self, model) -> Optional[str]:
+        """Returns the path of the file the model belongs to, if it is cached."""
+        with self._lock:
+            path = self._paths_by_id.get(id(model))
+            if path is None or self.peek(path) is not model:
+                return None
+            return path
+
+    def pin(self, path: str):
+        """Pin a cached model, so that it isn't evicted."""
+        with self._lock:
+            if self._promote(path) is None:
+                raise KeyError(path)
+            self._pinned.add(path)
+
+    def unpin(self, path: str):
+        with self._lock:
+            self._pinned.discard(path)
+            self._shrink()
+
+    def _promote(self, path: str) -> Optional[object]:
+        """Marks the model as most recently used. Evicted models that are still alive become resident again."""
+        if path in self._resident:
+            self._resident.move_to_end(path)
+            return self._resident[path][0]
+        model = self._alive_evicted(path)
+        if model is not None:
+            _, size = self._evicted.pop(path)
+            self._resident[path] = (model, size)
+            self._resident_size += size
+            self._shrink()
+        return model
+
+    def _alive_evicted(self, path: str) -> Optional[object]:
+        if path in self._evicted:
+            return self._evicted[path][0]()
+        return None
+
+    def _shrink(self):
+        if self._resident_size <= self._budget:
+            return
+        for path in list(self._resident.keys()):
+            if self._resident_size <= self._budget:
+                break
+            if path in self._pinned:
+                continue
+            model, size = self._resident[path]
+            try:
+                ref = weakref.ref(model, self._make_collected_cb(path, id(model)))
+            except TypeError:
+                continue
+            del self._resident[path]
+            self._evicted[path] = (ref, size)
+            self._resident_size -= size
+            logger.debug(f"Evicted {path} ({size} bytes) from the model cache.")
+
+    def _make_collected_cb(self, path: str, model_id: int):
+        # This is called by the garbage collector, possibly on any thread. The lock is reentrant, so this also
+        # works if the model is collected while the calling thread holds it.
+        def collected(ref):
+            with self._lock:
+                if path in self._evicted and self._evicted[path][0] is ref:
+                    self._evicted.pop(path, None)
+                if self._paths_by_id.get(model_id) == path:
+                    self._paths_by_id.pop(model_id, None)
+        return collected
@@ -14,24 +14,120 @@
 #
 #  You should have received a copy of the GNU General Public License
 #  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+import logging
 import threading
-from typing import TypeVar, Generic
+import time
+from contextlib import contextmanager
+from typing import TypeVar, Generic, NamedTuple, Optional, Iterator
 
+logger = logging.getLogger(__name__)
 T = TypeVar('T')
+# Waiting for a model longer than this (in seconds) is logged.
+LOG_WAIT_THRESHOLD = 0.1
+
+
+class ModelContextStats(NamedTuple):
+    acquisitions: int
+    # Number of acquisitions that had to wait for another thread.
+    contended: int
+    total_wait: float
+    max_wait: float
 
 
 class ModelContext(Generic[T]):
     """
     ContextManager that wraps a model for thread-safe data access.
     References to the model are invalid outside of the context provided.
+
+    Entering the context directly (or via ``write``) gives exclusive access. Code that only reads the model should
+    use ``read`` instead, which allows multiple readers at the same time. Waiting writers are preferred over
+    new readers.
     """
-    def __init__(self, model: T):
+    def __init__(self, model: T, name: Optional[str] = None):
         self._model = model
-        self._lock = threading.Lock()
+        self._name = name if name is not None else repr(model)
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+        # Read locks held by the current thread. Reading is re-entrant, so a reader can't block itself.
+        self._local = threading.local()
+        self._acquisitions = 0
+        self._contended = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
 
     def __enter__(self) -> T:
-        self._lock.acquire()
+        self._acquire_write()
         return self._model
 
     def __exit__(self, exc_type, value, traceback):
-        self._lock.release()
+        self._release_write()
+
+    @contextmanager
+    def read(self) -> Iterator[T]:
+        """Shared access to the model. The model must not be modified."""
+        self._acquire_read()
+        try:
+            yield self._model
+        finally:
+            self._release_read()
+
+    @contextmanager
+    def write(self) -> Iterator[T]:
+        """Exclusive access to the model. The same as entering the context directly."""
+        with self as model:
+            yield model
+
+    def stats(self) -> ModelContextStats:
+        with self._cond:
+            return ModelContextStats(self._acquisitions, self._contended, self._total_wait, self._max_wait)
+
+    def _acquire_read(self):
+        held = getattr(self._local, 'reads', 0)
+        with self._cond:
+            start = None
+            while self._writer or (self._writers_waiting > 0 and held == 0):
+                if start is None:
+                    start = time.perf_counter()
+                self._cond.wait()
+            self._readers += 1
+            self._record_wait(start, 'read')
+        self._local.reads = held + 1
+
+    def _release_read(self):
+        self._local.reads -= 1
+        with self._cond:
+            self._readers -= 1
+            if self._readers == 0:
+                self._cond.notify_all()
+
+    def _acquire_write(self):
+        with self._cond:
+            start = None
+            self._writers_waiting += 1
+            try:
+                while self._writer or self._readers > 0:
+                    if start is None:
+                        start = time.perf_counter()
+                    self._cond.wait()
+            finally:
+                self._writers_waiting -= 1
+            self._writer = True
+            self._record_wait(start, 'write')
+
+    def _release_write(self):
+        with self._cond:
+            self._writer = False
+            self._cond.notify_all()
+
+    def _record_wait(self, start: Optional[float], mode: str):
+        self._acquisitions += 1
+        if start is None:
+            return
+        waited = time.perf_counter() - start
+        self._contended += 1
+        self._total_wait += waited
+        self._max_wait = max(self._max_wait, waited)
+        if waited >= LOG_WAIT_THRESHOLD:
+            logger.debug(f"Waited {waited:.3f}s for {mode} access to {self._name}.")
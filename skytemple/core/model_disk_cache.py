@@ -0,0 +1,153 @@
+"""A persistent cache of deserialized models, stored in the project directory."""
+#  Copyright 2020-2021 Parakoopa and the SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+import hashlib
+import logging
+import os
+import pickle
+import sys
+import threading
+import time
+from typing import Optional, Callable, Any
+
+from skytemple.core.metadata import distribution_version
+
+logger = logging.getLogger(__name__)
+CACHE_DIR_NAME = 'model_cache'
+CACHE_FILE_EXT = '.pickle'
+# Models that take less time to deserialize than this (in seconds) are not cached, reading them is not faster.
+MIN_DESERIALIZE_TIME = 0.05
+# Types of handler keyword arguments, that can be used in a cache key.
+KEY_ARGUMENT_TYPES = (str, int, float, bool, type(None))
+
+
+class ModelDiskCache:
+    """
+    Caches pickled models on disk, by the hash of the raw file, the type of the model and the arguments used to
+    read it. Entries for changed files are never read again and are removed, once the cache exceeds its size
+    (least recently used first). The cache is also not used with other versions of SkyTemple or skytemple-files.
+
+    Note that the cache contains pickles, so the project directory must be trusted.
+    """
+    def __init__(self, directory: str, max_size: int):
+        self.directory = os.path.join(directory, CACHE_DIR_NAME)
+        self.max_size = max_size
+        self._version = _cache_version()
+        self._lock = threading.Lock()
+        if self._version is not None and max_size > 0:
+            os.makedirs(self.directory, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return self._version is not None and self.max_size > 0
+
+    def deserialize(self, data: bytes, model_type: str, kwargs: dict, deserialize: Callable[[], Any]):
+        """
+        Returns the model for the given raw data. If it is cached, it is read from the cache, otherwise
+        ``deserialize`` is called and the result is stored in the cache, if reading it took long enough.
+        ``model_type`` must uniquely identify how the model is created from the data (eg. the name of the handler).
+        """
+        key = self._key(data, model_type, kwargs)
+        if key is None:
+            return deserialize()
+        path = os.path.join(self.directory, key + CACHE_FILE_EXT)
+        model = self._read(path)
+        if model is not None:
+            return model
+        start = time.perf_counter()
+        model = deserialize()
+        if time.perf_counter() - start >= MIN_DESERIALIZE_TIME:
+            self._write(path, model)
+        return model
+
+    def clear(self):
+        with self._lock:
+            for entry in self._entries():
+                _remove(entry.path)
+
+    def _key(self, data: bytes, model_type: str, kwargs: dict) -> Optional[str]:
+        if not self.enabled:
+            return None
+        if not all(isinstance(v, KEY_ARGUMENT_TYPES) for v in kwargs.values()):
+            # The arguments can't be represented reliably.
+            return None
+        h = hashlib.sha1(data)
+        h.update(repr((model_type, sorted(kwargs.items()), self._version)).encode('utf-8'))
+        return h.hexdigest()
+
+    def _read(self, path: str):
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                model = pickle.load(f)
+            # Mark as recently used.
+            os.utime(path)
+            return model
+        except Exception as ex:
+            logger.warning(f"Cached model {path} is unreadable, it is removed.", exc_info=ex)
+            _remove(path)
+            return None
+
+    def _write(self, path: str, model):
+        try:
+            data = pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as ex:
+            logger.debug(f"Model {model} can not be cached: {ex}")
+            return
+        if len(data) > self.max_size:
+            return
+        with self._lock:
+            try:
+                tmp_path = path + '.tmp'
+                with open(tmp_path, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except OSError as ex:
+                logger.warning(f"Writing the model cache entry {path} failed.", exc_info=ex)
+                return
+            self._shrink()
+
+    def _shrink(self):
+        entries = sorted(self._entries(), key=lambda e: e.stat().st_mtime)
+        size = sum(e.stat().st_size for e in entries)
+        for entry in entries:
+            if size <= self.max_size:
+                break
+            size -= entry.stat().st_size
+            _remove(entry.path)
+
+    def _entries(self):
+        if not os.path.exists(self.directory):
+            return []
+        return [e for e in os.scandir(self.directory) if e.is_file() and e.name.endswith(CACHE_FILE_EXT)]
+
+
+def _cache_version() -> Optional[str]:
+    """A version string for cache keys. None if the version of skytemple-files is not known."""
+    files_version = distribution_version("skytemple-files")
+    if files_version is None:
+        return None
+    skytemple_version = distribution_version("skytemple") or 'unknown'
+    return f'{skytemple_version}/{files_version}/{sys.version_info[:2]}'
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -0,0 +1,68 @@
+"""Serialization of opened models, optionally in worker processes."""
+#  Copyright 2020-2021 Parakoopa and the SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+#
+#  This module must not import Gtk, it is imported by the worker processes.
+import logging
+import pickle
+import time
+from concurrent.futures import Future
+from typing import Type, Tuple, Optional
+
+from skytemple.core.task_scheduler import TaskScheduler
+from skytemple_files.common.types.data_handler import DataHandler
+from skytemple_files.common.types.file_types import FileType
+
+logger = logging.getLogger(__name__)
+# Handlers that update the model they serialize (eg. to reset modification flags). Those must always be serialized
+# in the process that owns the model.
+SERIALIZE_IN_PROCESS_HANDLERS = (FileType.KAO,)
+
+
+def serialize_model(handler: Type[DataHandler], model, kwargs: dict) -> bytes:
+    """Serialize a model opened via the RomProject with its handler and handler arguments."""
+    if handler == FileType.SIR0:
+        model = handler.wrap_obj(model)
+    return handler.serialize(model, **kwargs)
+
+
+def pickle_for_serialization(handler: Type[DataHandler], model, kwargs: dict) -> Optional[bytes]:
+    """
+    Returns a payload to pass to serialize_in_worker_process or None, if the model
+    can't be serialized in a worker process.
+    """
+    if handler in SERIALIZE_IN_PROCESS_HANDLERS:
+        return None
+    try:
+        return pickle.dumps((handler, model, kwargs), protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception as ex:
+        logger.debug(f"Model {model} can not be serialized in a worker process: {ex}")
+        return None
+
+
+def _serialize_pickled(payload: bytes) -> Tuple[bytes, float]:
+    start = time.perf_counter()
+    handler, model, kwargs = pickle.loads(payload)
+    return serialize_model(handler, model, kwargs), time.perf_counter() - start
+
+
+def serialize_in_worker_process(payload: bytes, name: str) -> 'Future[Tuple[bytes, float]]':
+    """
+    Serialize the payload from pickle_for_serialization for the file name in a worker process of the TaskScheduler.
+    The result of the future is the serialized data and the time it took in seconds.
+    """
+    return TaskScheduler.instance().run_in_process(_serialize_pickled, payload, category='serialize_model', item=name)
@@ -26,6 +26,12 @@ from skytemple.core.abstract_module import AbstractModule
 
 
 class AbstractController(ABC):
+    # Whether the view may be hidden and shown again later instead of being destroyed, when another view is opened.
+    # Controllers that set this must stop their timers and animations in on_view_hidden.
+    view_is_reusable = False
+    # Whether prefetch may be called in the background, when an item next to the item is opened (see ViewPrefetcher).
+    prefetchable = False
+
     @abstractmethod
     def __init__(self, module: AbstractModule, item_id: any):
         """NO Gtk operations allowed here, not threadsafe!"""
@@ -35,6 +41,21 @@ class AbstractController(ABC):
     def get_view(self) -> Widget:
         pass
 
+    def on_view_hidden(self):
+        """The view was hidden and put into the view pool. Stop timers and animations until on_view_shown."""
+
+    def on_view_shown(self):
+        """The view is shown again after being taken from the view pool."""
+
+    @classmethod
+    def prefetch(cls, module: AbstractModule, item_id: any) -> Optional['AbstractController']:
+        """
+        Prepare opening the item in advance, in the background. Returns the controller for the item, if it
+        can be created without side effects. Otherwise only the data that the controller needs may be read,
+        and None is returned. Only called if prefetchable is set.
+        """
+        return cls(module, item_id)
+
     @staticmethod
     def _get_builder(pymodule_path: str, glade_file: str):
         path = os.path.abspath(os.path.dirname(pymodule_path))
@@ -51,6 +72,15 @@ class NotImplementedController(AbstractController):
         return Gtk.Label.new("(This view is not implemented)")
 
 
+class DeferredTreeStubController(AbstractController):
+    """Controller of the placeholder rows added for subtrees that are not loaded yet."""
+    def __init__(self, module: AbstractModule, item_id: int):
+        pass
+
+    def get_view(self) -> Widget:
+        return Gtk.Label.new("Loading...")
+
+
 class SimpleController(AbstractController, ABC):
     def get_view(self) -> Widget:
         main_box: Gtk.Box = Gtk.Box.new(Gtk.Orientation.VERTICAL, 0)
@@ -15,73 +15,158 @@
 #
 #  You should have received a copy of the GNU General Public License
 #  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+import importlib
+import json
+import logging
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import TYPE_CHECKING, Dict, Type, List
 
-import pkg_resources
+from skytemple.core.metadata import entry_points
+from skytemple.core.profiler import PhaseProfiler
 
+if TYPE_CHECKING:
+    from skytemple.core.abstract_module import AbstractModule
+    from skytemple.core.rom_project import RomProject
+
+logger = logging.getLogger(__name__)
 MODULE_ENTRYPOINT_KEY = 'skytemple.module'
+MAX_CONSTRUCTION_WORKERS = 8
+# Written into the data directory by setup.py on build. Lists the entry points of SkyTemple itself.
+MODULE_MANIFEST_FILE_NAME = 'module_manifest.json'
+# Used if SkyTemple is neither installed nor built. setup.py registers these as the entry points.
+BUILTIN_MODULES = {
+    "rom": "skytemple.module.rom.module:RomModule",
+    "bgp": "skytemple.module.bgp.module:BgpModule",
+    "tiled_img": "skytemple.module.tiled_img.module:TiledImgModule",
+    "map_bg": "skytemple.module.map_bg.module:MapBgModule",
+    "script": "skytemple.module.script.module:ScriptModule",
+    "monster": "skytemple.module.monster.module:MonsterModule",
+    "portrait": "skytemple.module.portrait.module:PortraitModule",
+    "patch": "skytemple.module.patch.module:PatchModule",
+    "lists": "skytemple.module.lists.module:ListsModule",
+    "misc_graphics": "skytemple.module.misc_graphics.module:MiscGraphicsModule",
+    "dungeon": "skytemple.module.dungeon.module:DungeonModule",
+    "dungeon_graphics": "skytemple.module.dungeon_graphics.module:DungeonGraphicsModule",
+    "strings": "skytemple.module.strings.module:StringsModule",
+    "gfxcrunch": "skytemple.module.gfxcrunch.module:GfxcrunchModule",
+    "sprite": "skytemple.module.sprite.module:SpriteModule"
+}
 
 
 class Modules:
-    _modules = {}
+    # Module names -> 'python.module:ClassName'
+    _entry_points: Dict[str, str] = {}
+    # Module names -> classes, of the modules that were already imported.
+    _classes: Dict[str, Type['AbstractModule']] = {}
+    _lock = threading.Lock()
 
     @classmethod
     def load(cls):
-        # Look up package entrypoints for modules
-        cls._modules = {
-            entry_point.name:
-                entry_point.load() for entry_point in pkg_resources.iter_entry_points(MODULE_ENTRYPOINT_KEY)
-        }
-        if len(cls._modules) < 1:
-            # PyInstaller under Windows has no idea what (custom) entrypoints are...
-            # TODO: Figure out a better way to do this...
-            cls._modules = cls._load_windows_modules()
-        dependencies = {}
-        for k, module in cls._modules.items():
-            dependencies[k] = module.depends_on()
-        resolved_deps = dep(dependencies)
-        cls._modules = dict(sorted(cls._modules.items(), key=lambda x: resolved_deps.index(x[0])))
-        for module in cls._modules.values():
-            module.load()
+        """
+        Discover the available modules. The module classes are only imported when they are first used
+        (see get).
+        """
+        cls._entry_points = entry_points(MODULE_ENTRYPOINT_KEY)
+        if len(cls._entry_points) < 1:
+            # PyInstaller under Windows has no idea what (custom) entrypoints are... Use the ones SkyTemple was
+            # built with instead.
+            cls._entry_points = cls._load_manifest()
+        if len(cls._entry_points) < 1:
+            cls._entry_points = BUILTIN_MODULES
+        cls._classes = {}
+
+    @classmethod
+    def get(cls, name: str) -> Type['AbstractModule']:
+        """Returns the class of a module. It is imported and loaded on first use."""
+        with cls._lock:
+            if name in cls._classes:
+                return cls._classes[name]
+        with PhaseProfiler.phase(f'module.{name}.import'):
+            module = _import(cls._entry_points[name])
+        with cls._lock:
+            if name not in cls._classes:
+                module.load()
+                cls._classes[name] = module
+            return cls._classes[name]
 
     @classmethod
-    def all(cls):
-        """Returns a list of all loaded modules, ordered by dependencies"""
-        return cls._modules
+    def all(cls) -> Dict[str, Type['AbstractModule']]:
+        """Returns a list of all modules, ordered by dependencies. All of them are imported."""
+        modules = {name: cls.get(name) for name in cls._entry_points.keys()}
+        resolved_deps = dep({name: module.depends_on() for name, module in modules.items()})
+        return dict(sorted(modules.items(), key=lambda x: resolved_deps.index(x[0])))
 
     @classmethod
-    def _load_windows_modules(cls):
-        from skytemple.module.rom.module import RomModule
-        from skytemple.module.bgp.module import BgpModule
-        from skytemple.module.tiled_img.module import TiledImgModule
-        from skytemple.module.map_bg.module import MapBgModule
-        from skytemple.module.script.module import ScriptModule
-        from skytemple.module.monster.module import MonsterModule
-        from skytemple.module.portrait.module import PortraitModule
-        from skytemple.module.patch.module import PatchModule
-        from skytemple.module.lists.module import ListsModule
-        from skytemple.module.misc_graphics.module import MiscGraphicsModule
-        from skytemple.module.dungeon.module import DungeonModule
-        from skytemple.module.dungeon_graphics.module import DungeonGraphicsModule
-        from skytemple.module.strings.module import StringsModule
-        from skytemple.module.gfxcrunch.module import GfxcrunchModule
-        from skytemple.module.sprite.module import SpriteModule
-        return {
-            "rom": RomModule,
-            "bgp": BgpModule,
-            "tiled_img": TiledImgModule,
-            "map_bg": MapBgModule,
-            "script": ScriptModule,
-            "monster": MonsterModule,
-            "portrait": PortraitModule,
-            "patch": PatchModule,
-            "lists": ListsModule,
-            "misc_graphics": MiscGraphicsModule,
-            "dungeon": DungeonModule,
-            "dungeon_graphics": DungeonGraphicsModule,
-            "strings": StringsModule,
-            "gfxcrunch": GfxcrunchModule,
-            "sprite": SpriteModule
-        }
+    def _load_manifest(cls) -> Dict[str, str]:
+        path = os.path.join(_data_dir(), MODULE_MANIFEST_FILE_NAME)
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path) as f:
+                return json.load(f).get(MODULE_ENTRYPOINT_KEY, {})
+        except (OSError, ValueError) as ex:
+            logger.warning(f"The module manifest {path} is unreadable.", exc_info=ex)
+            return {}
+
+    @classmethod
+    def construct_all(cls, rom_project: 'RomProject') -> Dict[str, 'AbstractModule']:
+        """
+        Creates instances of all modules for the given project, ordered by dependencies.
+        Modules are imported and constructed in parallel, but a module is only constructed after all modules
+        it depends on are.
+        """
+        names = list(cls._entry_points.keys())
+        # Module names -> the modules they depend on. Known once the module is imported.
+        dependencies: Dict[str, List[str]] = {}
+        pending = set(names)
+        constructed = {}
+        importing = {}
+        running = {}
+        workers = min(MAX_CONSTRUCTION_WORKERS, os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='skytemple-module-load') as pool:
+            for name in names:
+                importing[pool.submit(cls.get, name)] = name
+            while pending or running:
+                ready = [n for n in pending if n in dependencies and all(d in constructed for d in dependencies[n])]
+                for name in ready:
+                    pending.remove(name)
+                    running[pool.submit(cls._construct, name, rom_project)] = name
+                if not running and not importing:
+                    raise ValueError(f"Unresolvable module dependencies: {', '.join(pending)}")
+                done, _ = wait(list(running.keys()) + list(importing.keys()), return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future in importing:
+                        name = importing.pop(future)
+                        dependencies[name] = [d for d in future.result().depends_on() if d in cls._entry_points]
+                    else:
+                        constructed[running.pop(future)] = future.result()
+        resolved_deps = dep(dependencies)
+        return {name: constructed[name] for name in sorted(names, key=resolved_deps.index)}
+
+    @classmethod
+    def _construct(cls, name: str, rom_project: 'RomProject') -> 'AbstractModule':
+        module_class = cls.get(name)
+        # The models modules open on construction are used by their views.
+        with PhaseProfiler.phase(f'module.{name}.__init__'), rom_project.track_access(module_class):
+            return module_class(rom_project)
+
+
+def _import(target: str) -> Type['AbstractModule']:
+    module_name, attr = target.split(':')
+    obj = importlib.import_module(module_name.strip())
+    for part in attr.strip().split('.'):
+        obj = getattr(obj, part)
+    return obj
+
+
+def _data_dir() -> str:
+    # Same as skytemple.core.ui_utils.data_dir, which can't be imported without Gtk.
+    if getattr(sys, 'frozen', False):
+        return os.path.join(os.path.dirname(sys.executable), 'data')
+    return os.path.join(os.path.dirname(__file__), '..', 'data')
 
 
 def dep(arg):
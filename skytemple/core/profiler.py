@@ -0,0 +1,149 @@
+"""Records wall time, CPU time and memory of named phases, eg. while opening a ROM."""
+#  Copyright 2020-2021 Parakoopa and the SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Optional, List, NamedTuple, Iterator
+
+logger = logging.getLogger(__name__)
+# CPU time of the current thread. Phases run on different threads (eg. module construction), so process time
+# would also count the other threads.
+_thread_time = getattr(time, 'thread_time', time.process_time)  # < Python 3.7: Process time.
+
+
+class PhaseRecord(NamedTuple):
+    name: str
+    thread: str
+    # Seconds since the profile was started.
+    start: float
+    wall: float
+    cpu: float
+    # Net change of traced memory in bytes. None if memory was not traced. Phases running at the same time on
+    # other threads are included.
+    memory: Optional[int]
+
+
+class PhaseProfiler:
+    """
+    Collects the phases of one profiled operation. Phases are recorded with ``PhaseProfiler.phase``, which does
+    nothing if no profile is running.
+    """
+    _current: Optional['PhaseProfiler'] = None
+    _last: Optional['PhaseProfiler'] = None
+
+    @classmethod
+    def start(cls, label: str, trace_memory=False) -> 'PhaseProfiler':
+        """Start a new profile. A still running profile is discarded."""
+        if cls._current is not None:
+            cls._current._stop_tracing()
+        cls._current = cls(label, trace_memory)
+        return cls._current
+
+    @classmethod
+    def current(cls) -> Optional['PhaseProfiler']:
+        return cls._current
+
+    @classmethod
+    def last(cls) -> Optional['PhaseProfiler']:
+        """The last finished profile."""
+        return cls._last
+
+    @classmethod
+    @contextmanager
+    def phase(cls, name: str) -> Iterator[None]:
+        profiler = cls._current
+        if profiler is None:
+            yield
+            return
+        with profiler.record(name):
+            yield
+
+    def __init__(self, label: str, trace_memory: bool):
+        self.label = label
+        self.started = datetime.now()
+        self.total_wall: Optional[float] = None
+        self._start = time.perf_counter()
+        self._records: List[PhaseRecord] = []
+        self._lock = threading.Lock()
+        self._started_tracing = False
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self.trace_memory = tracemalloc.is_tracing()
+
+    @contextmanager
+    def record(self, name: str) -> Iterator[None]:
+        memory_before = tracemalloc.get_traced_memory()[0] if self.trace_memory else None
+        cpu_before = _thread_time()
+        wall_before = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_before
+            cpu = _thread_time() - cpu_before
+            memory = None
+            if memory_before is not None and tracemalloc.is_tracing():
+                memory = tracemalloc.get_traced_memory()[0] - memory_before
+            with self._lock:
+                self._records.append(PhaseRecord(
+                    name, threading.current_thread().name, wall_before - self._start, wall, cpu, memory
+                ))
+
+    def records(self) -> List[PhaseRecord]:
+        with self._lock:
+            return sorted(self._records, key=lambda r: r.start)
+
+    def finish(self):
+        """Stop profiling. The profile is available via ``PhaseProfiler.last`` afterwards."""
+        self.total_wall = time.perf_counter() - self._start
+        self._stop_tracing()
+        if self.__class__._current is self:
+            self.__class__._current = None
+        self.__class__._last = self
+
+    def to_dict(self) -> dict:
+        return {
+            'label': self.label,
+            'started': self.started.isoformat(),
+            'total_wall': self.total_wall,
+            'trace_memory': self.trace_memory,
+            'phases': [r._asdict() for r in self.records()]
+        }
+
+    def write_report(self, directory: str, filename: str) -> str:
+        """Write the profile as JSON into the directory. Returns the path of the report."""
+        path = os.path.join(directory, filename)
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        return path
+
+    def log_summary(self):
+        logger.info(f"Profile '{self.label}': {self.total_wall:.3f}s total.")
+        for r in self.records():
+            memory = f", {r.memory / 1024:.0f} KiB" if r.memory is not None else ''
+            logger.info(f"  {r.name}: {r.wall:.3f}s wall, {r.cpu:.3f}s CPU{memory} [{r.thread}]")
+
+    def _stop_tracing(self):
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
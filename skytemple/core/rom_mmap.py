@@ -0,0 +1,177 @@
+"""A ROM backend that maps the ROM file into memory instead of reading it."""
+#  Copyright 2020-2021 Parakoopa and the SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+import logging
+import mmap
+import os
+import struct
+from typing import Optional, Iterable
+
+from ndspy.rom import NintendoDSRom, ICON_BANNER_LEN
+
+logger = logging.getLogger(__name__)
+ARM9_POST_DATA_MAGIC = b'\x21\x06\xC0\xDE'
+ARM9_POST_DATA_ENTRY_LEN = 12
+
+
+class MappedFileList(list):
+    """
+    The files of a memory mapped ROM. Files that were not replaced yet are stored as memoryviews into the mapping.
+
+    Indexing the list returns bytes, like for a regular ROM, so that all existing code working with
+    ``rom.files`` keeps working. A file is only read from the mapping (copied) when it is accessed.
+    Iterating the list returns the stored entries as-is.
+    """
+    def __getitem__(self, item):
+        value = super().__getitem__(item)
+        if isinstance(item, slice):
+            return [_materialize(v) for v in value]
+        return _materialize(value)
+
+
+class MemoryMappedRom:
+    """
+    A ROM, that is memory mapped from disk. Only the header, binaries and file tables are read on load,
+    the files of the ROM are read from the mapping when they are accessed. Only the files that are
+    actually used cost memory. The views into the mapping never leave this module, so it can be closed
+    when saving.
+
+    The ROM model is available as ``rom``. It is a regular NintendoDSRom, except for its file list.
+    """
+    def __init__(self, filename: str):
+        self._file = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._map(filename)
+        self.rom = NintendoDSRom(_compact_image(self._mmap))
+        self.rom.rsaSignature = _rsa_signature(self._mmap)
+        self.rom.files = MappedFileList()
+        self._point_files_to_mapping()
+
+    def save(self, filename: str):
+        """Fully rebuilds the ROM, writes it to disk and maps the new file."""
+        data = self.rom.save()
+        # The old mapping must not be used anymore, when the file is rewritten. Until the new file is
+        # mapped, the files are views into the new ROM image in memory.
+        self._point_files_to(memoryview(data), self.rom.files)
+        tmp_filename = filename + '.tmp'
+        with open(tmp_filename, 'wb') as f:
+            f.write(data)
+        # Windows can't replace a file that is still mapped or open, so the mapping is closed first.
+        self._unmap()
+        try:
+            os.replace(tmp_filename, filename)
+        except OSError:
+            os.remove(tmp_filename)
+            # The old file is untouched, the files are still backed by the new image in memory.
+            self._map(filename)
+            raise
+        self._map(filename)
+        self._point_files_to_mapping()
+
+    def remap_files(self, file_ids: Iterable[int]):
+        """
+        Replaces the given files with views into the mapping again, after they were written into the
+        mapped file in place.
+        """
+        view = memoryview(self._mmap)
+        fat_offset = struct.unpack_from('<I', self._mmap, 0x48)[0]
+        for file_id in file_ids:
+            start, end = struct.unpack_from('<II', self._mmap, fat_offset + 8 * file_id)
+            if view[start:end] == self.rom.files[file_id]:
+                list.__setitem__(self.rom.files, file_id, view[start:end])
+
+    def _map(self, filename: str):
+        self._file = open(filename, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _unmap(self):
+        mapping, self._mmap = self._mmap, None
+        self._file.close()
+        try:
+            mapping.close()
+        except BufferError:
+            # Someone still holds a view into the old mapping. It is closed, once the last view is gone.
+            logger.warning("The ROM file mapping is still in use and could not be closed.")
+
+    def _point_files_to_mapping(self):
+        self._point_files_to(memoryview(self._mmap), self.rom.files)
+
+    def _point_files_to(self, image: memoryview, files: MappedFileList):
+        """Replaces all files with views into the given ROM image, using the FAT of the image."""
+        fat_offset, fat_len = struct.unpack_from('<II', image, 0x48)
+        offset_to_id = {}
+        new_files = []
+        for i in range(fat_len // 8):
+            start, end = struct.unpack_from('<II', image, fat_offset + 8 * i)
+            new_files.append(image[start:end])
+            offset_to_id[start] = i
+        list.__setitem__(files, slice(None), new_files)
+        self.rom.sortedFileIds = [offset_to_id[off] for off in sorted(offset_to_id)]
+
+
+def _compact_image(image: mmap.mmap) -> bytes:
+    """
+    Builds a ROM image, that contains everything of the mapped ROM, except for the files. The header is updated to
+    point to the new positions, the FAT is cleared. ndspy can read the header, binaries and tables from it.
+    """
+    data = bytearray(image[0:0x200])
+    arm9_offset, arm9_len = struct.unpack_from('<I12xI', image, 0x20)
+    # ndspy reads the data between header and arm9, so it stays at its offset.
+    data += image[0x200:arm9_offset]
+    arm9_end = arm9_offset + arm9_len
+    while image[arm9_end:arm9_end + 4] == ARM9_POST_DATA_MAGIC:
+        arm9_end += ARM9_POST_DATA_ENTRY_LEN
+    data += image[arm9_offset:arm9_end]
+
+    def relocate(offset_field: int, length: int, optional=False):
+        offset = struct.unpack_from('<I', image, offset_field)[0]
+        if optional and not offset:
+            return
+        struct.pack_into('<I', data, offset_field, len(data))
+        data.extend(image[offset:offset + length])
+
+    relocate(0x30, struct.unpack_from('<I', image, 0x3C)[0])  # arm7
+    relocate(0x40, struct.unpack_from('<I', image, 0x44)[0])  # FNT
+    relocate(0x50, struct.unpack_from('<I', image, 0x54)[0])  # arm9 overlay table
+    relocate(0x58, struct.unpack_from('<I', image, 0x5C)[0])  # arm7 overlay table
+    relocate(0x68, ICON_BANNER_LEN, optional=True)  # icon / banner
+    relocate(0x160, struct.unpack_from('<I', image, 0x164)[0], optional=True)  # debug ROM
+    fat_len = struct.unpack_from('<I', image, 0x4C)[0]
+    struct.pack_into('<I', data, 0x48, len(data))
+    data.extend(bytes(fat_len))
+    # The RSA signature is read from the mapping.
+    struct.pack_into('<I', data, 0x80, 0)
+    return bytes(data)
+
+
+def _rsa_signature(image: mmap.mmap) -> bytes:
+    """Reads the RSA signature, the same way ndspy does."""
+    real_sig_offset = 0
+    if len(image) >= 0x1004:
+        real_sig_offset = struct.unpack_from('<I', image, 0x1000)[0]
+    rom_size_or_sig_offset = struct.unpack_from('<I', image, 0x80)[0]
+    if not real_sig_offset and len(image) > rom_size_or_sig_offset:
+        real_sig_offset = rom_size_or_sig_offset
+    if real_sig_offset:
+        return bytearray(image[real_sig_offset:min(len(image), real_sig_offset + 0x88)])
+    return b''
+
+
+def _materialize(value):
+    if isinstance(value, memoryview):
+        return value.tobytes()
+    return value
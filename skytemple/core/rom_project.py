@@ -15,27 +15,38 @@
 #
 #  You should have received a copy of the GNU General Public License
 #  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+import itertools
 import logging
 import sys
+import threading
+import time
+from contextlib import contextmanager
 from enum import Enum, auto
-from typing import Union, Iterator, TYPE_CHECKING, Optional, Dict, Callable, Type, Tuple
+from typing import Union, Iterator, TYPE_CHECKING, Optional, Dict, Callable, Type, Tuple, List, Set
 
-from gi.repository import GLib, Gtk
 from ndspy.rom import NintendoDSRom
 
 from skytemple.core.abstract_module import AbstractModule
+from skytemple.core.autosave import AutosaveJournal
+from skytemple.core.binary_cache import BinaryCache
+from skytemple.core.model_cache import ModelCache, ModelCacheStats
+from skytemple.core.model_disk_cache import ModelDiskCache
+from skytemple.core.incremental_save import RomSaveSnapshot, save_incrementally
+from skytemple.core.model_serialization import serialize_in_worker_process, serialize_model, pickle_for_serialization
 from skytemple.core.modules import Modules
 from skytemple.core.open_request import OpenRequest
-from skytemple.core.model_context import ModelContext
-from skytemple.core.sprite_provider import SpriteProvider
+from skytemple.core.profiler import PhaseProfiler
+from skytemple.core.rom_mmap import MemoryMappedRom
+from skytemple.core.settings import SkyTempleSettingsStore
+from skytemple.core.model_context import ModelContext, ModelContextStats
 from skytemple.core.string_provider import StringProvider
-from skytemple_files.common.ppmdu_config.data import Pmd2Binary
+from skytemple.core.task_scheduler import TaskScheduler, TaskPriority
+from skytemple_files.common.ppmdu_config.data import Pmd2Binary, Pmd2Data
 from skytemple_files.common.project_file_manager import ProjectFileManager
-from skytemple_files.common.task_runner import AsyncTaskRunner
 from skytemple_files.common.types.data_handler import DataHandler, T
 from skytemple_files.common.types.file_types import FileType
 from skytemple_files.common.util import get_files_from_rom_with_extension, get_rom_folder, create_file_in_rom, \
-    get_ppmdu_config_for_rom, get_binary_from_rom_ppmdu, set_binary_in_rom_ppmdu, get_files_from_folder_with_extension
+    get_ppmdu_config_for_rom, get_files_from_folder_with_extension
 from skytemple_files.container.sir0.sir0_serializable import Sir0Serializable
 from skytemple_files.patch.patches import Patcher
 from skytemple_files.compression_container.common_at.handler import CommonAtType
@@ -43,14 +54,15 @@ from skytemple_files.compression_container.common_at.handler import CommonAtType
 logger = logging.getLogger(__name__)
 
 if TYPE_CHECKING:
+    from gi.repository import Gtk
     from skytemple.controller.main import MainController
+    from skytemple.core.sprite_provider import SpriteProvider
     from skytemple.module.rom.module import RomModule
 
 
 try:
     from contextlib import nullcontext
 except ImportError:  # < Python 3.7
-    from contextlib import contextmanager
     @contextmanager
     def nullcontext(enter_result=None):
         yield enter_result
@@ -93,71 +105,158 @@ class RomProject:
         return cls._current
 
     @classmethod
-    def open(cls, filename, main_controller: Optional['MainController'] = None):
+    def open(cls, filename, main_controller: Optional['MainController'] = None, recover_autosave=False):
         """
         Open a file (in a new thread).
         If the main controller is set, it will be informed about this.
+        If recover_autosave is set, the files in the autosave journal of the project are restored.
         """
-        AsyncTaskRunner().instance().run_task(cls._open_impl(filename, main_controller))
+        PhaseProfiler.start(f'Open {filename}', SkyTempleSettingsStore().get_profile_memory())
+        TaskScheduler.instance().run(
+            TaskPriority.INTERACTIVE, cls._open_impl, filename, main_controller, recover_autosave,
+            category='rom.open', item=filename, exclusive=True
+        )
 
     @classmethod
-    async def _open_impl(cls, filename, main_controller: Optional['MainController']):
-        cls._current = RomProject(filename, main_controller.load_view_main_list)
+    def open_headless(cls, filename, recover_autosave=False) -> 'RomProject':
+        """
+        Open a file synchronously, without the UI. No modules are loaded (they need Gtk), only the files and
+        binaries of the ROM can be accessed and saved (see load). Gtk is not imported.
+        The project becomes the current project.
+        """
+        project = RomProject(filename, None, recover_autosave)
+        project.load(headless=True)
+        cls._current = project
+        return project
+
+    @classmethod
+    def _open_impl(cls, filename, main_controller: Optional['MainController'], recover_autosave: bool):
+        cls._current = RomProject(
+            filename, main_controller.load_view_main_list if main_controller else None, recover_autosave
+        )
         try:
-            cls._current.load()
+            with PhaseProfiler.phase('RomProject.load'):
+                cls._current.load()
             if main_controller:
-                GLib.idle_add(lambda: main_controller.on_file_opened())
+                _idle_add(lambda: main_controller.on_file_opened())
         except BaseException as ex:
             exc_info = sys.exc_info()
             cls._current = None
             if main_controller:
-                GLib.idle_add(lambda ex=ex: main_controller.on_file_opened_error(exc_info, ex))
+                _idle_add(lambda ex=ex: main_controller.on_file_opened_error(exc_info, ex))
 
-    def __init__(self, filename: str, cb_open_view: Callable[[Gtk.TreeIter], None]):
+    def __init__(self, filename: str, cb_open_view: Optional[Callable[['Gtk.TreeIter'], None]],
+                 recover_autosave=False):
         self.filename = filename
         self._rom: NintendoDSRom = None
+        # Set, if the ROM is memory mapped instead of read into memory (see MemoryMappedRom).
+        self._mapped_rom: Optional[MemoryMappedRom] = None
         self._rom_module: Optional['RomModule'] = None
         self._loaded_modules: Dict[str, AbstractModule] = {}
-        self._sprite_renderer: Optional[SpriteProvider] = None
+        # The binaries of the ROM and tables read from them. Set on load.
+        self._binaries: Optional[BinaryCache] = None
+        # Only set for headless projects, otherwise the ROM module holds the static data.
+        self._static_data: Optional[Pmd2Data] = None
+        self._sprite_renderer: Optional['SpriteProvider'] = None
         self._string_provider: Optional[StringProvider] = None
-        # Dict of filenames -> models
-        self._opened_files = {}
+        # Filenames -> models. Unmodified models are evicted, when the cache budget is exceeded.
+        self._opened_files = ModelCache()
+        # Models from previous sessions. Set on load.
+        self._model_disk_cache: Optional[ModelDiskCache] = None
         self._opened_files_contexts = {}
         # List of filenames that were requested to be opened threadsafe.
         self._files_threadsafe = []
         self._files_unsafe = []
+        # Modules are constructed in parallel, so opening files must not race.
+        self._open_files_lock = threading.RLock()
         # Dict of filenames -> file handler object
         self._file_handlers = {}
         self._file_handler_kwargs = {}
-        # List of modified filenames
-        self._modified_files = []
+        # Modified filenames. A dict is used as an ordered set, the files are saved in the order they were modified.
+        self._modified_files: Dict[str, None] = {}
         self._forced_modified = False
-        # Callback for opening views using iterators from the main view list.
-        self._cb_open_view: Callable[[Gtk.TreeIter], None] = cb_open_view
+        # Filenames (and paths of binaries) -> generation of their last modification. Increases on every modification.
+        self._modification_counter = itertools.count(1)
+        self._modification_generations: Dict[str, int] = {}
+        # Generation of the last modification of anything in the project (files, binaries or the ROM itself).
+        self._project_modification_generation = 0
+        # Generation of the last modification, that may have changed any file (see force_mark_as_modified).
+        self._global_modification_generation = 0
+        # Module classes -> names of the files and binaries, that were read while tracking access for the module.
+        self._accessed_by_module: Dict[Type[AbstractModule], Set[str]] = {}
+        self._accessed_by_module_lock = threading.Lock()
+        # The module class that file access on the current thread is recorded for.
+        self._accessing_module = threading.local()
+        # Filenames -> (generation, serialized data) of modified models, that were serialized by the autosave.
+        self._serialized: Dict[str, Tuple[int, bytes]] = {}
+        self._recover_autosave = recover_autosave
+        self._autosave_journal: Optional[AutosaveJournal] = None
+        # State of the ROM file on disk, used to only write changed files on save. None if a full save is required.
+        self._save_snapshot: Optional[RomSaveSnapshot] = None
+        # Callback for opening views using iterators from the main view list. None for headless projects.
+        self._cb_open_view: Optional[Callable[['Gtk.TreeIter'], None]] = cb_open_view
         self._project_fm = ProjectFileManager(filename)
 
-    def load(self):
-        """Load the ROM into memory and initialize all modules"""
-        self._rom = NintendoDSRom.fromFile(self.filename)
+    def load(self, headless=False):
+        """
+        Load the ROM into memory and initialize all modules.
+        If headless is set, the modules and the sprite provider are not loaded, instead the static data is
+        loaded and the patch properties are initialized right away. Nothing that needs Gtk is imported then.
+        """
+        with PhaseProfiler.phase('RomProject.load.read_rom'):
+            if SkyTempleSettingsStore().get_memory_mapped_rom():
+                self._mapped_rom = MemoryMappedRom(self.filename)
+                self._rom = self._mapped_rom.rom
+            else:
+                self._rom = NintendoDSRom.fromFile(self.filename)
+        self._binaries = BinaryCache(self._rom)
+        self._save_snapshot = RomSaveSnapshot(self._rom, self.filename)
+        self._autosave_journal = AutosaveJournal(self.filename)
+        if self._recover_autosave:
+            recovered = self._autosave_journal.read()
+            for name, data in recovered.items():
+                self._rom.setFileByName(name, data)
+            if len(recovered) > 0:
+                logger.info(f"Recovered {len(recovered)} files from the autosave journal.")
+                self._forced_modified = True
+        settings = SkyTempleSettingsStore()
+        self._opened_files.budget = settings.get_model_cache_budget_mb() * 1024 * 1024
+        self._model_disk_cache = ModelDiskCache(
+            self._project_fm.dir(), settings.get_model_disk_cache_size_mb() * 1024 * 1024
+        )
         self._loaded_modules = {}
-        for name, module in Modules.all().items():
+        if headless:
+            self._static_data = self.load_rom_data()
+            self._string_provider = StringProvider(self)
+            self.init_patch_properties()
+            return
+        with PhaseProfiler.phase('RomProject.load.construct_modules'):
+            constructed = Modules.construct_all(self)
+        for name, module in constructed.items():
             if name == 'rom':
-                self._rom_module = module(self)
+                self._rom_module = module
             else:
-                self._loaded_modules[name] = module(self)
+                self._loaded_modules[name] = module
 
-        self._sprite_renderer = SpriteProvider(self)
-        self._string_provider = StringProvider(self)
+        with PhaseProfiler.phase('RomProject.load.providers'):
+            from skytemple.core.sprite_provider import SpriteProvider
+            self._sprite_renderer = SpriteProvider(self)
+            self._string_provider = StringProvider(self)
 
     def get_rom_module(self) -> 'RomModule':
         return self._rom_module
 
+    def get_static_data(self) -> Pmd2Data:
+        if self._rom_module is not None:
+            return self._rom_module.get_static_data()
+        return self._static_data
+
     def get_project_file_manager(self):
         return self._project_fm
 
     def get_modules(self, include_rom_module=True) -> Iterator[AbstractModule]:
         """Iterate over loaded modules"""
-        if include_rom_module:
+        if include_rom_module and self._rom_module is not None:
             return iter(list(self._loaded_modules.values()) + [self._rom_module])
         return iter(self._loaded_modules.values())
 
@@ -179,12 +278,17 @@ class RomProject:
         Additional keyword arguments are passed to the handler (if the model isn't already loaded!!)
         The keyword arguments will also be used for serializing again.
         """
-        if file_path_in_rom not in self._opened_files:
-            bin = self._rom.getFileByName(file_path_in_rom)
-            self._opened_files[file_path_in_rom] = file_handler_class.deserialize(bin, **kwargs)
-            self._file_handlers[file_path_in_rom] = file_handler_class
-            self._file_handler_kwargs[file_path_in_rom] = kwargs
-        return self._open_common(file_path_in_rom, threadsafe)
+        self._record_access(file_path_in_rom)
+        with self._open_files_lock:
+            model = self._opened_files.get(file_path_in_rom)
+            if model is None:
+                bin = self._rom.getFileByName(file_path_in_rom)
+                model = self._deserialize(
+                    bin, _type_name(file_handler_class), kwargs,
+                    lambda: file_handler_class.deserialize(bin, **kwargs)
+                )
+                self._register_opened_file(file_path_in_rom, model, file_handler_class, kwargs, len(bin))
+            return self._open_common(file_path_in_rom, model, threadsafe)
 
     def open_sir0_file_in_rom(self, file_path_in_rom: str, sir0_serializable_type: Type[Sir0Serializable],
                               threadsafe=False):
@@ -198,54 +302,194 @@ class RomProject:
 
         If ``threadsafe`` is True, instead of returning the model, a ModelContext[T] is returned.
         """
-        if file_path_in_rom not in self._opened_files:
-            bin = self._rom.getFileByName(file_path_in_rom)
-            sir0 = FileType.SIR0.deserialize(bin)
-            self._opened_files[file_path_in_rom] = FileType.SIR0.unwrap_obj(sir0, sir0_serializable_type)
-            self._file_handlers[file_path_in_rom] = FileType.SIR0
-            self._file_handler_kwargs[file_path_in_rom] = {}
-        return self._open_common(file_path_in_rom, threadsafe)
-
-    def _open_common(self, file_path_in_rom: str, threadsafe):
+        self._record_access(file_path_in_rom)
+        with self._open_files_lock:
+            model = self._opened_files.get(file_path_in_rom)
+            if model is None:
+                bin = self._rom.getFileByName(file_path_in_rom)
+                model = self._deserialize(
+                    bin, _type_name(sir0_serializable_type), {},
+                    lambda: FileType.SIR0.unwrap_obj(FileType.SIR0.deserialize(bin), sir0_serializable_type)
+                )
+                self._register_opened_file(file_path_in_rom, model, FileType.SIR0, {}, len(bin))
+            return self._open_common(file_path_in_rom, model, threadsafe)
+
+    def _deserialize(self, bin: bytes, model_type: str, kwargs: dict, deserialize: Callable[[], T]) -> T:
+        if self._model_disk_cache is None:
+            return deserialize()
+        return self._model_disk_cache.deserialize(bin, model_type, kwargs, deserialize)
+
+    def _register_opened_file(self, file_path_in_rom: str, model, handler: Type[DataHandler], kwargs: dict,
+                              size: int):
+        self._opened_files.put(file_path_in_rom, model, size)
+        self._file_handlers[file_path_in_rom] = handler
+        self._file_handler_kwargs[file_path_in_rom] = kwargs
+
+    def _unregister_opened_file(self, file_path_in_rom: str):
+        self._opened_files.remove(file_path_in_rom)
+        if file_path_in_rom in self._opened_files_contexts:
+            del self._opened_files_contexts[file_path_in_rom]
+        if file_path_in_rom in self._modified_files:
+            del self._modified_files[file_path_in_rom]
+
+    def _open_common(self, file_path_in_rom: str, model, threadsafe):
         if threadsafe:
             if file_path_in_rom in self._files_unsafe:
                 raise ValueError(
                     f"Tried to open {file_path_in_rom} threadsafe, but it was requested unsafe somewhere else."
                 )
             if file_path_in_rom not in self._opened_files_contexts:
-                self._opened_files_contexts[file_path_in_rom] = ModelContext(self._opened_files[file_path_in_rom])
+                # The context keeps the model, so it must not be replaced by another one.
+                self._opened_files.pin(file_path_in_rom)
+                self._opened_files_contexts[file_path_in_rom] = ModelContext(model, file_path_in_rom)
             return self._opened_files_contexts[file_path_in_rom]
         elif file_path_in_rom in self._files_threadsafe:
             raise ValueError(f"Tried to open {file_path_in_rom} unsafe, but it was requested threadsafe somewhere else.")
-        return self._opened_files[file_path_in_rom]
+        return model
 
     def is_opened(self, filename):
         return filename in self._opened_files
 
     def mark_as_modified(self, file: Union[str, object]):
-        """Mark a file as modified, either by filename or model. TODO: Input checking"""
+        """Mark a file as modified, either by filename or model."""
         if isinstance(file, str):
             assert file in self._opened_files
-            if file not in self._modified_files:
-                self._modified_files.append(file)
+            filename = file
+        else:
+            filename = self._opened_files.path_of(file)
+            if filename is None:
+                raise ValueError(f"The model {file} is not opened in this project.")
+        # Modified models must be kept until they are saved.
+        self._opened_files.pin(filename)
+        self._modification_generations[filename] = self._next_modification_generation()
+        self._modified_files[filename] = None
+
+    def get_modification_generation(self, filename: str) -> int:
+        """Returns a number, that changes every time the file is marked as modified. 0 if it never was."""
+        return self._modification_generations.get(filename, 0)
+
+    @contextmanager
+    def track_access(self, module: Type[AbstractModule]):
+        """
+        Record the files and binaries read on this thread within the block as being used by the module
+        (see get_dependency_generation).
+        """
+        previous = self.set_accessing_module(module)
+        try:
+            yield
+        finally:
+            self.set_accessing_module(previous)
+
+    def set_accessing_module(self, module: Optional[Type[AbstractModule]]) -> Optional[Type[AbstractModule]]:
+        """
+        Record the files and binaries read on this thread from now on as being used by the module, or stop
+        recording if None. Returns the module that access was recorded for before.
+        """
+        previous = getattr(self._accessing_module, 'module', None)
+        self._accessing_module.module = module
+        return previous
+
+    def get_dependency_generation(self, module: Type[AbstractModule]) -> int:
+        """
+        Returns a number, that changes every time a file or binary the module read (while access was tracked for
+        it) is modified.
+        """
+        with self._accessed_by_module_lock:
+            names = list(self._accessed_by_module.get(module, ()))
+        return max([self._global_modification_generation] + [self._modification_generations.get(n, 0) for n in names])
+
+    def _record_access(self, name: str):
+        module = getattr(self._accessing_module, 'module', None)
+        if module is not None:
+            with self._accessed_by_module_lock:
+                self._accessed_by_module.setdefault(module, set()).add(name)
+
+    def get_project_modification_generation(self) -> int:
+        """
+        Returns a number, that changes every time anything in the project is modified: Files marked as modified,
+        binaries and files saved manually. 0 if nothing was modified yet.
+        """
+        return self._project_modification_generation
+
+    def _next_modification_generation(self) -> int:
+        self._project_modification_generation = next(self._modification_counter)
+        return self._project_modification_generation
+
+    def get_modified_generations(self) -> Dict[str, int]:
+        """Returns the modification generations of all modified files, that were not saved yet."""
+        return {name: self.get_modification_generation(name) for name in list(self._modified_files.keys())}
+
+    def get_autosave_journal(self) -> AutosaveJournal:
+        return self._autosave_journal
+
+    def discard_autosave(self):
+        """Removes the autosave journal, the modifications won't be recoverable."""
+        if self._autosave_journal is not None:
+            self._autosave_journal.clear()
+
+    def get_serialized(self, name: str, generation: int) -> Optional[bytes]:
+        """Returns the data stored with store_serialized, if the model is still in the given generation."""
+        cached = self._serialized.get(name)
+        if cached is not None and cached[0] == generation:
+            return cached[1]
+        return None
+
+    def snapshot_for_autosave(self, name: str) -> Optional[bytes]:
+        """
+        Copy a modified model for the autosave, as a payload for serialize_in_worker_process. Must be called from the
+        main thread, models must not be modified while it runs. Returns None, if the model can't be serialized
+        outside of saving.
+        """
+        if name in self._opened_files_contexts:
+            ctx = self._opened_files_contexts[name].read()
         else:
-            filename = list(self._opened_files.keys())[list(self._opened_files.values()).index(file)]
-            self._modified_files.append(filename)
-            if file not in self._modified_files:
-                self._modified_files.append(file)
+            ctx = self._model_context(name)
+        with ctx as model:
+            return pickle_for_serialization(self._file_handlers[name], model, self._file_handler_kwargs[name])
+
+    def store_serialized(self, name: str, generation: int, data: bytes) -> bool:
+        """
+        Store the serialized data of a model for re-use, if it wasn't modified since. Must be called from the main
+        thread, models must not be modified while it runs. Returns whether the data is still valid.
+        """
+        if name not in self._modified_files or self.get_modification_generation(name) != generation:
+            return False
+        self._serialized[name] = (generation, data)
+        return True
+
+    def get_model_cache_stats(self) -> ModelCacheStats:
+        """Returns the budget, resident size and hit rate of the cache of opened models."""
+        return self._opened_files.stats()
+
+    def get_model_context_stats(self) -> Dict[str, ModelContextStats]:
+        """Returns how often and how long threads waited for the models of files opened threadsafe."""
+        return {name: ctx.stats() for name, ctx in self._opened_files_contexts.items()}
+
+    def set_model_cache_budget(self, budget: int):
+        """Sets the budget of the cache of opened models in bytes (of the files the models were read from)."""
+        self._opened_files.budget = budget
 
     def force_mark_as_modified(self):
         self._forced_modified = True
+        self._global_modification_generation = self._next_modification_generation()
+        # We don't know what was changed, so the ROM has to be fully rebuilt on the next save
+        # and the binaries have to be read again (eg. they were patched).
+        self._save_snapshot = None
+        self._binaries.invalidate()
 
     def has_modifications(self):
         return len(self._modified_files) > 0 or self._forced_modified
 
     def save(self, main_controller: Optional['MainController']):
         """Save the rom. The main controller will be informed about this, if given."""
-        AsyncTaskRunner().instance().run_task(self._save_impl(main_controller))
+        TaskScheduler.instance().run(
+            TaskPriority.INTERACTIVE, self._save_impl, main_controller,
+            category='rom.save', item=self.filename, exclusive=True
+        )
 
     def open_file_manually(self, filename: str):
         """Returns the raw bytes of a file. GENERALLY NOT RECOMMENDED."""
+        self._record_access(filename)
         return self._rom.getFileByName(filename)
 
     def save_file_manually(self, filename: str, data: bytes):
@@ -255,51 +499,127 @@ class RomProject:
         for re-generated files which are otherwise not read by SkyTemple (only saved), such as the mappa_gs.bin file.
         THIS INVALIDATES THE CURRENTLY LOADED FILE (via open_file_in_rom; it will return a new model now).
         """
-        if filename in self._opened_files:
-            del self._opened_files[filename]
-        if filename in self._opened_files_contexts:
-            del self._opened_files_contexts[filename]
+        self._unregister_opened_file(filename)
         self._rom.setFileByName(filename, data)
-        self.force_mark_as_modified()
+        self._forced_modified = True
+        self._modification_generations[filename] = self._next_modification_generation()
+
+    def save_sync(self):
+        """Write all modified models to the ROM and save it, on the calling thread."""
+        saved_files = list(self._modified_files.keys())
+        self.prepare_save_models(saved_files)
+        self._modified_files = {}
+        for name in saved_files:
+            if name not in self._opened_files_contexts and name not in self._modified_files:
+                # The model is saved in the ROM now, it can be read again, if it is evicted.
+                self._opened_files.unpin(name)
+        self._forced_modified = False
+        logger.debug(f"Saving ROM to {self.filename}")
+        self.save_as_is()
 
-    async def _save_impl(self, main_controller: Optional['MainController']):
+    def _save_impl(self, main_controller: Optional['MainController']):
         try:
-            for name in self._modified_files:
-                self.prepare_save_model(name)
-            self._modified_files = []
-            self._forced_modified = False
-            logger.debug(f"Saving ROM to {self.filename}")
-            self.save_as_is()
+            self.save_sync()
             if main_controller:
-                GLib.idle_add(lambda: main_controller.on_file_saved())
+                _idle_add(lambda: main_controller.on_file_saved())
 
         except Exception as err:
             if main_controller:
                 exc_info = sys.exc_info()
-                GLib.idle_add(lambda err=err: main_controller.on_file_saved_error(exc_info, err))
+                _idle_add(lambda err=err: main_controller.on_file_saved_error(exc_info, err))
 
     def prepare_save_model(self, name, assert_that=None):
         """
         Write the binary model for this type to the ROM object in memory.
         If assert_that is given, it is asserted, that the model matches the one on record.
         """
-        context = self._opened_files_contexts[name] \
-            if name in self._opened_files_contexts \
-            else nullcontext(self._opened_files[name])
-        with context as model:
+        with self._model_context(name) as model:
             handler = self._file_handlers[name]
             logger.debug(f"Saving {name} in ROM. Model: {model}, Handler: {handler}")
-            if handler == FileType.SIR0:
-                logger.debug(f"> Saving as Sir0 wrapped data.")
-                model = handler.wrap_obj(model)
             if assert_that is not None:
                 assert assert_that is model, "The model that is being saved must match!"
-            binary_data = handler.serialize(model, **self._file_handler_kwargs[name])
+            binary_data = serialize_model(handler, model, self._file_handler_kwargs[name])
             self._rom.setFileByName(name, binary_data)
 
+    def prepare_save_models(self, names: List[str]):
+        """
+        Write the binary models for the given files to the ROM object in memory.
+        Models are serialized concurrently in worker processes where possible. The results are written to the
+        ROM on the calling thread once all models are serialized.
+        """
+        start = time.perf_counter()
+        futures = {}
+        in_process = []
+        results = {}
+        for name in names:
+            cached = self._serialized.get(name)
+            if cached is not None and cached[0] == self.get_modification_generation(name):
+                # Unchanged since the autosave serialized it.
+                results[name] = cached[1]
+                continue
+            with self._model_context(name) as model:
+                payload = pickle_for_serialization(self._file_handlers[name], model, self._file_handler_kwargs[name])
+            if payload is None:
+                in_process.append(name)
+            else:
+                futures[name] = serialize_in_worker_process(payload, name)
+
+        for name in in_process:
+            results[name] = self._serialize_timed(name)
+        for name, future in futures.items():
+            try:
+                results[name], duration = future.result()
+                logger.info(f"Serialized {name} in {duration:.3f}s (worker process).")
+            except Exception as ex:
+                logger.warning(f"Serializing {name} in a worker process failed, retrying.", exc_info=ex)
+                results[name] = self._serialize_timed(name)
+
+        for name in names:
+            self._rom.setFileByName(name, results[name])
+        logger.info(f"Serialized {len(names)} files in {time.perf_counter() - start:.3f}s.")
+
+    def _serialize_timed(self, name) -> bytes:
+        start = time.perf_counter()
+        with self._model_context(name) as model:
+            binary_data = serialize_model(self._file_handlers[name], model, self._file_handler_kwargs[name])
+        logger.info(f"Serialized {name} in {time.perf_counter() - start:.3f}s.")
+        return binary_data
+
+    def _model_context(self, name):
+        """Returns a context manager for accessing the model of an opened file."""
+        if name in self._opened_files_contexts:
+            return self._opened_files_contexts[name]
+        model = self._opened_files.peek(name)
+        if model is None:
+            raise KeyError(f"{name} is not opened.")
+        return nullcontext(model)
+
     def save_as_is(self):
-        """Simply save the current ROM to disk."""
-        self._rom.saveToFile(self.filename)
+        """
+        Simply save the current ROM to disk.
+        If possible, only the changed files are written into the existing ROM file, otherwise it is rebuilt.
+        """
+        start = time.perf_counter()
+        written = save_incrementally(self._rom, self.filename, self._save_snapshot)
+        if written is None:
+            if self._mapped_rom is not None:
+                # The snapshot holds views into the mapping, which is replaced.
+                self._save_snapshot = None
+                self._mapped_rom.save(self.filename)
+            else:
+                self._rom.saveToFile(self.filename)
+            logger.info(f"Saved ROM to {self.filename} (full rebuild) in {time.perf_counter() - start:.3f}s.")
+        else:
+            if self._mapped_rom is not None:
+                # The written files can be read from the mapping again.
+                self._mapped_rom.remap_files(written)
+            logger.info(f"Saved ROM to {self.filename} (in place, {len(written)} files) "
+                        f"in {time.perf_counter() - start:.3f}s.")
+        self._save_snapshot = RomSaveSnapshot(self._rom, self.filename)
+        # The journal belongs to the old state of the ROM file. Still modified files are journaled again.
+        self._serialized = {name: v for name, v in self._serialized.items() if name in self._modified_files}
+        if self._autosave_journal is not None:
+            self._autosave_journal.clear()
 
     def get_files_with_ext(self, ext, folder_name: Optional[str] = None):
         if folder_name is None:
@@ -319,9 +639,10 @@ class RomProject:
         writes the serialized model data there"""
         copy_bin = file_handler_class.serialize(model, **kwargs)
         create_file_in_rom(self._rom, new_filename, copy_bin)
-        self._opened_files[new_filename] = file_handler_class.deserialize(copy_bin, **kwargs)
-        self._file_handlers[new_filename] = file_handler_class
-        self._file_handler_kwargs[new_filename] = kwargs
+        self._register_opened_file(
+            new_filename, file_handler_class.deserialize(copy_bin, **kwargs), file_handler_class, kwargs,
+            len(copy_bin)
+        )
         return copy_bin
 
     def file_exists(self, filename):
@@ -336,35 +657,78 @@ class RomProject:
         unless raise_exception is true, in which case a ValueError is raised.
         """
         for module in self._loaded_modules.values():
+            # The iterators returned are only available once the module's subtree is loaded.
+            module.materialize_tree_items()
             result = module.handle_request(request)
             if result is not None:
-                self._cb_open_view(result)
+                if self._cb_open_view is not None:
+                    self._cb_open_view(result)
                 return
         if raise_exception:
             raise ValueError("No handler for request.")
 
-    def get_sprite_provider(self) -> SpriteProvider:
+    def get_sprite_provider(self) -> 'SpriteProvider':
         return self._sprite_renderer
 
     def get_string_provider(self) -> StringProvider:
         return self._string_provider
 
     def create_patcher(self):
-        return Patcher(self._rom, self.get_rom_module().get_static_data())
+        return Patcher(self._rom, self.get_static_data())
 
     def get_binary(self, binary: Union[Pmd2Binary, BinaryName, str]) -> bytes:
-        if not isinstance(binary, Pmd2Binary):
-            binary = self.get_rom_module().get_static_data().binaries[str(binary)]
-        return get_binary_from_rom_ppmdu(self._rom, binary)
+        """Returns one of the binaries (such as arm9 or overlay). It is cached, use modify_binary to change it."""
+        binary = self._resolve_binary(binary)
+        self._record_access(binary.filepath)
+        return self._binaries.get(binary)
+
+    def get_binary_table(self, binary: Union[Pmd2Binary, BinaryName, str],
+                         decode: Callable[[bytes, Pmd2Data], T]) -> T:
+        """
+        Returns a table read from a binary with decode(binary, static data), eg. with
+        HardcodedDungeons.get_dungeon_list. The result is cached until the binary is modified. A copy is
+        returned, changes to it must be written back with modify_binary.
+        """
+        binary = self._resolve_binary(binary)
+        self._record_access(binary.filepath)
+        return self._binaries.table(binary, self.get_static_data(), decode)
 
     def modify_binary(self, binary: Union[Pmd2Binary, BinaryName, str], modify_cb: Callable[[bytearray], None]):
         """Modify one of the binaries (such as arm9 or overlay) and save it to the ROM"""
+        binary = self._resolve_binary(binary)
+        self._record_access(binary.filepath)
+        self._binaries.modify(binary, modify_cb)
+        if not self._binaries.in_transaction():
+            self._mark_binary_as_modified(binary.filepath)
+
+    @contextmanager
+    def edit_binaries(self):
+        """
+        Batch modifications of binaries with modify_binary: Each modified binary is copied once and written back
+        to the ROM once, when the outermost block is left. If it is left with an exception, the modifications
+        are discarded. The block belongs to the calling thread, modify_binary calls from other threads wait
+        until it is left.
+        """
+        self._binaries.begin()
+        try:
+            yield
+        except BaseException:
+            self._binaries.rollback()
+            raise
+        written = self._binaries.commit()
+        for filepath in written:
+            self._mark_binary_as_modified(filepath)
+        if len(written) > 0:
+            logger.debug(f"Wrote {len(written)} modified binaries to the ROM.")
+
+    def _mark_binary_as_modified(self, filepath: str):
+        self._forced_modified = True
+        self._modification_generations[filepath] = self._next_modification_generation()
+
+    def _resolve_binary(self, binary: Union[Pmd2Binary, BinaryName, str]) -> Pmd2Binary:
         if not isinstance(binary, Pmd2Binary):
-            binary = self.get_rom_module().get_static_data().binaries[str(binary)]
-        data = bytearray(self.get_binary(binary))
-        modify_cb(data)
-        set_binary_in_rom_ppmdu(self._rom, binary, data)
-        self.force_mark_as_modified()
+            binary = self.get_static_data().binaries[str(binary)]
+        return binary
 
     def init_patch_properties(self):
         """ Initialize patch-specific properties of the rom. """
@@ -378,3 +742,13 @@ class RomProject:
                 FileType.COMMON_AT.disallow(CommonAtType.ATUPX)
         except NotImplementedError:
             FileType.COMMON_AT.disallow(CommonAtType.ATUPX)
+
+
+def _idle_add(callback):
+    """Run the callback on the main loop. Only used with the UI, headless projects never import Gtk."""
+    from gi.repository import GLib
+    GLib.idle_add(callback)
+
+
+def _type_name(t: type) -> str:
+    return f'{t.__module__}.{t.__qualname__}'
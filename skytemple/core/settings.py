@@ -19,6 +19,7 @@ import logging
 import os
 from typing import Optional, Tuple, List
 
+from skytemple.core.task_scheduler import DEFAULT_THREAD_WORKERS
 from skytemple_files.common.project_file_manager import ProjectFileManager
 from skytemple_files.common.util import open_utf8
 
@@ -37,6 +38,14 @@ KEY_RECENT_5 = 'file5'
 
 KEY_ASSISTANT_SHOWN = 'assistant_shown'
 KEY_GTK_THEME = 'gtk_theme'
+KEY_DEFERRED_MODULE_LOADING = 'deferred_module_loading'
+KEY_MEMORY_MAPPED_ROM = 'memory_mapped_rom'
+KEY_MODEL_CACHE_BUDGET_MB = 'model_cache_budget_mb'
+KEY_MODEL_DISK_CACHE_SIZE_MB = 'model_disk_cache_size_mb'
+KEY_PROFILE_MEMORY = 'profile_memory'
+KEY_VIEW_POOL_SIZE = 'view_pool_size'
+KEY_TASK_WORKER_THREADS = 'task_worker_threads'
+KEY_MAIN_LOOP_STALL_THRESHOLD_MS = 'main_loop_stall_threshold_ms'
 
 KEY_WINDOW_SIZE_X = 'width'
 KEY_WINDOW_SIZE_Y = 'height'
@@ -116,6 +125,102 @@ class SkyTempleSettingsStore:
         self._save()
 
 
+    def get_deferred_module_loading(self) -> bool:
+        if SECT_GENERAL in self.loaded_config:
+            if KEY_DEFERRED_MODULE_LOADING in self.loaded_config[SECT_GENERAL]:
+                return int(self.loaded_config[SECT_GENERAL][KEY_DEFERRED_MODULE_LOADING]) > 0
+        return True  # default is enabled.
+
+    def set_deferred_module_loading(self, value: bool):
+        if SECT_GENERAL not in self.loaded_config:
+            self.loaded_config[SECT_GENERAL] = {}
+        self.loaded_config[SECT_GENERAL][KEY_DEFERRED_MODULE_LOADING] = '1' if value else '0'
+        self._save()
+
+    def get_memory_mapped_rom(self) -> bool:
+        if SECT_GENERAL in self.loaded_config:
+            if KEY_MEMORY_MAPPED_ROM in self.loaded_config[SECT_GENERAL]:
+                return int(self.loaded_config[SECT_GENERAL][KEY_MEMORY_MAPPED_ROM]) > 0
+        return False  # default is disabled.
+
+    def set_memory_mapped_rom(self, value: bool):
+        if SECT_GENERAL not in self.loaded_config:
+            self.loaded_config[SECT_GENERAL] = {}
+        self.loaded_config[SECT_GENERAL][KEY_MEMORY_MAPPED_ROM] = '1' if value else '0'
+        self._save()
+
+    def get_model_cache_budget_mb(self) -> int:
+        if SECT_GENERAL in self.loaded_config:
+            if KEY_MODEL_CACHE_BUDGET_MB in self.loaded_config[SECT_GENERAL]:
+                return int(self.loaded_config[SECT_GENERAL][KEY_MODEL_CACHE_BUDGET_MB])
+        return 256
+
+    def set_model_cache_budget_mb(self, value: int):
+        if SECT_GENERAL not in self.loaded_config:
+            self.loaded_config[SECT_GENERAL] = {}
+        self.loaded_config[SECT_GENERAL][KEY_MODEL_CACHE_BUDGET_MB] = str(value)
+        self._save()
+
+    def get_model_disk_cache_size_mb(self) -> int:
+        if SECT_GENERAL in self.loaded_config:
+            if KEY_MODEL_DISK_CACHE_SIZE_MB in self.loaded_config[SECT_GENERAL]:
+                return int(self.loaded_config[SECT_GENERAL][KEY_MODEL_DISK_CACHE_SIZE_MB])
+        return 512  # 0 disables the cache.
+
+    def set_model_disk_cache_size_mb(self, value: int):
+        if SECT_GENERAL not in self.loaded_config:
+            self.loaded_config[SECT_GENERAL] = {}
+        self.loaded_config[SECT_GENERAL][KEY_MODEL_DISK_CACHE_SIZE_MB] = str(value)
+        self._save()
+
+    def get_view_pool_size(self) -> int:
+        if SECT_GENERAL in self.loaded_config:
+            if KEY_VIEW_POOL_SIZE in self.loaded_config[SECT_GENERAL]:
+                return int(self.loaded_config[SECT_GENERAL][KEY_VIEW_POOL_SIZE])
+        return 8  # 0 disables the pool.
+
+    def set_view_pool_size(self, value: int):
+        if SECT_GENERAL not in self.loaded_config:
+            self.loaded_config[SECT_GENERAL] = {}
+        self.loaded_config[SECT_GENERAL][KEY_VIEW_POOL_SIZE] = str(value)
+        self._save()
+
+    def get_task_worker_threads(self) -> int:
+        if SECT_GENERAL in self.loaded_config:
+            if KEY_TASK_WORKER_THREADS in self.loaded_config[SECT_GENERAL]:
+                return int(self.loaded_config[SECT_GENERAL][KEY_TASK_WORKER_THREADS])
+        return DEFAULT_THREAD_WORKERS
+
+    def set_task_worker_threads(self, value: int):
+        if SECT_GENERAL not in self.loaded_config:
+            self.loaded_config[SECT_GENERAL] = {}
+        self.loaded_config[SECT_GENERAL][KEY_TASK_WORKER_THREADS] = str(value)
+        self._save()
+
+    def get_main_loop_stall_threshold_ms(self) -> int:
+        if SECT_GENERAL in self.loaded_config:
+            if KEY_MAIN_LOOP_STALL_THRESHOLD_MS in self.loaded_config[SECT_GENERAL]:
+                return int(self.loaded_config[SECT_GENERAL][KEY_MAIN_LOOP_STALL_THRESHOLD_MS])
+        return 250  # 0 disables the watchdog.
+
+    def set_main_loop_stall_threshold_ms(self, value: int):
+        if SECT_GENERAL not in self.loaded_config:
+            self.loaded_config[SECT_GENERAL] = {}
+        self.loaded_config[SECT_GENERAL][KEY_MAIN_LOOP_STALL_THRESHOLD_MS] = str(value)
+        self._save()
+
+    def get_profile_memory(self) -> bool:
+        if SECT_GENERAL in self.loaded_config:
+            if KEY_PROFILE_MEMORY in self.loaded_config[SECT_GENERAL]:
+                return int(self.loaded_config[SECT_GENERAL][KEY_PROFILE_MEMORY]) > 0
+        return False  # default is disabled, tracing memory slows everything down.
+
+    def set_profile_memory(self, value: bool):
+        if SECT_GENERAL not in self.loaded_config:
+            self.loaded_config[SECT_GENERAL] = {}
+        self.loaded_config[SECT_GENERAL][KEY_PROFILE_MEMORY] = '1' if value else '0'
+        self._save()
+
     def get_window_size(self) -> Optional[Tuple[int, int]]:
         if SECT_WINDOW in self.loaded_config:
             if KEY_WINDOW_SIZE_X in self.loaded_config[SECT_WINDOW] and KEY_WINDOW_SIZE_Y in self.loaded_config[SECT_WINDOW]:
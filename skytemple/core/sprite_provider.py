@@ -30,8 +30,8 @@ from gi.repository import Gdk, Gtk, GdkPixbuf
 
 from skytemple.core.img_utils import pil_to_cairo_surface
 from skytemple.core.model_context import ModelContext
+from skytemple.core.task_scheduler import TaskScheduler, TaskPriority
 from skytemple.core.ui_utils import data_dir
-from skytemple_files.common.task_runner import AsyncTaskRunner
 from skytemple_files.common.types.file_types import FileType
 from skytemple_files.common.util import MONSTER_MD, MONSTER_BIN, open_utf8
 from skytemple_files.container.bin_pack.model import BinPack
@@ -113,7 +113,7 @@ FILE_NAME_STANDIN_SPRITES = '.standin_sprites.json'
 class SpriteProvider:
     """
     SpriteProvider. This class renders sprites using Threads. If a Sprite is requested, a loading icon
-    is returned instead, until it is loaded by the AsyncTaskRunner.
+    is returned instead, until it is loaded by the TaskScheduler.
     """
     def __init__(self, project: 'RomProject'):
         self._project = project
@@ -222,9 +222,12 @@ class SpriteProvider:
         return self.get_loader()
 
     def _load_actor_placeholder(self, actor_id, direction_id: int, after_load_cb):
-        AsyncTaskRunner.instance().run_task(self._load_actor_placeholder__impl(actor_id, direction_id, after_load_cb))
+        TaskScheduler.instance().run(
+            TaskPriority.VISIBLE, self._load_actor_placeholder__impl, actor_id, direction_id, after_load_cb,
+            category='sprite.actor_placeholder', item=f'{actor_id}/{direction_id}'
+        )
 
-    async def _load_actor_placeholder__impl(self, actor_id, direction_id: int, after_load_cb):
+    def _load_actor_placeholder__impl(self, actor_id, direction_id: int, after_load_cb):
         md_index = FALLBACK_STANDIN_ENTITIY
         if actor_id in self.get_standin_entities():
             md_index = self.get_standin_entities()[actor_id]
@@ -268,9 +271,12 @@ class SpriteProvider:
         after_load_cb()
 
     def _load_monster(self, md_index, direction_id: int, after_load_cb):
-        AsyncTaskRunner.instance().run_task(self._load_monster__impl(md_index, direction_id, after_load_cb))
+        TaskScheduler.instance().run(
+            TaskPriority.VISIBLE, self._load_monster__impl, md_index, direction_id, after_load_cb,
+            category='sprite.monster', item=f'{md_index}/{direction_id}'
+        )
 
-    async def _load_monster__impl(self, md_index, direction_id: int, after_load_cb):
+    def _load_monster__impl(self, md_index, direction_id: int, after_load_cb):
         try:
             pil_img, cx, cy, w, h = self._retrieve_monster_sprite(md_index, direction_id)
             surf = pil_to_cairo_surface(pil_img)
@@ -283,9 +289,12 @@ class SpriteProvider:
         after_load_cb()
 
     def _load_monster_outline(self, md_index, direction_id: int, after_load_cb):
-        AsyncTaskRunner.instance().run_task(self._load_monster_outline__impl(md_index, direction_id, after_load_cb))
+        TaskScheduler.instance().run(
+            TaskPriority.VISIBLE, self._load_monster_outline__impl, md_index, direction_id, after_load_cb,
+            category='sprite.monster_outline', item=f'{md_index}/{direction_id}'
+        )
 
-    async def _load_monster_outline__impl(self, md_index, direction_id: int, after_load_cb):
+    def _load_monster_outline__impl(self, md_index, direction_id: int, after_load_cb):
         try:
             sprite_img, cx, cy, w, h = self._retrieve_monster_sprite(md_index, direction_id)
 
@@ -309,11 +318,11 @@ class SpriteProvider:
 
     def _retrieve_monster_sprite(self, md_index, direction_id: int) -> Tuple[Image.Image, int, int, int, int]:
         try:
-            with self._monster_md as monster_md:
+            with self._monster_md.read() as monster_md:
                 actor_sprite_id = monster_md[md_index].sprite_index
             if actor_sprite_id < 0:
                 raise ValueError("Invalid Sprite index")
-            with self._monster_bin as monster_bin:
+            with self._monster_bin.read() as monster_bin:
                 sprite = self._load_sprite_from_bin_pack(monster_bin, actor_sprite_id)
 
                 ani_group = sprite.get_animations_for_group(sprite.anim_groups[0])
@@ -328,11 +337,14 @@ class SpriteProvider:
             raise RuntimeError(f"Error loading monster sprite for {md_index}") from e
 
     def _load_object(self, name, after_load_cb):
-        AsyncTaskRunner.instance().run_task(self._load_object__impl(name, after_load_cb))
+        TaskScheduler.instance().run(
+            TaskPriority.VISIBLE, self._load_object__impl, name, after_load_cb,
+            category='sprite.object', item=name
+        )
 
-    async def _load_object__impl(self, name, after_load_cb):
+    def _load_object__impl(self, name, after_load_cb):
         try:
-            with self._load_sprite_from_rom(f'GROUND/{name}.wan') as sprite:
+            with self._load_sprite_from_rom(f'GROUND/{name}.wan').read() as sprite:
                 ani_group = sprite.get_animations_for_group(sprite.anim_groups[0])
                 frame_id = 0
                 mfg_id = ani_group[frame_id].frames[0].frame_id
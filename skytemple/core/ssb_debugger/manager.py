@@ -15,23 +15,28 @@
 #
 #  You should have received a copy of the GNU General Public License
 #  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
 
 from gi.repository import Gtk
 
+from skytemple.core.lazy_import import lazy_import
 from skytemple.core.rom_project import RomProject
-from skytemple.core.ssb_debugger.context import SkyTempleMainDebuggerControlContext
-from skytemple_ssb_debugger.controller.main import MainController as DebuggerMainController
-from skytemple_ssb_debugger.emulator_thread import EmulatorThread
-from skytemple_ssb_debugger.main import get_debugger_builder
-from skytemple_ssb_debugger.threadsafe import threadsafe_emu
+
+# The debugger (and the emulator) are only loaded, once the debugger is opened.
+debugger_context = lazy_import('skytemple.core.ssb_debugger.context')
+debugger_controller = lazy_import('skytemple_ssb_debugger.controller.main')
+debugger_main = lazy_import('skytemple_ssb_debugger.main')
+emulator_thread = lazy_import('skytemple_ssb_debugger.emulator_thread')
+if TYPE_CHECKING:
+    from skytemple.core.ssb_debugger.context import SkyTempleMainDebuggerControlContext
+    from skytemple_ssb_debugger.controller.main import MainController as DebuggerMainController
 
 
 class DebuggerManager:
     def __init__(self):
-        self._context: Optional[SkyTempleMainDebuggerControlContext] = None
+        self._context: Optional['SkyTempleMainDebuggerControlContext'] = None
         self._opened_main_window: Optional[Gtk.Window] = None
-        self._opened_main_controller: Optional[DebuggerMainController] = None
+        self._opened_main_controller: Optional['DebuggerMainController'] = None
         self._was_opened_once = False
         self.main_window = None
 
@@ -39,13 +44,13 @@ class DebuggerManager:
         """Open the debugger (if not already opened) and focus it's UI."""
         if not self.is_opened():
             self._was_opened_once = True
-            self._context = SkyTempleMainDebuggerControlContext(self)
-            builder = get_debugger_builder()
+            self._context = debugger_context.SkyTempleMainDebuggerControlContext(self)
+            builder = debugger_main.get_debugger_builder()
             self._opened_main_window: Gtk.Window = builder.get_object("main_window")
             self._opened_main_window.set_role("SkyTemple Script Engine Debugger")
             self._opened_main_window.set_title("SkyTemple Script Engine Debugger")
 
-            self._opened_main_controller = DebuggerMainController(
+            self._opened_main_controller = debugger_controller.MainController(
                 builder, self._opened_main_window, self._context
             )
             self.handle_project_change()
@@ -71,10 +76,10 @@ class DebuggerManager:
     def destroy(self):
         """Free resources."""
         if self._was_opened_once:
-            emu_instance = EmulatorThread.instance()
+            emu_instance = emulator_thread.EmulatorThread.instance()
             if emu_instance is not None:
                 emu_instance.end()
-            EmulatorThread.destroy_lib()
+            emulator_thread.EmulatorThread.destroy_lib()
 
     def is_opened(self):
         """Returns whether or not the debugger is opened."""
@@ -99,7 +104,7 @@ class DebuggerManager:
         self.open(main_window)
         self._opened_main_controller.editor_notebook.open_ssb(ssb_filename)
 
-    def get_context(self) -> Optional[SkyTempleMainDebuggerControlContext]:
+    def get_context(self) -> Optional['SkyTempleMainDebuggerControlContext']:
         """Returns the managing context for the debugger. Returns None if the debugger is not opened!"""
         return self._context
 
@@ -121,7 +126,7 @@ class DebuggerManager:
         self._opened_main_window = None
         self._opened_main_controller = None
 
-    def get_controller(self) -> Optional[DebuggerMainController]:
+    def get_controller(self) -> Optional['DebuggerMainController']:
         return self._opened_main_controller
 
     def get_window(self) -> Optional[Gtk.Window]:
@@ -15,18 +15,23 @@
 #
 #  You should have received a copy of the GNU General Public License
 #  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
 
 from skytemple_files.common.types.data_handler import DataHandler
 from skytemple_files.common.types.file_types import FileType
 from skytemple_files.script.ssb.handler import SsbHandler
-from skytemple_ssb_debugger.model.ssb_files.file import SsbLoadedFile
-from skytemple_ssb_debugger.model.ssb_files.file_manager import SsbFileManager
+
+if TYPE_CHECKING:
+    from skytemple_ssb_debugger.model.ssb_files.file import SsbLoadedFile
 
 
 class SsbLoadedFileHandler(DataHandler['SsbLoadedFile']):
     @classmethod
     def deserialize(cls, data: bytes, *, filename, static_data, project_fm, **kwargs) -> 'SsbLoadedFile':
+        # The debugger is only imported once scripts are actually opened. This may run on any thread,
+        # so this is a regular import and not skytemple.core.lazy_import.
+        from skytemple_ssb_debugger.model.ssb_files.file import SsbLoadedFile
+        from skytemple_ssb_debugger.model.ssb_files.file_manager import SsbFileManager
         f = SsbLoadedFile(
             filename, FileType.SSB.deserialize(data, static_data),
             None, project_fm
@@ -39,7 +44,7 @@ class SsbLoadedFileHandler(DataHandler['SsbLoadedFile']):
         return FileType.SSB.serialize(data.ssb_model, static_data)
 
     @classmethod
-    def create(cls, filename, static_data, project_fm) -> SsbLoadedFile:
+    def create(cls, filename, static_data, project_fm) -> 'SsbLoadedFile':
         """Create a new empty Ssb + SsbLoadedFile"""
 
         return cls.deserialize(FileType.SSB.serialize(SsbHandler.create(static_data), static_data),
@@ -86,7 +86,7 @@ class StringProvider:
 
     @property
     def _static_data(self):
-        return self.project.get_rom_module().get_static_data()
+        return self.project.get_static_data()
 
     def get_value(self, string_type: StringType, index: int, language: LanguageLike = None) -> str:
         """
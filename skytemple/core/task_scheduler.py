@@ -0,0 +1,247 @@
+"""Runs tasks in the background, by priority, on a pool of threads or worker processes."""
+#  Copyright 2020-2021 Parakoopa and the SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+#
+#  This module must not import Gtk, it is imported by the worker processes.
+import heapq
+import itertools
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from enum import IntEnum
+from typing import Optional, Callable, List, NamedTuple, Set, Tuple
+
+from skytemple.core.task_stats import TaskStats
+from skytemple.core.view_load_token import set_current_view_load_token
+
+logger = logging.getLogger(__name__)
+DEFAULT_THREAD_WORKERS = 2
+MAX_PROCESS_WORKERS = 4
+
+
+class TaskPriority(IntEnum):
+    """Tasks with a lower value are started first. Tasks of the same priority are started in order."""
+    # Work the user is waiting for: Loading views, opening and saving the ROM.
+    INTERACTIVE = 0
+    # Content that is currently visible, eg. sprites and portraits shown in a view.
+    VISIBLE = 1
+    # Work nobody is waiting for yet, eg. prefetching and autosaving.
+    BACKGROUND = 2
+
+
+class TaskScheduler:
+    """
+    Runs tasks on a pool of threads, ordered by priority, and CPU heavy functions in worker processes.
+    Tasks are tagged with a category (eg. 'view_load') and optionally the item they work on. How long they wait
+    and run is recorded in ``stats``.
+
+    Tasks run concurrently with each other, so they may only share models through a ModelContext (see
+    RomProject.open_file_in_rom) or their own locking. Tasks with the same ``serial`` key are run one after the
+    other, eg. all tasks creating controllers. Exclusive tasks (opening and saving the ROM) wait until all
+    running tasks are done and no other task is started until they are finished. A worker only takes a task
+    from the queue once it can be started, so waiting tasks never block a worker.
+    """
+    _instance: Optional['TaskScheduler'] = None
+
+    @classmethod
+    def instance(cls) -> 'TaskScheduler':
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    @classmethod
+    def start(cls, thread_workers: int) -> 'TaskScheduler':
+        """Create the scheduler with the given number of worker threads. Must be called before instance."""
+        if cls._instance is None:
+            cls._instance = cls(thread_workers)
+        return cls._instance
+
+    @classmethod
+    def end(cls):
+        if cls._instance:
+            cls._instance.shutdown()
+            cls._instance = None
+
+    def __init__(self, thread_workers: int = DEFAULT_THREAD_WORKERS):
+        self._sequence = itertools.count()
+        self.stats = TaskStats()
+        # Guards the queue and the state of the running tasks. Idle workers wait on it.
+        self._condition = threading.Condition()
+        # Heap of (priority, sequence, task or None to stop a worker)
+        self._queue: List[Tuple[int, int, Optional[_Task]]] = []
+        self._running_shared = 0
+        self._running_exclusive = False
+        self._running_serial: Set[str] = set()
+        self._process_executor: Optional[ProcessPoolExecutor] = None
+        self._process_executor_lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        for i in range(max(1, thread_workers)):
+            thread = threading.Thread(target=self._work, name=f'TaskScheduler-{i}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    @property
+    def thread_workers(self) -> int:
+        return len(self._threads)
+
+    def run(self, priority: TaskPriority, fn: Callable, *args,
+            category: str = 'task', item: Optional[str] = None, exclusive=False, serial: Optional[str] = None,
+            **kwargs) -> Future:
+        """
+        Run fn(*args, **kwargs) on a worker thread. Returns a future for the result.
+        Exceptions are logged, if the future is not used.
+        """
+        future: Future = Future()
+        task = _Task(future, fn, args, kwargs, category, item, priority, exclusive, serial, self.stats.now())
+        self.stats.task_queued(category)
+        self._put(priority, task)
+        return future
+
+    def run_delayed(self, delay: float, priority: TaskPriority, fn: Callable, *args, **kwargs):
+        """Like run, but the task is only queued after delay seconds."""
+        timer = threading.Timer(delay, lambda: self.run(priority, fn, *args, **kwargs))
+        timer.daemon = True
+        timer.start()
+
+    def run_in_process(self, fn: Callable, *args, category: str = 'process', item: Optional[str] = None) -> Future:
+        """
+        Run fn(*args) in a worker process. fn and the arguments must be picklable. Intended for CPU heavy
+        work, that doesn't need any state of the UI process, eg. decoding and compressing data.
+        The recorded run time includes the time waiting for a free worker process.
+        """
+        with self._process_executor_lock:
+            if self._process_executor is None:
+                self._process_executor = _create_process_executor()
+            self.stats.task_queued(category)
+            task_id = self.stats.task_started(category, item, -1, self.stats.now())
+            future = self._process_executor.submit(fn, *args)
+        future.add_done_callback(
+            lambda f: self.stats.task_finished(task_id, f.cancelled() or f.exception() is not None)
+        )
+        return future
+
+    def shutdown(self):
+        for _ in self._threads:
+            # Sorted after all other tasks, so that the workers end once the queue is processed.
+            self._put(len(TaskPriority), None)
+        with self._process_executor_lock:
+            if self._process_executor is not None:
+                self._process_executor.shutdown(wait=False)
+                self._process_executor = None
+
+    def _put(self, priority: int, task: Optional['_Task']):
+        with self._condition:
+            heapq.heappush(self._queue, (priority, next(self._sequence), task))
+            self._condition.notify()
+
+    def _work(self):
+        while True:
+            task = self._take()
+            if task is None:
+                return
+            if not task.future.set_running_or_notify_cancel():
+                self._release(task)
+                self.stats.task_cancelled(task.category)
+                continue
+            task_id = None
+            try:
+                task_id = self.stats.task_started(task.category, task.item, task.priority, task.queued_at)
+                result = task.fn(*task.args, **task.kwargs)
+            except BaseException as ex:
+                logger.error(f"Uncaught exception in task {task.category} ({task.item}).", exc_info=ex)
+                if task_id is not None:
+                    self.stats.task_finished(task_id, True)
+                task.future.set_exception(ex)
+            else:
+                self.stats.task_finished(task_id, False)
+                task.future.set_result(result)
+            finally:
+                self._release(task)
+                # The token of a view load must not leak into the next task of this worker.
+                set_current_view_load_token(None)
+
+    def _take(self) -> Optional['_Task']:
+        """Waits for the first task that can be started and marks it as running. Returns None to stop the worker."""
+        with self._condition:
+            entry = self._startable()
+            while entry is None:
+                self._condition.wait()
+                entry = self._startable()
+            self._queue.remove(entry)
+            heapq.heapify(self._queue)
+            task = entry[2]
+            if task is not None:
+                if task.exclusive:
+                    self._running_exclusive = True
+                else:
+                    self._running_shared += 1
+                if task.serial is not None:
+                    self._running_serial.add(task.serial)
+            return task
+
+    def _startable(self) -> Optional[Tuple[int, int, Optional['_Task']]]:
+        if self._running_exclusive:
+            return None
+        skipped = False
+        for entry in sorted(self._queue):
+            task = entry[2]
+            if task is None:
+                # Workers only stop, once no task is left for them.
+                return entry if not skipped else None
+            if task.exclusive:
+                # Tasks queued after an exclusive task wait for it, so that it is not starved.
+                return entry if self._running_shared == 0 else None
+            if task.serial is not None and task.serial in self._running_serial:
+                skipped = True
+                continue
+            return entry
+        return None
+
+    def _release(self, task: '_Task'):
+        with self._condition:
+            if task.exclusive:
+                self._running_exclusive = False
+            else:
+                self._running_shared -= 1
+            if task.serial is not None:
+                self._running_serial.discard(task.serial)
+            self._condition.notify_all()
+
+
+class _Task(NamedTuple):
+    future: Future
+    fn: Callable
+    args: tuple
+    kwargs: dict
+    category: str
+    item: Optional[str]
+    priority: int
+    exclusive: bool
+    serial: Optional[str]
+    # See TaskStats.now
+    queued_at: float
+
+
+def _create_process_executor() -> ProcessPoolExecutor:
+    max_workers = min(MAX_PROCESS_WORKERS, os.cpu_count() or 1)
+    try:
+        # Spawn instead of fork: The UI process has running threads (and Gtk) that must not be forked.
+        return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'))
+    except TypeError:  # < Python 3.7
+        return ProcessPoolExecutor(max_workers=max_workers)
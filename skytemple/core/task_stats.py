@@ -0,0 +1,199 @@
+"""Statistics about the tasks run by the TaskScheduler."""
+#  Copyright 2020-2021 Parakoopa and the SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+import bisect
+import datetime
+import itertools
+import json
+import threading
+import time
+from collections import deque
+from typing import Optional, Dict, List, NamedTuple
+
+# Upper bounds of the histogram buckets, in seconds. The last bucket contains everything above.
+HISTOGRAM_BOUNDS = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0, 10.0)
+# Number of finished tasks, that are kept for the report.
+RECENT_TASKS = 200
+
+
+class Histogram:
+    """Counts durations in exponentially growing buckets (see HISTOGRAM_BOUNDS). Not threadsafe."""
+    def __init__(self):
+        self.buckets = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, duration: float):
+        self.buckets[bisect.bisect_left(HISTOGRAM_BOUNDS, duration)] += 1
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+
+    def percentile(self, p: float) -> float:
+        """Returns an upper bound for the p-th percentile (0-100): The upper bound of its bucket."""
+        if self.count < 1:
+            return 0.0
+        rank = p / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank and n > 0:
+                return min(HISTOGRAM_BOUNDS[i], self.max) if i < len(HISTOGRAM_BOUNDS) else self.max
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {
+            'count': self.count, 'total': self.total, 'max': self.max,
+            'p50': self.percentile(50), 'p95': self.percentile(95),
+            'buckets': {
+                (f'<={bound}' if i < len(HISTOGRAM_BOUNDS) else f'>{HISTOGRAM_BOUNDS[-1]}'): n
+                for i, (bound, n) in enumerate(zip(HISTOGRAM_BOUNDS + (None,), self.buckets))
+            }
+        }
+
+
+class CategoryStats:
+    """Counters and histograms of all tasks of one category."""
+    def __init__(self):
+        self.queued = 0
+        self.running = 0
+        self.finished = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.wait = Histogram()
+        self.run = Histogram()
+
+    def to_dict(self) -> dict:
+        return {
+            'queued': self.queued, 'running': self.running, 'finished': self.finished,
+            'failed': self.failed, 'cancelled': self.cancelled,
+            'wait': self.wait.to_dict(), 'run': self.run.to_dict()
+        }
+
+
+class TaskRecord(NamedTuple):
+    category: str
+    item: Optional[str]
+    priority: int
+    thread: str
+    # Seconds since the statistics were started.
+    queued_at: float
+    wait: float
+    # None, while the task is still running.
+    run: Optional[float]
+    failed: bool
+
+
+class TaskStats:
+    """
+    Records how long tasks waited in the queue and how long they ran, by category. Keeps the running tasks and
+    the last finished ones, to find out which tasks block the others. Threadsafe.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+        self.started = datetime.datetime.now()
+        self._categories: Dict[str, CategoryStats] = {}
+        self._ids = itertools.count()
+        self._running: Dict[int, TaskRecord] = {}
+        self._recent: 'deque[TaskRecord]' = deque(maxlen=RECENT_TASKS)
+
+    def now(self) -> float:
+        return time.perf_counter() - self._start
+
+    def task_queued(self, category: str):
+        with self._lock:
+            self._category(category).queued += 1
+
+    def task_cancelled(self, category: str):
+        with self._lock:
+            stats = self._category(category)
+            stats.queued -= 1
+            stats.cancelled += 1
+
+    def task_started(self, category: str, item: Optional[str], priority: int, queued_at: float) -> int:
+        """Returns an id to pass to task_finished."""
+        wait = self.now() - queued_at
+        with self._lock:
+            stats = self._category(category)
+            stats.queued -= 1
+            stats.running += 1
+            stats.wait.add(wait)
+            task_id = next(self._ids)
+            self._running[task_id] = TaskRecord(
+                category, item, priority, threading.current_thread().name, queued_at, wait, None, False
+            )
+        return task_id
+
+    def task_finished(self, task_id: int, failed: bool):
+        with self._lock:
+            record = self._running.pop(task_id)
+            run = self.now() - record.queued_at - record.wait
+            stats = self._category(record.category)
+            stats.running -= 1
+            stats.finished += 1
+            if failed:
+                stats.failed += 1
+            stats.run.add(run)
+            self._recent.append(record._replace(run=run, failed=failed))
+
+    def categories(self) -> Dict[str, CategoryStats]:
+        """A snapshot of the statistics of each category."""
+        with self._lock:
+            return {name: _copy_category(stats) for name, stats in self._categories.items()}
+
+    def running(self) -> List[TaskRecord]:
+        """The running tasks, the run time is the time they are running so far."""
+        now = self.now()
+        with self._lock:
+            return [r._replace(run=now - r.queued_at - r.wait) for r in self._running.values()]
+
+    def recent(self) -> List[TaskRecord]:
+        """The last finished tasks, most recent first."""
+        with self._lock:
+            return list(reversed(self._recent))
+
+    def to_dict(self) -> dict:
+        return {
+            'started': self.started.isoformat(),
+            'uptime': self.now(),
+            'categories': {name: stats.to_dict() for name, stats in self.categories().items()},
+            'running': [r._asdict() for r in self.running()],
+            'recent': [r._asdict() for r in self.recent()]
+        }
+
+    def write_report(self, path: str):
+        """Write the statistics as JSON."""
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def _category(self, category: str) -> CategoryStats:
+        if category not in self._categories:
+            self._categories[category] = CategoryStats()
+        return self._categories[category]
+
+
+def _copy_category(stats: CategoryStats) -> CategoryStats:
+    copy = CategoryStats()
+    copy.__dict__.update(stats.__dict__)
+    for name in ('wait', 'run'):
+        histogram = Histogram()
+        histogram.__dict__.update(getattr(stats, name).__dict__)
+        histogram.buckets = list(histogram.buckets)
+        setattr(copy, name, histogram)
+    return copy
@@ -19,11 +19,13 @@ import os
 import pathlib
 import sys
 
-import pkg_resources
 from gi.repository import Gtk
 from gi.repository.Gio import AppInfo
 from gi.repository.Gtk import TreeModelRow
 
+from skytemple.core.metadata import distribution_version
+from skytemple.core.module_controller import DeferredTreeStubController
+
 
 def recursive_up_item_store_mark_as_modified(row: TreeModelRow, modified=True):
     """Starting at the row, move UP the tree and set column 5 (starting at 0) to modified."""
@@ -53,6 +55,32 @@ def recursive_generate_item_store_row_label(row: TreeModelRow):
         recursive_generate_item_store_row_label(child)
 
 
+def add_deferred_tree_stub(item_store: Gtk.TreeStore, parent: Gtk.TreeIter, module) -> Gtk.TreeIter:
+    """
+    Add a placeholder row below parent, for subtrees that are only loaded once they are needed.
+    See AbstractModule.materialize_tree_items.
+    """
+    return item_store.append(parent, [
+        'skytemple-image-loading-symbolic', 'Loading...', module, DeferredTreeStubController, None, False,
+        'Loading...', True
+    ])
+
+
+def remove_deferred_tree_stubs(item_store: Gtk.TreeStore, parent: Gtk.TreeIter):
+    """Remove all placeholder rows directly below parent."""
+    child = item_store.iter_children(parent)
+    while child is not None:
+        nxt = item_store.iter_next(child)
+        if is_deferred_tree_stub(item_store[child]):
+            item_store.remove(child)
+        child = nxt
+
+
+def is_deferred_tree_stub(row: TreeModelRow) -> bool:
+    """Whether or not the row is a placeholder added by add_deferred_tree_stub."""
+    return row[3] == DeferredTreeStubController
+
+
 def add_dialog_file_filters(dialog):
         filter_nds = Gtk.FileFilter()
         filter_nds.set_name("Nintendo DS ROMs (*.nds)")
@@ -121,12 +149,12 @@ def open_dir(directory):
 def version():
     if os.path.exists(os.path.abspath(os.path.join(data_dir(), '..', '..', '.git'))):
         return 'dev'
-    try:
-        return pkg_resources.get_distribution("skytemple").version
-    except pkg_resources.DistributionNotFound:
-        # Try reading from a VERISON file instead
-        version_file = os.path.join(data_dir(), 'VERSION')
-        if os.path.exists(version_file):
-            with open(version_file) as f:
-                return f.read()
-        return 'unknown'
+    installed_version = distribution_version("skytemple")
+    if installed_version is not None:
+        return installed_version
+    # Try reading from a VERISON file instead
+    version_file = os.path.join(data_dir(), 'VERSION')
+    if os.path.exists(version_file):
+        with open(version_file) as f:
+            return f.read()
+    return 'unknown'
@@ -0,0 +1,63 @@
+"""Tokens to cancel loading views, that are not wanted anymore."""
+#  Copyright 2020-2021 Parakoopa and the SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+import threading
+from typing import Optional
+
+
+class ViewLoadCancelled(Exception):
+    """Raised at cancellation points, if the view that is being loaded is not wanted anymore."""
+
+
+class ViewLoadToken:
+    """
+    Identifies one request to load a view. It is cancelled, when the view is not wanted anymore
+    (eg. because another view was selected in the meantime).
+    """
+    def __init__(self, generation: int):
+        self.generation = generation
+        self._cancelled = False
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def cancel(self):
+        self._cancelled = True
+
+    def __repr__(self):
+        return f'ViewLoadToken({self.generation}{", cancelled" if self._cancelled else ""})'
+
+
+# The token of the view loaded on the current thread. The TaskScheduler resets it after each task.
+_current = threading.local()
+
+
+def set_current_view_load_token(token: Optional[ViewLoadToken]):
+    """Sets the token of the view, that is loaded on the current thread (by the current task of the TaskScheduler)."""
+    _current.token = token
+
+
+def check_view_load_cancelled():
+    """
+    A cancellation point: Raises ViewLoadCancelled, if the view that is loaded on the current thread
+    is not wanted anymore. Controllers should call this in long running loops of their constructor.
+    Does nothing outside of view loads.
+    """
+    token = getattr(_current, 'token', None)
+    if token is not None and token.cancelled:
+        raise ViewLoadCancelled(repr(token))
@@ -0,0 +1,97 @@
+"""A pool of the views, that were opened recently, to show them again without loading them."""
+#  Copyright 2020-2021 Parakoopa and the SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+import logging
+from collections import OrderedDict
+from typing import Optional, Callable, NamedTuple, Hashable, Tuple, Type, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from gi.repository.Gtk import Widget
+    from skytemple.core.abstract_module import AbstractModule
+    from skytemple.core.module_controller import AbstractController
+
+logger = logging.getLogger(__name__)
+ViewKey = Tuple['AbstractModule', Type['AbstractController'], Hashable]
+
+
+class CachedView(NamedTuple):
+    controller: 'AbstractController'
+    view: 'Widget'
+    # Modification generation of the files the module of the view uses (see RomProject.get_dependency_generation),
+    # when the view was put into the pool.
+    generation: int
+
+
+class ViewPool:
+    """
+    The controllers and views of the last opened items, by module, controller class and item id.
+    Views in the pool are not destroyed, they are only hidden and can be shown again as they are.
+
+    A view is only taken from the pool, if none of the files its module uses were modified since it was put into the
+    pool. Otherwise it may show outdated data and is discarded. Views that are evicted or discarded are passed to
+    ``on_discard``, which must destroy them. The pool must only be used from the main thread.
+    """
+    def __init__(self, size: int, on_discard: Callable[[CachedView], None]):
+        self.size = size
+        self._on_discard = on_discard
+        # In LRU order (least recently used first).
+        self._entries: 'OrderedDict[ViewKey, CachedView]' = OrderedDict()
+
+    @staticmethod
+    def key(module: 'AbstractModule', controller_class: Type['AbstractController'], item_id) -> Optional[ViewKey]:
+        """Returns the key of a view or None, if the view can not be pooled."""
+        if not getattr(controller_class, 'view_is_reusable', False):
+            return None
+        try:
+            hash(item_id)
+        except TypeError:
+            return None
+        return module, controller_class, item_id
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key: ViewKey):
+        return key in self._entries
+
+    def put(self, key: ViewKey, controller: 'AbstractController', view: 'Widget', generation: int):
+        """Add a view that was just hidden. If the pool is full, the least recently used view is discarded."""
+        if key in self._entries:
+            self._discard(key)
+        self._entries[key] = CachedView(controller, view, generation)
+        while len(self._entries) > self.size:
+            self._discard(next(iter(self._entries)))
+
+    def take(self, key: ViewKey, generation: int) -> Optional[CachedView]:
+        """
+        Removes the view from the pool and returns it. Returns None, if it is not in the pool or the files it uses
+        were modified after it was put into the pool (the generation changed).
+        """
+        if key not in self._entries:
+            return None
+        if self._entries[key].generation != generation:
+            logger.debug(f"Pooled view for {key} is outdated.")
+            self._discard(key)
+            return None
+        return self._entries.pop(key)
+
+    def clear(self):
+        for key in list(self._entries.keys()):
+            self._discard(key)
+
+    def _discard(self, key: ViewKey):
+        self._on_discard(self._entries.pop(key))
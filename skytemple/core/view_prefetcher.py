@@ -0,0 +1,140 @@
+"""Loads the controllers of the items next to the opened item in the background."""
+#  Copyright 2020-2021 Parakoopa and the SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+import logging
+import threading
+from typing import Optional, Dict, Tuple, List, Hashable, Type, TYPE_CHECKING
+
+from skytemple.core.controller_loader import CONTROLLER_SERIAL
+from skytemple.core.task_scheduler import TaskScheduler, TaskPriority
+from skytemple.core.view_load_token import ViewLoadToken, ViewLoadCancelled, set_current_view_load_token
+
+if TYPE_CHECKING:
+    from skytemple.core.abstract_module import AbstractModule
+    from skytemple.core.module_controller import AbstractController
+    from skytemple.core.rom_project import RomProject
+
+logger = logging.getLogger(__name__)
+PrefetchItem = Tuple['AbstractModule', Type['AbstractController'], Hashable]
+# Seconds to wait after an item was opened, before prefetching starts. Skipped when the user keeps switching.
+PREFETCH_DELAY = 0.3
+# Prefetching stops, once the cache of opened models is filled to this share of its budget. Models read
+# for prefetching must never cause models that are in use to be evicted.
+MAX_MODEL_CACHE_SHARE = 0.5
+
+
+class ViewPrefetcher:
+    """
+    Prefetches the items next to the opened item in the background (see AbstractController.prefetch), so that
+    they open faster when the user opens one of them next. Prefetching reads the files of the item into the model
+    cache. If the controller could be created already (which may render its images already), it is kept until the
+    item is opened. Only controllers with ``prefetchable`` set are prefetched.
+
+    Scheduling a new prefetch cancels the previous one and drops all prefetched controllers that are not
+    wanted anymore. A prefetched controller is only used, if the project was not modified since it was created.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Token of the current prefetch. Controllers can stop prefetching early with check_view_load_cancelled.
+        self._token = ViewLoadToken(0)
+        # Item -> (controller or None if only the data was read, project modification generation)
+        self._prefetched: Dict[PrefetchItem, Tuple[Optional['AbstractController'], int]] = {}
+
+    def prefetch(self, project: 'RomProject', items: List[PrefetchItem]):
+        """Prefetch the controllers of the items, in order. Must be called from the main thread."""
+        items = [item for item in items if _can_prefetch(item)]
+        with self._lock:
+            token = self._next_token()
+            for item in list(self._prefetched.keys()):
+                if item not in items:
+                    del self._prefetched[item]
+        if len(items) > 0:
+            TaskScheduler.instance().run_delayed(
+                PREFETCH_DELAY, TaskPriority.BACKGROUND, self._run, project, items, token,
+                category='prefetch', item=_describe(items[0]), serial=CONTROLLER_SERIAL
+            )
+
+    def take(self, item: PrefetchItem, project_generation: int) -> Optional['AbstractController']:
+        """
+        Returns the prefetched controller for the item or None. The controller is removed from the prefetcher.
+        ``project_generation`` is the current modification generation of the project.
+        """
+        if not _can_prefetch(item):
+            return None
+        with self._lock:
+            controller, generation = self._prefetched.pop(item, (None, None))
+        if controller is not None and generation != project_generation:
+            logger.debug(f"Prefetched controller for {item} is outdated.")
+            return None
+        return controller
+
+    def clear(self):
+        """Cancel prefetching and drop all prefetched controllers."""
+        with self._lock:
+            self._next_token()
+            self._prefetched.clear()
+
+    def _next_token(self) -> ViewLoadToken:
+        self._token.cancel()
+        self._token = ViewLoadToken(self._token.generation + 1)
+        return self._token
+
+    def _run(self, project: 'RomProject', items: List[PrefetchItem], token: ViewLoadToken):
+        """Prefetch the first item. The others are prefetched in a new task, so that other tasks can go first."""
+        if token.cancelled or len(items) < 1:
+            return
+        item, remaining = items[0], items[1:]
+        if item not in self._prefetched:
+            stats = project.get_model_cache_stats()
+            if stats.resident_size >= stats.budget * MAX_MODEL_CACHE_SHARE:
+                logger.debug("Model cache is too full for prefetching.")
+                return
+            module, controller_class, item_id = item
+            project_generation = project.get_project_modification_generation()
+            set_current_view_load_token(token)
+            try:
+                with project.track_access(type(module)):
+                    controller = controller_class.prefetch(module, item_id)
+            except ViewLoadCancelled:
+                return
+            except Exception as ex:
+                logger.debug(f"Prefetching {item} failed.", exc_info=ex)
+            else:
+                with self._lock:
+                    if token.cancelled:
+                        return
+                    self._prefetched[item] = (controller, project_generation)
+                logger.debug(f"Prefetched {item}.")
+        if len(remaining) > 0:
+            TaskScheduler.instance().run(
+                TaskPriority.BACKGROUND, self._run, project, remaining, token,
+                category='prefetch', item=_describe(remaining[0]), serial=CONTROLLER_SERIAL
+            )
+
+
+def _can_prefetch(item: PrefetchItem) -> bool:
+    if not getattr(item[1], 'prefetchable', False):
+        return False
+    try:
+        hash(item[2])
+    except TypeError:
+        return False
+    return True
+
+
+def _describe(item: PrefetchItem) -> str:
+    return f'{item[1].__name__} {item[2]}'
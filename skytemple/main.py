@@ -14,11 +14,18 @@
 #
 #  You should have received a copy of the GNU General Public License
 #  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+import os
+
+from skytemple.core.lazy_import import ImportTimer, IMPORT_TIME_ENV
+if os.getenv(IMPORT_TIME_ENV):
+    ImportTimer.install()
+
 from skytemple.core.logger import setup_logging
 setup_logging()
 
+import importlib.util
 import logging
-import os
+import multiprocessing
 import sys
 
 import gi
@@ -27,12 +34,13 @@ gi.require_version('Gtk', '3.0')
 
 from skytemple.core.message_dialog import SkyTempleMessageDialog
 from skytemple.core.events.manager import EventManager
+from skytemple.core.main_loop_watchdog import MainLoopWatchdog
 from skytemple.core.modules import Modules
 from skytemple.core.settings import SkyTempleSettingsStore
+from skytemple.core.task_scheduler import TaskScheduler
 from skytemple.core.ui_utils import data_dir
 from skytemple_files.common.task_runner import AsyncTaskRunner
 from skytemple_icons import icons
-from skytemple_ssb_debugger.main import get_debugger_data_dir
 
 try:
     gi.require_foreign("cairo")
@@ -55,6 +63,8 @@ SKYTEMPLE_LOGLEVEL = logging.INFO
 
 
 def main():
+    # Worker processes (see skytemple.core.model_serialization) need this for frozen builds.
+    multiprocessing.freeze_support()
     # TODO: Gtk.Application: https://python-gtk-3-tutorial.readthedocs.io/en/latest/application.html
     path = os.path.abspath(os.path.dirname(__file__))
 
@@ -83,7 +93,7 @@ def main():
     itheme: Gtk.IconTheme = Gtk.IconTheme.get_default()
     itheme.append_search_path(os.path.abspath(icons()))
     itheme.append_search_path(os.path.abspath(os.path.join(data_dir(), "icons")))
-    itheme.append_search_path(os.path.abspath(os.path.join(get_debugger_data_dir(), "icons")))
+    itheme.append_search_path(os.path.abspath(os.path.join(_debugger_data_dir(), "icons")))
     itheme.rescan_if_needed()
 
     # Load Builder and Window
@@ -106,16 +116,18 @@ def main():
         Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION
     )
 
-    # Load async task runner thread
+    # Load the async task runner thread and the task scheduler. SkyTemple itself only uses the task scheduler, but
+    # dependencies (such as the script debugger of skytemple-ssb-debugger) still run their work on the task runner.
     AsyncTaskRunner.instance()
+    TaskScheduler.start(settings.get_task_worker_threads())
 
     # Init. core events
     event_manager = EventManager.instance()
     if settings.get_integration_discord_enabled():
         try:
-            from skytemple.core.events.impl.discord import DiscordPresence
-            discord_listener = DiscordPresence()
-            event_manager.register_listener(discord_listener)
+            from skytemple.core.events.impl.discord import DiscordPresence, DiscordRpcListener
+            event_manager.register_listener(DiscordRpcListener())
+            event_manager.register_listener(DiscordPresence())
         except BaseException:
             pass
 
@@ -127,10 +139,28 @@ def main():
 
     main_window.present()
     main_window.set_icon_name('skytemple')
+    stall_threshold = settings.get_main_loop_stall_threshold_ms()
+    if stall_threshold > 0:
+        MainLoopWatchdog.start(stall_threshold / 1000)
+    import_timer = ImportTimer.instance()
+    if import_timer is not None:
+        logging.getLogger(__name__).info(import_timer.report())
     try:
         Gtk.main()
     except (KeyboardInterrupt, SystemExit):
         AsyncTaskRunner.end()
+        TaskScheduler.end()
+
+
+def _debugger_data_dir():
+    """
+    The data directory of skytemple-ssb-debugger. The debugger package is only located, not imported:
+    It is big and only imported once the debugger is opened.
+    """
+    if getattr(sys, 'frozen', False):
+        return os.path.join(os.path.dirname(sys.executable), 'skytemple_ssb_debugger', 'data')
+    spec = importlib.util.find_spec('skytemple_ssb_debugger')
+    return os.path.join(list(spec.submodule_search_locations)[0], 'data')
 
 
 def _load_theme(settings: SkyTempleSettingsStore):
@@ -130,6 +130,8 @@ class FloorRanks(Enum):
 
 class FloorController(AbstractController):
     _last_open_tab_id = 0
+    prefetchable = True
+    view_is_reusable = True
     _last_open_tab_item_lists = FloorEditItemList.FLOOR
 
     def __init__(self, module: 'DungeonModule', item: 'FloorViewInfo'):
@@ -139,6 +141,9 @@ class FloorController(AbstractController):
 
         self.builder = None
         self._refresh_timer = None
+        # While the view is in the view pool, the icons are only reloaded once it's shown again.
+        self._hidden = False
+        self._reload_icons_when_shown = False
         self._loading = False
         self._string_provider = module.project.get_string_provider()
         self._sprite_provider = module.project.get_sprite_provider()
@@ -1297,7 +1302,23 @@ class FloorController(AbstractController):
             new_data, GdkPixbuf.Colorspace.RGB, True, 8, w, h, sprite.get_stride()
         )
 
+    def on_view_hidden(self):
+        self._hidden = True
+        if self._refresh_timer is not None:
+            GLib.source_remove(self._refresh_timer)
+            self._refresh_timer = None
+            self._reload_icons_when_shown = True
+
+    def on_view_shown(self):
+        self._hidden = False
+        if self._reload_icons_when_shown:
+            self._reload_icons_when_shown = False
+            self._reload_icons_in_tree()
+
     def _reload_icon(self, entid, idx, was_loading):
+        if self._hidden:
+            self._reload_icons_when_shown = True
+            return
         store: Gtk.Store = self.builder.get_object('monster_spawns_store')
         if not self._loading and not was_loading:
             row = store[idx]
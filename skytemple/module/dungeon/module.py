@@ -29,7 +29,7 @@ from skytemple.core.open_request import OpenRequest, REQUEST_TYPE_DUNGEON_FIXED_
 from skytemple.core.rom_project import RomProject, BinaryName
 from skytemple.core.string_provider import StringType
 from skytemple.core.ui_utils import recursive_up_item_store_mark_as_modified, \
-    recursive_generate_item_store_row_label, data_dir
+    recursive_generate_item_store_row_label, data_dir, add_deferred_tree_stub, remove_deferred_tree_stubs
 from skytemple.module.dungeon import MAX_ITEMS
 from skytemple.module.dungeon.controller.dojos import DOJOS_NAME, DojosController
 from skytemple.module.dungeon.controller.dungeon import DungeonController
@@ -120,19 +120,36 @@ class DungeonModule(AbstractModule):
         self._fixed_floor_root_iter = None
         self._fixed_floor_data: Optional[FixedBin] = None
         self._dungeon_bin: Optional[DungeonBinPack] = None
-        self._cached_dungeon_list = None
+        self._tree_materialized = False
 
-        # Preload mappa
-        self.get_mappa()
+        # The mappa, fixed.bin and dungeon.bin are loaded when the subtrees are materialized.
         self._validator = None
 
     def load_tree_items(self, item_store: TreeStore, root_node):
-        self._validator = DungeonValidator(self.get_mappa().floor_lists)
         root = item_store.append(root_node, [
             ICON_ROOT, DUNGEONS_NAME, self, MainController, 0, False, '', True
         ])
         self._tree_model = item_store
+        self._tree_materialized = False
         self._root_iter = root
+        add_deferred_tree_stub(item_store, root, self)
+
+        # Fixed rooms
+        self._fixed_floor_root_iter = item_store.append(root_node, [
+            ICON_FIXED_ROOMS, FIXED_ROOMS_NAME, self, FixedRoomsController, 0, False, '', True
+        ])
+        add_deferred_tree_stub(item_store, self._fixed_floor_root_iter, self)
+
+        recursive_generate_item_store_row_label(self._tree_model[root])
+        recursive_generate_item_store_row_label(self._tree_model[self._fixed_floor_root_iter])
+
+    def materialize_tree_items(self):
+        if self._tree_materialized or self._tree_model is None:
+            return
+        self._tree_materialized = True
+        item_store = self._tree_model
+        remove_deferred_tree_stubs(item_store, self._root_iter)
+        remove_deferred_tree_stubs(item_store, self._fixed_floor_root_iter)
 
         static_data = self.project.get_rom_module().get_static_data()
         self._fixed_floor_data = self.project.open_file_in_rom(
@@ -144,21 +161,17 @@ class DungeonModule(AbstractModule):
             static_data=static_data
         )
 
-        self._validator.validate(self.get_dungeon_list())
-
+        self.get_validator()
         self._fill_dungeon_tree()
 
         # Fixed rooms
-        self._fixed_floor_root_iter = item_store.append(root_node, [
-            ICON_FIXED_ROOMS, FIXED_ROOMS_NAME, self, FixedRoomsController, 0, False, '', True
-        ])
         for i in range(0, len(self._fixed_floor_data.fixed_floors)):
             self._fixed_floor_iters.append(item_store.append(self._fixed_floor_root_iter, [
                 ICON_FIXED_ROOMS, f'Fixed Room {i}', self, FixedController,
                 i, False, '', True
             ]))
 
-        recursive_generate_item_store_row_label(self._tree_model[root])
+        recursive_generate_item_store_row_label(self._tree_model[self._root_iter])
         recursive_generate_item_store_row_label(self._tree_model[self._fixed_floor_root_iter])
 
     def rebuild_dungeon_tree(self):
@@ -199,6 +212,9 @@ class DungeonModule(AbstractModule):
             return self._fixed_floor_root_iter
 
     def get_validator(self) -> DungeonValidator:
+        if self._validator is None:
+            self._validator = DungeonValidator(self.get_mappa().floor_lists)
+            self._validator.validate(self.get_dungeon_list())
         return self._validator
 
     def get_mappa(self) -> MappaBin:
@@ -233,17 +249,10 @@ class DungeonModule(AbstractModule):
         recursive_up_item_store_mark_as_modified(row)
 
     def get_dungeon_list(self) -> List[DungeonDefinition]:
-        if self._cached_dungeon_list==None:
-            self._cached_dungeon_list = HardcodedDungeons.get_dungeon_list(
-                self.project.get_binary(BinaryName.ARM9), self.project.get_rom_module().get_static_data()
-            )
-        return self._cached_dungeon_list
+        return self.project.get_binary_table(BinaryName.ARM9, HardcodedDungeons.get_dungeon_list)
 
     def get_dungeon_restrictions(self) -> List[DungeonRestriction]:
-        # TODO: Cache?
-        return HardcodedDungeons.get_dungeon_restrictions(
-            self.project.get_binary(BinaryName.ARM9), self.project.get_rom_module().get_static_data()
-        )
+        return self.project.get_binary_table(BinaryName.ARM9, HardcodedDungeons.get_dungeon_restrictions)
 
     def mark_dungeon_as_modified(self, dungeon_id, modified_mappa=True):
         self.project.get_string_provider().mark_as_modified()
@@ -263,7 +272,6 @@ class DungeonModule(AbstractModule):
         self.project.modify_binary(BinaryName.ARM9, lambda binary: HardcodedDungeons.set_dungeon_list(
             dungeons, binary, self.project.get_rom_module().get_static_data()
         ))
-        self._cached_dungeon_list = None
 
     def update_dungeon_restrictions(self, dungeon_id: int, restrictions: DungeonRestriction):
         all_restrictions = self.get_dungeon_restrictions()
@@ -307,7 +315,7 @@ class DungeonModule(AbstractModule):
             self._add_dungeon_to_tree(dojo_root, item_store, i, 0)
 
     def _add_dungeon_to_tree(self, root_node, item_store, idx, previous_floor_id):
-        clazz = DungeonController if idx not in self._validator.invalid_dungeons else InvalidDungeonController
+        clazz = DungeonController if idx not in self.get_validator().invalid_dungeons else InvalidDungeonController
         dungeon_info = DungeonViewInfo(idx, idx < DOJO_DUNGEONS_FIRST)
         self._dungeon_iters[idx] = item_store.append(root_node, [
             ICON_DUNGEON, self.generate_dungeon_label(idx), self, clazz,
@@ -428,7 +436,7 @@ class DungeonModule(AbstractModule):
                     reorder_list.append([])
         
         mappa.floor_lists = new_floor_lists
-        self._validator.floors = new_floor_lists
+        self.get_validator().floors = new_floor_lists
         self.mark_root_as_modified()
         self.save_mappa()
         self.save_dungeon_list(dungeons)
@@ -648,15 +656,14 @@ class DungeonModule(AbstractModule):
             self.project.mark_as_modified(FLOOR_MISSION_FORBIDDEN)
     
     def get_fixed_floor_entity_lists(self) -> Tuple[List[EntitySpawnEntry], List[ItemSpawn], List[MonsterSpawn], List[TileSpawn], List[MonsterSpawnStats]]:
-        config = self.project.get_rom_module().get_static_data()
-        ov29 = self.project.get_binary(BinaryName.OVERLAY_29)
-        ov10 = self.project.get_binary(BinaryName.OVERLAY_10)
         return (
-            HardcodedFixedFloorTables.get_entity_spawn_table(ov29, config),
-            HardcodedFixedFloorTables.get_item_spawn_list(ov29, config),
-            HardcodedFixedFloorTables.get_monster_spawn_list(ov29, config),
-            HardcodedFixedFloorTables.get_tile_spawn_list(ov29, config),
-            HardcodedFixedFloorTables.get_monster_spawn_stats_table(ov10, config),
+            self.project.get_binary_table(BinaryName.OVERLAY_29, HardcodedFixedFloorTables.get_entity_spawn_table),
+            self.project.get_binary_table(BinaryName.OVERLAY_29, HardcodedFixedFloorTables.get_item_spawn_list),
+            self.project.get_binary_table(BinaryName.OVERLAY_29, HardcodedFixedFloorTables.get_monster_spawn_list),
+            self.project.get_binary_table(BinaryName.OVERLAY_29, HardcodedFixedFloorTables.get_tile_spawn_list),
+            self.project.get_binary_table(
+                BinaryName.OVERLAY_10, HardcodedFixedFloorTables.get_monster_spawn_stats_table
+            ),
         )
 
     def save_fixed_floor_entity_lists(self, entities, items, monsters, tiles, stats):
@@ -669,14 +676,15 @@ class DungeonModule(AbstractModule):
             HardcodedFixedFloorTables.set_monster_spawn_list(binary, monsters, config)
             HardcodedFixedFloorTables.set_tile_spawn_list(binary, tiles, config)
 
-        self.project.modify_binary(
-            BinaryName.OVERLAY_29, update_ov29
-        )
-        self.project.modify_binary(
-            BinaryName.OVERLAY_10, lambda binary: HardcodedFixedFloorTables.set_monster_spawn_stats_table(
-                binary, stats, config
+        with self.project.edit_binaries():
+            self.project.modify_binary(
+                BinaryName.OVERLAY_29, update_ov29
+            )
+            self.project.modify_binary(
+                BinaryName.OVERLAY_10, lambda binary: HardcodedFixedFloorTables.set_monster_spawn_stats_table(
+                    binary, stats, config
+                )
             )
-        )
         row = self._tree_model[self._fixed_floor_root_iter]
         recursive_up_item_store_mark_as_modified(row)
 
@@ -696,14 +704,12 @@ class DungeonModule(AbstractModule):
         return 0
 
     def get_fixed_floor_properties(self) -> List[FixedFloorProperties]:
-        ov10 = self.project.get_binary(BinaryName.OVERLAY_10)
-        config = self.project.get_rom_module().get_static_data()
-        return HardcodedFixedFloorTables.get_fixed_floor_properties(ov10, config)
+        return self.project.get_binary_table(
+            BinaryName.OVERLAY_10, HardcodedFixedFloorTables.get_fixed_floor_properties
+        )
 
     def get_fixed_floor_overrides(self) -> List[int]:
-        ov29 = self.project.get_binary(BinaryName.OVERLAY_29)
-        config = self.project.get_rom_module().get_static_data()
-        return HardcodedFixedFloorTables.get_fixed_floor_overrides(ov29, config)
+        return self.project.get_binary_table(BinaryName.OVERLAY_29, HardcodedFixedFloorTables.get_fixed_floor_overrides)
 
     def save_fixed_floor_properties(self, floor_id, new_properties):
         properties = self.get_fixed_floor_properties()
@@ -24,8 +24,8 @@ from typing import TYPE_CHECKING, List
 from gi.repository import Gtk, GLib
 
 from skytemple.controller.main import MainController
+from skytemple.core.task_scheduler import TaskScheduler, TaskPriority
 from skytemple.core.ui_utils import data_dir
-from skytemple_files.common.task_runner import AsyncTaskRunner
 
 if TYPE_CHECKING:
     from skytemple.module.gfxcrunch.module import GfxcrunchModule
@@ -60,7 +60,9 @@ class GfxcrunchController:
     def import_sprite(self, dir_fn: str) -> bytes:
         with tempfile.TemporaryDirectory() as tmp_path:
             tmp_path = os.path.join(tmp_path, 'tmp.wan')
-            AsyncTaskRunner.instance().run_task(self._run_gfxcrunch([dir_fn, tmp_path]))
+            TaskScheduler.instance().run(
+                TaskPriority.INTERACTIVE, self._run_gfxcrunch, [dir_fn, tmp_path], category='gfxcrunch', item=dir_fn
+            )
             self._run_window()
             if self.status == GfxcrunchStatus.SUCCESS:
                 with open(tmp_path, 'rb') as f:
@@ -73,7 +75,9 @@ class GfxcrunchController:
             tmp_path = os.path.join(tmp_path, 'tmp.wan')
             with open(tmp_path, 'wb') as f:
                 f.write(wan)
-            AsyncTaskRunner.instance().run_task(self._run_gfxcrunch([tmp_path, dir_fn]))
+            TaskScheduler.instance().run(
+                TaskPriority.INTERACTIVE, self._run_gfxcrunch, [tmp_path, dir_fn], category='gfxcrunch', item=dir_fn
+            )
             self._run_window()
             if self.status != GfxcrunchStatus.SUCCESS:
                 raise RuntimeError("The gfxcrunch process failed.")
@@ -90,7 +94,7 @@ class GfxcrunchController:
         dialog.run()
         dialog.hide()
 
-    async def _run_gfxcrunch(self, arg_list: List[str]):
+    def _run_gfxcrunch(self, arg_list: List[str]):
         cmd, base_args, shell = self.module.get_gfxcrunch_cmd()
         arg_list = [cmd] + base_args + arg_list
         logger.info(f"Running gfxcrunch: {arg_list}")
@@ -77,10 +77,16 @@ class RankListController(AbstractController):
         except ValueError:
             return
 
-        # item_id:
-        self._list_store[path][4] = item_id
-        # item_name:
-        self._list_store[path][5] = self._item_names[item_id]
+        # Both columns are updated first, the row is then written to the binary once.
+        self._loading = True
+        try:
+            # item_id:
+            self._list_store[path][4] = item_id
+            # item_name:
+            self._list_store[path][5] = self._item_names[item_id]
+        finally:
+            self._loading = False
+        self._save_row(self._list_store, path)
 
     def on_cr_item_awarded_editing_started(self, renderer, editable, path):
         editable.set_completion(self.builder.get_object('completion_items'))
@@ -89,6 +95,9 @@ class RankListController(AbstractController):
         """Propagate changes to list store entries to the lists."""
         if self._loading:
             return
+        self._save_row(store, path)
+
+    def _save_row(self, store, path):
         name_string_id, name_string, points_needed_next, storage_capacity, item_id, item_name, idx = store[path][:]
         self._rank_up_table[idx] = Rank(
             name_string_id, int(points_needed_next), int(storage_capacity), item_id
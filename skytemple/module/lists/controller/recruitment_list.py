@@ -64,12 +64,21 @@ class RecruitmentListController(ListBaseController):
             return
         idx = int(self._list_store[path][0])
 
-        # entid:
-        self._list_store[path][4] = entid
-        # ent_icon:
-        self._list_store[path][3] = self._get_icon(entid, idx, False)
-        # ent_name:
-        self._list_store[path][6] = self._ent_names[entid]
+        # The icon is loaded later, if it is not loaded yet. It must be requested outside of loading, so that it is
+        # put into the row then.
+        icon = self._get_icon(entid, idx, False)
+        # All columns are updated first, the row is then written to the overlay once.
+        self._loading = True
+        try:
+            # entid:
+            self._list_store[path][4] = entid
+            # ent_icon:
+            self._list_store[path][3] = icon
+            # ent_name:
+            self._list_store[path][6] = self._ent_names[entid]
+        finally:
+            self._loading = False
+        self._save_row(self._list_store, path)
 
     def on_cr_location_edited(self, widget, path, text):
         match = PATTERN_LOCATION_ENTRY.match(text)
@@ -80,10 +89,15 @@ class RecruitmentListController(ListBaseController):
         except ValueError:
             return
 
-        # location_id:
-        self._list_store[path][2] = str(location_id)
-        # ent_name:
-        self._list_store[path][5] = self._location_names[location_id]
+        self._loading = True
+        try:
+            # location_id:
+            self._list_store[path][2] = str(location_id)
+            # ent_name:
+            self._list_store[path][5] = self._location_names[location_id]
+        finally:
+            self._loading = False
+        self._save_row(self._list_store, path)
 
     def on_completion_locations_match_selected(self, completion, model, tree_iter):
         pass
@@ -96,6 +110,9 @@ class RecruitmentListController(ListBaseController):
         """Propagate changes to list store entries to the lists."""
         if self._loading:
             return
+        self._save_row(store, path)
+
+    def _save_row(self, store, path):
         a_id, level, location_id, ent_icon, entid, location_name, ent_name = store[path][:]
         a_id = int(a_id)
         self._species[a_id] = int(entid)
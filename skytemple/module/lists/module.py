@@ -138,10 +138,8 @@ class ListsModule(AbstractModule):
 
     def get_starter_default_ids(self) -> Tuple[int, int]:
         """Returns players & partner default starters"""
-        arm9 = self.project.get_binary(BinaryName.ARM9)
-        static_data = self.project.get_rom_module().get_static_data()
-        player = HardcodedDefaultStarters.get_player_md_id(arm9, static_data)
-        partner = HardcodedDefaultStarters.get_partner_md_id(arm9, static_data)
+        player = self.project.get_binary_table(BinaryName.ARM9, HardcodedDefaultStarters.get_player_md_id)
+        partner = self.project.get_binary_table(BinaryName.ARM9, HardcodedDefaultStarters.get_partner_md_id)
         return player, partner
 
     def set_starter_default_ids(self, player, partner):
@@ -157,10 +155,12 @@ class ListsModule(AbstractModule):
     
     def get_starter_ids(self) -> Tuple[List[int], List[int]]:
         """Returns players & partner starters"""
-        ov13 = self.project.get_binary(BinaryName.OVERLAY_13)
-        static_data = self.project.get_rom_module().get_static_data()
-        player = HardcodedPersonalityTestStarters.get_player_md_ids(ov13, static_data)
-        partner = HardcodedPersonalityTestStarters.get_partner_md_ids(ov13, static_data)
+        player = self.project.get_binary_table(
+            BinaryName.OVERLAY_13, HardcodedPersonalityTestStarters.get_player_md_ids
+        )
+        partner = self.project.get_binary_table(
+            BinaryName.OVERLAY_13, HardcodedPersonalityTestStarters.get_partner_md_ids
+        )
         return player, partner
 
     def set_starter_ids(self, player, partner):
@@ -174,9 +174,7 @@ class ListsModule(AbstractModule):
         recursive_up_item_store_mark_as_modified(row)
     
     def get_starter_level_player(self) -> int:
-        arm9 = self.project.get_binary(BinaryName.ARM9)
-        static_data = self.project.get_rom_module().get_static_data()
-        return HardcodedDefaultStarters.get_player_level(arm9, static_data)
+        return self.project.get_binary_table(BinaryName.ARM9, HardcodedDefaultStarters.get_player_level)
 
     def set_starter_level_player(self, level: int):
         def update(arm9):
@@ -188,9 +186,7 @@ class ListsModule(AbstractModule):
         recursive_up_item_store_mark_as_modified(row)
     
     def get_starter_level_partner(self) -> int:
-        arm9 = self.project.get_binary(BinaryName.ARM9)
-        static_data = self.project.get_rom_module().get_static_data()
-        return HardcodedDefaultStarters.get_partner_level(arm9, static_data)
+        return self.project.get_binary_table(BinaryName.ARM9, HardcodedDefaultStarters.get_partner_level)
 
     def set_starter_level_partner(self, level: int):
         def update(arm9):
@@ -203,11 +199,13 @@ class ListsModule(AbstractModule):
 
     def get_recruitment_list(self) -> Tuple[List[int], List[int], List[int]]:
         """Returns the recruitment lists: species, levels, locations"""
-        ov11 = self.project.get_binary(BinaryName.OVERLAY_11)
-        static_data = self.project.get_rom_module().get_static_data()
-        species = HardcodedRecruitmentTables.get_monster_species_list(ov11, static_data)
-        level = HardcodedRecruitmentTables.get_monster_levels_list(ov11, static_data)
-        location = HardcodedRecruitmentTables.get_monster_locations_list(ov11, static_data)
+        species = self.project.get_binary_table(
+            BinaryName.OVERLAY_11, HardcodedRecruitmentTables.get_monster_species_list
+        )
+        level = self.project.get_binary_table(BinaryName.OVERLAY_11, HardcodedRecruitmentTables.get_monster_levels_list)
+        location = self.project.get_binary_table(
+            BinaryName.OVERLAY_11, HardcodedRecruitmentTables.get_monster_locations_list
+        )
         return species, level, location
 
     def set_recruitment_list(self, species, level, location):
@@ -224,10 +222,7 @@ class ListsModule(AbstractModule):
 
     def get_world_map_markers(self) -> List[MapMarkerPlacement]:
         """Returns the world map markers"""
-        arm9bin = self.project.get_binary(BinaryName.ARM9)
-        static_data = self.project.get_rom_module().get_static_data()
-        markers = HardcodedDungeons.get_marker_placements(arm9bin, static_data)
-        return markers
+        return self.project.get_binary_table(BinaryName.ARM9, HardcodedDungeons.get_marker_placements)
 
     def set_world_map_markers(self, markers: List[MapMarkerPlacement]):
         """Sets the world map markers"""
@@ -241,9 +236,7 @@ class ListsModule(AbstractModule):
 
     def get_rank_list(self) -> List[Rank]:
         """Returns the rank up table."""
-        arm9bin = self.project.get_binary(BinaryName.ARM9)
-        static_data = self.project.get_rom_module().get_static_data()
-        return HardcodedRankUpTable.get_rank_up_table(arm9bin, static_data)
+        return self.project.get_binary_table(BinaryName.ARM9, HardcodedRankUpTable.get_rank_up_table)
 
     def set_rank_list(self, values: List[Rank]):
         """Sets the rank up table."""
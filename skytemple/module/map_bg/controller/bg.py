@@ -29,6 +29,7 @@ from skytemple.core.img_utils import pil_to_cairo_surface
 from skytemple.core.message_dialog import SkyTempleMessageDialog
 from skytemple.core.module_controller import AbstractController
 from skytemple.core.open_request import OpenRequest, REQUEST_TYPE_SCENE
+from skytemple.core.view_load_token import check_view_load_cancelled
 from skytemple.module.map_bg.controller.bg_menu import BgMenuController
 from skytemple.module.map_bg.drawer import Drawer, DrawerCellRenderer, DrawerInteraction
 from skytemple_files.common.types.file_types import FileType
@@ -109,6 +110,9 @@ to be (re-)assigned to chunks after the import."""
 
 
 class BgController(AbstractController):
+    prefetchable = True
+    view_is_reusable = True
+
     def __init__(self, module: 'MapBgModule', item_id: int):
         self.module = module
         self.item_id = item_id
@@ -152,6 +156,15 @@ class BgController(AbstractController):
             self.bpc = module.get_bpc(item_id)
             self.bpas = module.get_bpas(item_id)
 
+    @classmethod
+    def prefetch(cls, module: 'MapBgModule', item_id: int):
+        # Creating the controller may copy shared assets, so only the models are read in advance.
+        module.get_bma(item_id)
+        module.get_bpl(item_id)
+        module.get_bpc(item_id)
+        module.get_bpas(item_id)
+        return None
+
     def get_view(self) -> Widget:
         self.builder = self._get_builder(__file__, 'map_bg.glade')
         self.set_warning_palette()
@@ -182,6 +195,18 @@ class BgController(AbstractController):
                 self.module.mark_level_list_as_modified()
         return self.builder.get_object('editor_map_bg')
 
+    def on_view_hidden(self):
+        if self.drawer:
+            self.drawer.pause()
+        if self.current_icon_view_renderer:
+            self.current_icon_view_renderer.pause()
+
+    def on_view_shown(self):
+        if self.drawer:
+            self.drawer.resume()
+        if self.current_icon_view_renderer:
+            self.current_icon_view_renderer.resume()
+
     def on_bg_notebook_switch_page(self, notebook, page, *args):
         self._init_tab(page)
 
@@ -446,6 +471,7 @@ class BgController(AbstractController):
             self.chunks_surfaces.append(chunks_current_layer)
             # For each chunk...
             for chunk_idx in range(0, self.bpc.layers[layer_idx_bpc].chunk_tilemap_len):
+                check_view_load_cancelled()
                 # For each frame of palette animation... ( applicable for this chunk )
                 pal_ani_frames = []
                 chunks_current_layer.append(pal_ani_frames)
@@ -87,6 +87,7 @@ class Drawer:
         self.scale = 1
 
         self.drawing_is_active = False
+        self._tick_source = None
 
     # noinspection PyAttributeOutsideInit
     def reset(self, bma, bpa_durations, pal_ani_durations, chunks_surfaces):
@@ -121,21 +122,35 @@ class Drawer:
         if isinstance(self.draw_area, Gtk.DrawingArea):
             self.draw_area.connect('draw', self.draw)
         self.draw_area.queue_draw()
-        GLib.timeout_add(int(1000 / FPS), self._tick)
+        self._tick_source = GLib.timeout_add(int(1000 / FPS), self._tick)
 
     def stop(self):
         self.drawing_is_active = False
 
+    def pause(self):
+        """Stop the animation, while the DrawingArea is hidden. It is continued with resume."""
+        if self._tick_source is not None:
+            GLib.source_remove(self._tick_source)
+            self._tick_source = None
+
+    def resume(self):
+        if self.drawing_is_active and self._tick_source is None:
+            self._tick_source = GLib.timeout_add(int(1000 / FPS), self._tick)
+
     def _tick(self):
         if self.draw_area is None:
+            self._tick_source = None
             return False
         if self.draw_area is not None and self.draw_area.get_parent() is None:
             # XXX: Gtk doesn't remove the widget on switch sometimes...
             self.draw_area.destroy()
+            self._tick_source = None
             return False
         self.animation_context.advance()
         if EventManager.instance().get_if_main_window_has_fous():
             self.draw_area.queue_draw()
+        if not self.drawing_is_active:
+            self._tick_source = None
         return self.drawing_is_active
 
     def draw(self, wdg, ctx: cairo.Context, do_translates=True):
@@ -24,15 +24,14 @@ import tempfile
 import webbrowser
 from typing import TYPE_CHECKING, Dict, Optional
 
-import cairosvg
 from gi.repository import Gtk, GLib, Gio, GdkPixbuf
 
 from skytemple.controller.main import MainController
 from skytemple.core.error_handler import display_error
+from skytemple.core.lazy_import import lazy_import
 from skytemple.core.module_controller import AbstractController
 from skytemple.core.string_provider import StringType
 from skytemple.core.ui_utils import is_dark_theme
-from skytemple.module.monster.level_up_graph import LevelUpGraphProvider
 from skytemple_files.common.util import open_utf8
 from skytemple_files.data.level_bin_entry.model import LevelBinEntry
 from skytemple_files.data.waza_p.model import WazaP, MoveLearnset, LevelUpMove
@@ -40,6 +39,9 @@ from skytemple_files.data.waza_p.model import WazaP, MoveLearnset, LevelUpMove
 if TYPE_CHECKING:
     from skytemple.module.monster.module import MonsterModule
 logger = logging.getLogger(__name__)
+# Rendering the graph needs pygal and cairosvg, they are only loaded once a graph is shown.
+cairosvg = lazy_import('cairosvg')
+level_up_graph = lazy_import('skytemple.module.monster.level_up_graph')
 MOVE_NAME_PATTERN = re.compile(r'.*\((\d+)\).*')
 CSV_LEVEL = "Level"
 CSV_EXP_POINTS = "Exp. Points"
@@ -489,7 +491,7 @@ class LevelUpController(AbstractController):
             learnset = self._waza_p.learnsets[self.item_id]
         else:
             learnset = MoveLearnset([], [], [])
-        graph_provider = LevelUpGraphProvider(
+        graph_provider = level_up_graph.LevelUpGraphProvider(
             self.module.get_entry(self.item_id), self._level_bin_entry, learnset,
             self._string_provider.get_all(StringType.MOVE_NAMES)
         )
@@ -47,6 +47,7 @@ logger = logging.getLogger(__name__)
 
 class MonsterController(AbstractController):
     _last_open_tab_id = 0
+    prefetchable = True
 
     def __init__(self, module: 'MonsterModule', item_id: int):
         self.module = module
@@ -952,7 +953,7 @@ class MonsterController(AbstractController):
         try:
             if self.entry.sprite_index < 0:
                 return
-            with self._monster_bin as sprites:
+            with self._monster_bin.read() as sprites:
                 sprite_bin = sprites[self.entry.sprite_index]
                 sprite = FileType.WAN.deserialize(FileType.COMMON_AT.deserialize(sprite_bin).decompress())
             sprite_size_table = self.module.get_pokemon_sprite_data_table()
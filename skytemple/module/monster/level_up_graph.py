@@ -15,16 +15,18 @@
 #  You should have received a copy of the GNU General Public License
 #  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
 from functools import partial
-from typing import List, Dict
+from typing import List, Dict, TYPE_CHECKING
 
 import pygal
-from pygal import Graph
 from pygal.style import DarkSolarizedStyle
 
 from skytemple_files.data.level_bin_entry.model import LevelBinEntry, LEVEL_BIN_ENTRY_LEVEL_LEN
 from skytemple_files.data.md.model import MdEntry
 from skytemple_files.data.waza_p.model import MoveLearnset
 
+if TYPE_CHECKING:
+    from pygal import Graph
+
 
 class LevelUpGraphProvider:
     def __init__(self, monster: MdEntry, level_bin_entry: LevelBinEntry,
@@ -34,7 +36,7 @@ class LevelUpGraphProvider:
         self.move_learnset = move_learnset
         self.move_strings = move_strings
 
-    def provide(self, add_title=None, dark=False, disable_xml_declaration=False) -> Graph:
+    def provide(self, add_title=None, dark=False, disable_xml_declaration=False) -> 'Graph':
         chart = pygal.XY(
             xrange=(1, len(self.level_bin_entry.levels) + 1),
             secondary_range=(0, max([x.experience_required for x in self.level_bin_entry.levels])),
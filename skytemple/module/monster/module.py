@@ -24,7 +24,8 @@ from gi.repository.Gtk import TreeStore
 from skytemple.core.abstract_module import AbstractModule
 from skytemple.core.rom_project import RomProject, BinaryName
 from skytemple.core.string_provider import StringType
-from skytemple.core.ui_utils import recursive_generate_item_store_row_label, recursive_up_item_store_mark_as_modified
+from skytemple.core.ui_utils import recursive_generate_item_store_row_label, recursive_up_item_store_mark_as_modified, \
+    add_deferred_tree_stub, remove_deferred_tree_stubs
 from skytemple.module.monster.controller.entity import EntityController
 from skytemple.module.monster.controller.level_up import LevelUpController
 from skytemple.module.monster.controller.main import MainController, MONSTER_NAME
@@ -59,23 +60,67 @@ class MonsterModule(AbstractModule):
 
     def __init__(self, rom_project: RomProject):
         self.project = rom_project
-        self.monster_md: Md = self.project.open_file_in_rom(MONSTER_MD_FILE, FileType.MD)
-        self.m_level_bin: BinPack = self.project.open_file_in_rom(M_LEVEL_BIN, FileType.BIN_PACK)
-        self.waza_p_bin: WazaP = self.project.open_file_in_rom(WAZA_P_BIN, FileType.WAZA_P)
-        self.waza_p2_bin: WazaP = self.project.open_file_in_rom(WAZA_P2_BIN, FileType.WAZA_P)
-        self.tbl_talk: TblTalk = self.project.open_file_in_rom(TBL_TALK_FILE, FileType.TBL_TALK)
+        # The files are opened on first access, see the properties below. The module keeps the models, so that
+        # they are not collected while they are edited (the ModelCache only references evicted models weakly).
+        self._monster_md: Optional[Md] = None
+        self._m_level_bin: Optional[BinPack] = None
+        self._waza_p_bin: Optional[WazaP] = None
+        self._waza_p2_bin: Optional[WazaP] = None
+        self._tbl_talk: Optional[TblTalk] = None
 
         self._tree_model = None
+        self._tree_materialized = False
         self._tree_iter__entity_roots = {}
         self._tree_iter__entries = []
 
+    @property
+    def monster_md(self) -> Md:
+        if self._monster_md is None:
+            self._monster_md = self.project.open_file_in_rom(MONSTER_MD_FILE, FileType.MD)
+        return self._monster_md
+
+    @property
+    def m_level_bin(self) -> BinPack:
+        if self._m_level_bin is None:
+            self._m_level_bin = self.project.open_file_in_rom(M_LEVEL_BIN, FileType.BIN_PACK)
+        return self._m_level_bin
+
+    @property
+    def waza_p_bin(self) -> WazaP:
+        if self._waza_p_bin is None:
+            self._waza_p_bin = self.project.open_file_in_rom(WAZA_P_BIN, FileType.WAZA_P)
+        return self._waza_p_bin
+
+    @property
+    def waza_p2_bin(self) -> WazaP:
+        if self._waza_p2_bin is None:
+            self._waza_p2_bin = self.project.open_file_in_rom(WAZA_P2_BIN, FileType.WAZA_P)
+        return self._waza_p2_bin
+
+    @property
+    def tbl_talk(self) -> TblTalk:
+        if self._tbl_talk is None:
+            self._tbl_talk = self.project.open_file_in_rom(TBL_TALK_FILE, FileType.TBL_TALK)
+        return self._tbl_talk
+
     def load_tree_items(self, item_store: TreeStore, root_node):
         self._root = item_store.append(root_node, [
             'skytemple-e-monster-symbolic', MONSTER_NAME, self, MainController, 0, False, '', True
         ])
         self._tree_model = item_store
+        self._tree_materialized = False
         self._tree_iter__entity_roots = {}
         self._tree_iter__entries = {}
+        add_deferred_tree_stub(item_store, self._root, self)
+
+        recursive_generate_item_store_row_label(self._tree_model[self._root])
+
+    def materialize_tree_items(self):
+        if self._tree_materialized or self._tree_model is None:
+            return
+        self._tree_materialized = True
+        item_store = self._tree_model
+        remove_deferred_tree_stubs(item_store, self._root)
 
         monster_entries_by_base_id: Dict[int, List[MdEntry]] = {}
         for entry in self.monster_md.entries:
@@ -96,6 +141,7 @@ class MonsterModule(AbstractModule):
         recursive_generate_item_store_row_label(self._tree_model[self._root])
 
     def refresh(self, item_id):
+        self.materialize_tree_items()
         entry = self.monster_md.entries[item_id]
         name = self.project.get_string_provider().get_value(StringType.POKEMON_NAMES, entry.md_index_base)
         self._tree_model[self._tree_iter__entity_roots[entry.md_index_base]][:] = self.generate_entry__entity_root(
@@ -189,16 +235,16 @@ class MonsterModule(AbstractModule):
         portraits = None
         portraits2 = None
         portrait_module = self.project.get_module('portrait')
-        kao = portrait_module.kao
-        if item_id > -1 and item_id < kao.toc_len:
-            portraits = []
-            for kao_i in range(0, SUBENTRIES):
-                portraits.append(kao.get(item_id, kao_i))
+        with portrait_module.get_kao_ctx().read() as kao:
+            if item_id > -1 and item_id < kao.toc_len:
+                portraits = []
+                for kao_i in range(0, SUBENTRIES):
+                    portraits.append(kao.get(item_id, kao_i))
 
-        if item_id > -1 and NUM_ENTITIES + item_id < kao.toc_len:
-            portraits2 = []
-            for kao_i in range(0, SUBENTRIES):
-                portraits2.append(kao.get(NUM_ENTITIES + item_id, kao_i))
+            if item_id > -1 and NUM_ENTITIES + item_id < kao.toc_len:
+                portraits2 = []
+                for kao_i in range(0, SUBENTRIES):
+                    portraits2.append(kao.get(NUM_ENTITIES + item_id, kao_i))
 
         return portraits, portraits2
 
@@ -264,6 +310,7 @@ class MonsterModule(AbstractModule):
         self._mark_as_modified_in_tree(item_id)
 
     def _mark_as_modified_in_tree(self, item_id):
+        self.materialize_tree_items()
         row = self._tree_model[self._tree_iter__entries[item_id]]
         recursive_up_item_store_mark_as_modified(row)
 
@@ -329,22 +376,23 @@ class MonsterModule(AbstractModule):
                 sp.mark_as_modified()
 
             portrait_module = self.project.get_module('portrait')
-            kao: Kao = portrait_module.kao
             portraits = portraits if we_are_gender1 else portraits2
             if portraits:
-                for i, portrait in enumerate(portraits):
-                    existing = kao.get(monster_id - 1, i)
-                    if portrait:
-                        if existing:
-                            existing.compressed_img_data = portrait.compressed_img_data
-                            existing.pal_data = portrait.pal_data
-                            existing.modified = True
-                            existing.as_pil = None
+                kao: Kao
+                with portrait_module.get_kao_ctx() as kao:
+                    for i, portrait in enumerate(portraits):
+                        existing = kao.get(monster_id - 1, i)
+                        if portrait:
+                            if existing:
+                                existing.compressed_img_data = portrait.compressed_img_data
+                                existing.pal_data = portrait.pal_data
+                                existing.modified = True
+                                existing.as_pil = None
+                            else:
+                                kao.set(monster_id - 1, i, portrait)
                         else:
-                            kao.set(monster_id - 1, i, portrait)
-                    else:
-                        # TODO: Support removing portraits
-                        pass
+                            # TODO: Support removing portraits
+                            pass
             self.refresh(monster_id)
             self.mark_md_as_modified(monster_id)
             self.project.mark_as_modified(WAZA_P_BIN)
@@ -51,7 +51,7 @@ class PortraitController(AbstractController):
         self._portrait_provider = self.module.get_portrait_provider()
         self._draws = []
         self._mark_as_modified_cb = mark_as_modified_cb
-        self.kao = self.module.kao
+        self._kao = self.module.get_kao_ctx()
 
         self.builder = None
 
@@ -59,13 +59,14 @@ class PortraitController(AbstractController):
         self.builder = self._get_builder(__file__, 'portrait.glade')
         self.builder.connect_signals(self)
 
-        for index, subindex, kao in self.kao:
-            gui_number = subindex + 1
-            portrait_name = self._get_portrait_name(subindex)
-            self.builder.get_object(f'portrait_label{gui_number}').set_text(portrait_name)
-            draw = self.builder.get_object(f'portrait_draw{gui_number}')
-            self._draws.append(draw)
-            draw.connect('draw', partial(self.on_draw, subindex))
+        with self._kao.read() as kao_model:
+            for index, subindex, kao in kao_model:
+                gui_number = subindex + 1
+                portrait_name = self._get_portrait_name(subindex)
+                self.builder.get_object(f'portrait_label{gui_number}').set_text(portrait_name)
+                draw = self.builder.get_object(f'portrait_draw{gui_number}')
+                self._draws.append(draw)
+                draw.connect('draw', partial(self.on_draw, subindex))
 
         return self.builder.get_object('box_main')
 
@@ -103,12 +104,13 @@ class PortraitController(AbstractController):
 
         if response == Gtk.ResponseType.ACCEPT:
             base_filename = os.path.join(fn, f'{self.item_id + 1}')
-            for subindex in range(0, SUBENTRIES):
-                kao = self.kao.get(self.item_id, subindex)
-                if kao:
-                    filename = f'{base_filename}_{subindex}.png'
-                    img = kao.get()
-                    img.save(filename)
+            with self._kao.read() as kao_model:
+                for subindex in range(0, SUBENTRIES):
+                    kao = kao_model.get(self.item_id, subindex)
+                    if kao:
+                        filename = f'{base_filename}_{subindex}.png'
+                        img = kao.get()
+                        img.save(filename)
 
     def on_separate_import_activate(self, *args):
         md = SkyTempleMessageDialog(
@@ -139,15 +141,15 @@ class PortraitController(AbstractController):
                     if match is not None and int(match[1]) <= 40}
             for subindex, image_fn in imgs.items():
                 try:
-                    with open(os.path.join(fn, image_fn), 'rb') as f:
+                    with open(os.path.join(fn, image_fn), 'rb') as f, self._kao as kao_model:
                         image = Image.open(f)
-                        kao = self.kao.get(self.item_id, subindex)
+                        kao = kao_model.get(self.item_id, subindex)
                         if kao:
                             # Replace
                             kao.set(image)
                         else:
                             # New
-                            self.kao.set(self.item_id, subindex, KaoImage.new(image))
+                            kao_model.set(self.item_id, subindex, KaoImage.new(image))
                 except Exception as err:
                     name = self._get_portrait_name(subindex)
                     logger.error(f"Failed importing image '{name}'.", exc_info=err)
@@ -181,7 +183,8 @@ class PortraitController(AbstractController):
         dialog.destroy()
 
         if response == Gtk.ResponseType.ACCEPT:
-            SpriteBotSheet.create(self.kao, self.item_id).save(fn)
+            with self._kao.read() as kao_model:
+                SpriteBotSheet.create(kao_model, self.item_id).save(fn)
 
     def on_spritebot_import_activate(self, *args):
         dialog = Gtk.FileChooserNative.new(
@@ -201,13 +204,14 @@ class PortraitController(AbstractController):
             try:
                 for subindex, image in SpriteBotSheet.load(fn, self._get_portrait_name):
                     try:
-                        kao = self.kao.get(self.item_id, subindex)
-                        if kao:
-                            # Replace
-                            kao.set(image)
-                        else:
-                            # New
-                            self.kao.set(self.item_id, subindex, KaoImage.new(image))
+                        with self._kao as kao_model:
+                            kao = kao_model.get(self.item_id, subindex)
+                            if kao:
+                                # Replace
+                                kao.set(image)
+                            else:
+                                # New
+                                kao_model.set(self.item_id, subindex, KaoImage.new(image))
                     except Exception as err:
                         name = self._get_portrait_name(subindex)
                         logger.error(f"Failed importing image '{name}'.", exc_info=err)
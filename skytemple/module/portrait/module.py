@@ -14,11 +14,14 @@
 #
 #  You should have received a copy of the GNU General Public License
 #  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+from typing import Optional
+
 from gi.repository import Gtk
 from gi.repository.Gtk import TreeStore
 
 from skytemple.controller.main import MainController
 from skytemple.core.abstract_module import AbstractModule
+from skytemple.core.model_context import ModelContext
 from skytemple.core.rom_project import RomProject
 from skytemple.module.portrait.portrait_provider import PortraitProvider
 from skytemple.module.portrait.controller.portrait import PortraitController
@@ -41,10 +44,18 @@ class PortraitModule(AbstractModule):
     def __init__(self, rom_project: RomProject):
         """Loads the list of backgrounds for the ROM."""
         self.project = rom_project
-        self.kao: Kao = self.project.open_file_in_rom(PORTRAIT_FILE, FileType.KAO)
-        self._portrait_provider = PortraitProvider(self.kao)
+        # Created on first use, the Kao is only loaded then. The module keeps it, so that it's not collected
+        # while it's edited.
+        self._kao: Optional[ModelContext[Kao]] = None
+        self._portrait_provider: Optional[PortraitProvider] = None
         self._portrait_provider__was_init = False
 
+    def get_kao_ctx(self) -> ModelContext[Kao]:
+        """The portraits are rendered on worker threads (see PortraitProvider), so the Kao is only threadsafe."""
+        if self._kao is None:
+            self._kao = self.project.open_file_in_rom(PORTRAIT_FILE, FileType.KAO, threadsafe=True)
+        return self._kao
+
     def load_tree_items(self, item_store: TreeStore, root_node):
         """This module does not have main views."""
         pass
@@ -55,6 +66,8 @@ class PortraitModule(AbstractModule):
         return controller.get_view()
 
     def get_portrait_provider(self) -> PortraitProvider:
+        if self._portrait_provider is None:
+            self._portrait_provider = PortraitProvider(self.get_kao_ctx())
         if not self._portrait_provider__was_init:
             self._portrait_provider.init_loader(MainController.window().get_screen())
             self._portrait_provider__was_init = True
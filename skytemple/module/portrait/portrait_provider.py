@@ -21,7 +21,8 @@ import cairo
 from gi.repository import Gdk, GdkPixbuf, Gtk
 
 from skytemple.core.img_utils import pil_to_cairo_surface
-from skytemple_files.common.task_runner import AsyncTaskRunner
+from skytemple.core.model_context import ModelContext
+from skytemple.core.task_scheduler import TaskScheduler, TaskPriority
 from skytemple_files.data.md.model import NUM_ENTITIES
 from skytemple_files.graphics.kao.model import Kao, KAO_IMG_METAPIXELS_DIM, KAO_IMG_IMG_DIM
 
@@ -32,9 +33,9 @@ portrait_provider_lock = threading.Lock()
 class PortraitProvider:
     """
     PortraitProvider. This class renders portraits using Threads. If a portrait is requested, a loading icon
-    is returned instead, until it is loaded by the AsyncTaskRunner.
+    is returned instead, until it is loaded by the TaskScheduler.
     """
-    def __init__(self, kao: Kao):
+    def __init__(self, kao: ModelContext[Kao]):
         self._kao = kao
         self._loader_surface = None
         self._error_surface = None
@@ -89,21 +90,25 @@ class PortraitProvider:
         return self.get_loader()
 
     def _load(self, entry_id, sub_id, after_load_cb, allow_fallback):
-        AsyncTaskRunner.instance().run_task(self._load__impl(entry_id, sub_id, after_load_cb, allow_fallback))
+        TaskScheduler.instance().run(
+            TaskPriority.VISIBLE, self._load__impl, entry_id, sub_id, after_load_cb, allow_fallback,
+            category='portrait', item=f'{entry_id}/{sub_id}'
+        )
 
-    async def _load__impl(self, entry_id, sub_id, after_load_cb, allow_fallback):
+    def _load__impl(self, entry_id, sub_id, after_load_cb, allow_fallback):
         is_fallback = False
         try:
-            kao = self._kao.get(entry_id, sub_id)
-            if kao is None:
-                if allow_fallback:
-                    is_fallback = True
-                    kao = self._kao.get(entry_id % NUM_ENTITIES, sub_id)
-                    if kao is None:
+            with self._kao.read() as kao_model:
+                kao = kao_model.get(entry_id, sub_id)
+                if kao is None:
+                    if allow_fallback:
+                        is_fallback = True
+                        kao = kao_model.get(entry_id % NUM_ENTITIES, sub_id)
+                        if kao is None:
+                            raise RuntimeError()
+                    else:
                         raise RuntimeError()
-                else:
-                    raise RuntimeError()
-            portrait_pil = kao.get()
+                portrait_pil = kao.get()
             surf = pil_to_cairo_surface(portrait_pil.convert('RGBA'))
             loaded = surf
         except (RuntimeError, ValueError):
@@ -18,12 +18,11 @@
 # TODO: This module shares quite some code with SsaController.
 import math
 import os
-from typing import List, Optional, Tuple
+from typing import List, Optional, Tuple, TYPE_CHECKING
 
 import cairo
 from gi.repository import Gtk, Gdk
 
-from explorerscript.source_map import SourceMapPositionMark
 from skytemple.core.img_utils import pil_to_cairo_surface
 from skytemple.core.sprite_provider import SpriteProvider
 from skytemple.module.script.drawer import Drawer, InteractionMode
@@ -33,13 +32,16 @@ from skytemple_files.graphics.bpc.model import BPC_TILE_DIM
 from skytemple_files.script.ssa_sse_sss.model import Ssa
 from skytemple_files.script.ssa_sse_sss.trigger import SsaTrigger
 
+if TYPE_CHECKING:
+    from explorerscript.source_map import SourceMapPositionMark
+
 SIZE_REQUEST_NONE = 500
 
 
 class PosMarkEditorController:
     def __init__(self, ssa: Ssa, parent_window: Gtk.Window, sprite_provider: SpriteProvider,
                  level: Pmd2ScriptLevel, map_bg_module,
-                 pos_marks: List[SourceMapPositionMark], pos_mark_to_edit: int):
+                 pos_marks: List['SourceMapPositionMark'], pos_mark_to_edit: int):
         """A controller for a dialog for editing position marks for an Ssb file."""
         path = os.path.abspath(os.path.dirname(__file__))
         self.builder = Gtk.Builder()
@@ -61,7 +63,7 @@ class PosMarkEditorController:
         self._map_bg_width = SIZE_REQUEST_NONE
         self._map_bg_height = SIZE_REQUEST_NONE
         self._map_bg_surface = None
-        self._currently_selected_mark: Optional[SourceMapPositionMark] = None
+        self._currently_selected_mark: Optional['SourceMapPositionMark'] = None
 
         self._w_ssa_draw: Gtk.DrawingArea = self.builder.get_object('ssa_draw')
 
@@ -15,12 +15,12 @@
 #  You should have received a copy of the GNU General Public License
 #  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
 from enum import auto, Enum
-from typing import Tuple, Union, Callable, Optional, List
+from typing import Tuple, Union, Callable, Optional, List, TYPE_CHECKING
 
 import cairo
 from gi.repository import Gtk, GLib
 
-from explorerscript.source_map import SourceMapPositionMark
+from skytemple.core.lazy_import import lazy_import
 from skytemple.core.mapbg_util.drawer_plugin.grid import GridDrawerPlugin
 from skytemple.core.mapbg_util.drawer_plugin.selection import SelectionDrawerPlugin
 from skytemple.core.sprite_provider import SpriteProvider
@@ -33,6 +33,10 @@ from skytemple_files.script.ssa_sse_sss.object import SsaObject
 from skytemple_files.script.ssa_sse_sss.performer import SsaPerformer
 from skytemple_files.script.ssa_sse_sss.position import ACTOR_DEFAULT_HITBOX_W, ACTOR_DEFAULT_HITBOX_H
 
+if TYPE_CHECKING:
+    from explorerscript.source_map import SourceMapPositionMark
+source_map = lazy_import('explorerscript.source_map')
+
 
 ALPHA_T = 0.3
 COLOR_ACTORS = (1.0, 0, 1.0)
@@ -64,7 +68,7 @@ class Drawer:
 
         self.ssa = ssa
         self.map_bg = None
-        self.position_marks: List[SourceMapPositionMark] = []
+        self.position_marks: List['SourceMapPositionMark'] = []
 
         self.draw_tile_grid = False
 
@@ -219,7 +223,7 @@ class Drawer:
                 elif isinstance(self._selected, SsaEvent):
                     x, y, w, h = self.get_bb_trigger(self._selected, x=x, y=y)
                     self._draw_trigger(ctx, self._selected, x, y, w, h)
-                elif isinstance(self._selected, SourceMapPositionMark):
+                elif isinstance(self._selected, source_map.SourceMapPositionMark):
                     x, y, w, h = self.get_bb_pos_mark(self._selected, x=x, y=y)
                     self._draw_pos_mark(ctx, self._selected, x, y, w, h)
             return
@@ -267,7 +271,7 @@ class Drawer:
                     return layer_i, actor
         return None, None
 
-    def get_pos_mark_under_mouse(self) -> Optional[SourceMapPositionMark]:
+    def get_pos_mark_under_mouse(self) -> Optional['SourceMapPositionMark']:
         """
         Returns the first position mark under the mouse position, if any.
         Elements are searched in reversed drawing order (so what's drawn on top is also taken).
@@ -377,14 +381,14 @@ class Drawer:
 
         return coords_hitbox
 
-    def get_bb_pos_mark(self, pos_mark: SourceMapPositionMark, x=None, y=None) -> Tuple[int, int, int, int]:
+    def get_bb_pos_mark(self, pos_mark: 'SourceMapPositionMark', x=None, y=None) -> Tuple[int, int, int, int]:
         if x is None:
             x = pos_mark.x_with_offset * BPC_TILE_DIM
         if y is None:
             y = pos_mark.y_with_offset * BPC_TILE_DIM
         return x - BPC_TILE_DIM, y - BPC_TILE_DIM, BPC_TILE_DIM * 3, BPC_TILE_DIM * 3
 
-    def _draw_pos_mark(self, ctx: cairo.Context, pos_mark: SourceMapPositionMark, *bb_cords):
+    def _draw_pos_mark(self, ctx: cairo.Context, pos_mark: 'SourceMapPositionMark', *bb_cords):
         # Outline
         ctx.set_source_rgba(*COLOR_POS_MARKS, 0.8)
         ctx.rectangle(*bb_cords)
@@ -401,7 +405,7 @@ class Drawer:
     def _is_layer_visible(self, layer_i: int) -> bool:
         return self._sectors_solo[layer_i] or (not any(self._sectors_solo) and self._sectors_visible[layer_i])
 
-    def _is_dragged(self, entity: Union[SsaActor, SsaObject, SsaPerformer, SsaEvent, SourceMapPositionMark]):
+    def _is_dragged(self, entity: Union[SsaActor, SsaObject, SsaPerformer, SsaEvent, 'SourceMapPositionMark']):
         return entity == self._selected and self._selected__drag is not None
 
     def _handle_layer_highlight(self, ctx: cairo.Context, layer: int, x: int, y: int, w: int, h: int):
@@ -429,7 +433,7 @@ class Drawer:
             x, y, w, h = self.get_bb_performer(self._selected)
         elif isinstance(self._selected, SsaEvent):
             x, y, w, h = self.get_bb_trigger(self._selected)
-        elif isinstance(self._selected, SourceMapPositionMark):
+        elif isinstance(self._selected, source_map.SourceMapPositionMark):
             x, y, w, h = self.get_bb_pos_mark(self._selected)
         else:
             return
@@ -459,7 +463,7 @@ class Drawer:
                     x, y, w, h = self.get_bb_performer(self._selected, x=x, y=y)
                 elif isinstance(self._selected, SsaEvent):
                     x, y, w, h = self.get_bb_trigger(self._selected, x=x, y=y)
-                elif isinstance(self._selected, SourceMapPositionMark):
+                elif isinstance(self._selected, source_map.SourceMapPositionMark):
                     x, y, w, h = self.get_bb_pos_mark(self._selected, x=x, y=y)
                 return x, y, w, h
             # DEFAULT
@@ -681,7 +685,7 @@ class Drawer:
     def get_sector_highlighted(self):
         return self._sector_highlighted
 
-    def set_selected(self, entity: Optional[Union[SsaActor, SsaObject, SsaPerformer, SsaEvent, SourceMapPositionMark]]):
+    def set_selected(self, entity: Optional[Union[SsaActor, SsaObject, SsaPerformer, SsaEvent, 'SourceMapPositionMark']]):
         self._selected = entity
         self.draw_area.queue_draw()
 
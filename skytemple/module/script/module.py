@@ -14,18 +14,18 @@
 #
 #  You should have received a copy of the GNU General Public License
 #  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, TYPE_CHECKING
 
 from gi.repository import Gtk
 from gi.repository.Gtk import TreeStore
 
-from explorerscript.source_map import SourceMapPositionMark
 from skytemple.core.abstract_module import AbstractModule
 from skytemple.core.open_request import OpenRequest, REQUEST_TYPE_SCENE, REQUEST_TYPE_SCENE_SSE, REQUEST_TYPE_SCENE_SSA, \
     REQUEST_TYPE_SCENE_SSS
 from skytemple.core.rom_project import RomProject
 from skytemple.core.sprite_provider import SpriteProvider
-from skytemple.core.ui_utils import recursive_generate_item_store_row_label, recursive_up_item_store_mark_as_modified
+from skytemple.core.ui_utils import recursive_generate_item_store_row_label, recursive_up_item_store_mark_as_modified, \
+    add_deferred_tree_stub, remove_deferred_tree_stubs
 from skytemple.module.script.controller.folder import FolderController
 from skytemple.module.script.controller.map import MapController
 from skytemple.module.script.controller.dialog.pos_mark_editor import PosMarkEditorController
@@ -37,6 +37,9 @@ from skytemple.module.script.controller.sub import SubController
 from skytemple_files.common.script_util import load_script_files, SCRIPT_DIR, SSA_EXT, SSS_EXT
 from skytemple_files.common.types.file_types import FileType
 
+if TYPE_CHECKING:
+    from explorerscript.source_map import SourceMapPositionMark
+
 
 class ScriptModule(AbstractModule):
     @classmethod
@@ -51,8 +54,8 @@ class ScriptModule(AbstractModule):
         """Loads the list of backgrounds for the ROM."""
         self.project = rom_project
 
-        # Load all scripts
-        self.script_engine_file_tree = load_script_files(self.project.get_rom_folder(SCRIPT_DIR))
+        # Loaded on first access, see script_engine_file_tree
+        self._script_engine_file_tree = None
 
         # Tree iters for handle_request:
         self._map_scene_root: Dict[str, Gtk.TreeIter] = {}
@@ -61,14 +64,34 @@ class ScriptModule(AbstractModule):
         self._map_ssss: Dict[str, Dict[str, Gtk.TreeIter]] = {}
 
         self._tree_model = None
+        self._root = None
+        self._tree_materialized = False
+
+    @property
+    def script_engine_file_tree(self):
+        """All scripts of the ROM. Loaded on first access."""
+        if self._script_engine_file_tree is None:
+            self._script_engine_file_tree = load_script_files(self.project.get_rom_folder(SCRIPT_DIR))
+        return self._script_engine_file_tree
 
     def load_tree_items(self, item_store: TreeStore, root_node):
         # -> Script [main]
-        root = item_store.append(root_node, [
+        self._root = item_store.append(root_node, [
             'skytemple-e-ground-symbolic', SCRIPT_SCENES, self, MainController, 0, False, '', True
         ])
-
         self._tree_model = item_store
+        self._tree_materialized = False
+        add_deferred_tree_stub(item_store, self._root, self)
+
+        recursive_generate_item_store_row_label(self._tree_model[self._root])
+
+    def materialize_tree_items(self):
+        if self._tree_materialized or self._tree_model is None:
+            return
+        self._tree_materialized = True
+        item_store = self._tree_model
+        root = self._root
+        remove_deferred_tree_stubs(item_store, root)
 
         #    -> Common [common]
         item_store.append(root, [
@@ -237,7 +260,7 @@ class ScriptModule(AbstractModule):
 
     def get_pos_mark_editor_controller(self, parent_window: Gtk.Window, mapname: str,
                                        scene_name: str, scene_type: str,
-                                       pos_marks: List[SourceMapPositionMark],
+                                       pos_marks: List['SourceMapPositionMark'],
                                        pos_mark_to_edit: int) -> PosMarkEditorController:
         if mapname not in self.project.get_rom_module().get_static_data().script_data.level_list__by_name:
             raise ValueError("Map not found.")
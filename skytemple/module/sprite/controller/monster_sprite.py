@@ -279,7 +279,7 @@ Warning: SkyTemple does not validate the files you import.""")
         return current[1]
 
     def _load_frames(self):
-        with self._monster_bin as monster_bin:
+        with self._monster_bin.read() as monster_bin:
             sprite = self._load_sprite_from_bin_pack(monster_bin, self.item_id)
 
             ani_group = sprite.get_animations_for_group(sprite.anim_groups[0])
@@ -221,29 +221,29 @@ class SpriteModule(AbstractModule):
         return self.project.open_file_in_rom(ATTACK_BIN, FileType.BIN_PACK, threadsafe=True)
 
     def get_monster_monster_sprite_chara(self, id, raw=False) -> Union[bytes, WanFile]:
-        with self.get_monster_bin_ctx() as bin_pack:
+        with self.get_monster_bin_ctx().read() as bin_pack:
             decompressed = FileType.PKDPX.deserialize(bin_pack[id]).decompress()
             if raw:
                 return decompressed
             return FileType.WAN.CHARA.deserialize(decompressed)
 
     def get_monster_ground_sprite_chara(self, id, raw=False) -> Union[bytes, WanFile]:
-        with self.get_ground_bin_ctx() as bin_pack:
+        with self.get_ground_bin_ctx().read() as bin_pack:
             if raw:
                 return bin_pack[id]
             return FileType.WAN.CHARA.deserialize(bin_pack[id])
 
     def get_monster_attack_sprite_chara(self, id, raw=False) -> Union[bytes, WanFile]:
-        with self.get_attack_bin_ctx() as bin_pack:
+        with self.get_attack_bin_ctx().read() as bin_pack:
             decompressed = FileType.PKDPX.deserialize(bin_pack[id]).decompress()
             if raw:
                 return decompressed
             return FileType.WAN.CHARA.deserialize(decompressed)
 
     def get_monster_sprite_count(self):
-        with self.get_monster_bin_ctx() as monster_bin, \
-                self.get_attack_bin_ctx() as attack_bin, \
-                self.get_ground_bin_ctx() as ground_bin:
+        with self.get_monster_bin_ctx().read() as monster_bin, \
+                self.get_attack_bin_ctx().read() as attack_bin, \
+                self.get_ground_bin_ctx().read() as ground_bin:
             if len(monster_bin) != len(attack_bin) or len(attack_bin) != len(ground_bin):
                 display_error(None, "Error with sprite files: They don't have the same length!")
                 return -1